@@ -1,4 +1,4 @@
-from flask import Flask, jsonify, request, render_template, send_from_directory, session, redirect, url_for
+from flask import Flask, jsonify, request, render_template, send_from_directory, session, redirect, url_for, abort, Response, stream_with_context
 from flask_cors import CORS
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
 from werkzeug.utils import secure_filename
@@ -7,9 +7,24 @@ import os
 import uuid
 
 # Import models and db
-from models import db, Book, Chapter, Verse, PaleoLetter, GodFact, Word
+from models import db, Book, Verse, VerseWord, PaleoLetter, GodFact, Word, ElsJob
 from utils.hebrew_converter import hebrew_to_paleo, get_pronunciation_guide, analyze_word_meaning
 from utils.ancient_hebrew_tts import create_tts_text, get_word_pronunciation, hebrew_to_ancient_pronunciation
+from utils.search_index import SEARCH_COLUMNS, search_verse_ids
+from utils.verse_context import hydrate_verses
+from utils.verse_fields import encode_compact, parse_fields, parse_format
+from utils.word_analysis import MAX_BATCH_WORDS, word_report, word_reports
+from utils.strongs_index import LANGUAGES as STRONGS_LANGUAGES, strongs_page
+from utils.phrase_index import PHRASE_SEARCH_TYPES, search_positional
+from utils.root_index import search_root
+from utils.gematria import gematria_value, letter_values, verses_with_value, words_with_value
+from utils.schema import upgrade_schema
+from utils.corpus_stats import get_corpus_stats, get_corpus_totals
+from utils.references import parse_reference, passage_verses, split_ordinal
+from utils.els_search import ElsJobRunner, JobQueueFull
+from utils.chapter_cache import chapter_cache
+from utils.chapter_sequence import chapter_navigation
+from utils.reference_data import get_reference_data
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'paleo-hebrew-bible-secret-key'
@@ -40,6 +55,11 @@ class User(UserMixin):
 ADMIN_USERNAME = 'admin'
 ADMIN_PASSWORD_HASH = generate_password_hash('paleo_admin_2025', method='pbkdf2:sha256')
 
+@app.before_request
+def apply_schema_upgrades():
+    """Add columns introduced since the database was created (runs once per process)"""
+    upgrade_schema()
+
 @login_manager.user_loader
 def load_user(user_id):
     if user_id == 'admin':
@@ -83,9 +103,8 @@ def test():
 
 @app.route('/api/books')
 def get_books():
-    """Get all books in the database"""
-    books = Book.query.order_by(Book.order).all()
-    return jsonify([book.to_dict() for book in books])
+    """Get all books in the database (pre-serialized in the reference data registry)"""
+    return Response(get_reference_data().books_json, mimetype='application/json')
 
 @app.route('/api/books/<int:book_id>')
 def get_book(book_id):
@@ -95,139 +114,231 @@ def get_book(book_id):
     book_data['chapters'] = [chapter.to_dict() for chapter in book.chapters]
     return jsonify(book_data)
 
+def verse_projection():
+    """(fields, compact) from the fields= and format= query parameters; raises ValueError"""
+    fields = parse_fields(request.args.get('fields'))
+    compact = parse_format(request.args.get('format')) == 'compact'
+    return fields, compact
+
 @app.route('/api/books/<int:book_id>/chapters/<int:chapter_number>')
 def get_chapter(book_id, chapter_number):
-    """Get a specific chapter with all its verses"""
-    book = Book.query.get_or_404(book_id)
-    chapter = Chapter.query.filter_by(book_id=book_id, chapter_number=chapter_number).first_or_404()
+    """Get a specific chapter with all its verses (served from the precompressed snapshot cache)"""
+    try:
+        fields, compact = verse_projection()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    chapter_data = chapter.to_dict()
-    chapter_data['book'] = book.to_dict()
-    chapter_data['verses'] = [verse.to_dict() for verse in chapter.verses]
+    snapshot = chapter_cache.get(book_id, chapter_number, fields, compact)
+    if snapshot is None:
+        abort(404)
     
-    return jsonify(chapter_data)
+    return chapter_cache.response(snapshot)
 
 @app.route('/api/books/<int:book_id>/chapters/<int:chapter_number>/navigation')
 def get_chapter_navigation(book_id, chapter_number):
     """Get navigation info for a chapter (previous/next chapter across books)"""
-    from models import Book, Chapter
-    
-    # Get current book and chapter
-    current_book = Book.query.get_or_404(book_id)
-    current_chapter = Chapter.query.filter_by(
-        book_id=book_id, 
-        chapter_number=chapter_number
-    ).first_or_404()
-    
-    navigation = {
-        'current': {
-            'book_id': current_book.id,
-            'book_name': current_book.name,
-            'chapter_number': chapter_number
-        },
-        'previous': None,
-        'next': None
-    }
+    navigation = chapter_navigation(book_id, chapter_number)
+    if navigation is None:
+        abort(404)
     
-    # Find previous chapter
-    if chapter_number > 1:
-        # Previous chapter in same book
-        navigation['previous'] = {
-            'book_id': current_book.id,
-            'book_name': current_book.name,
-            'chapter_number': chapter_number - 1
-        }
-    else:
-        # Last chapter of previous book
-        prev_book = Book.query.filter(Book.order < current_book.order).order_by(Book.order.desc()).first()
-        if prev_book:
-            last_chapter = Chapter.query.filter_by(book_id=prev_book.id).order_by(Chapter.chapter_number.desc()).first()
-            if last_chapter:
-                navigation['previous'] = {
-                    'book_id': prev_book.id,
-                    'book_name': prev_book.name,
-                    'chapter_number': last_chapter.chapter_number
-                }
+    return jsonify(navigation)
+
+@app.route('/api/passage')
+def get_passage():
+    """Verses for a reference such as 'Gen 1:1-2:3; Ex 20', streamed in canonical order"""
+    reference = request.args.get('ref', '').strip()
     
-    # Find next chapter
-    next_chapter_in_book = Chapter.query.filter_by(
-        book_id=book_id, 
-        chapter_number=chapter_number + 1
-    ).first()
+    if not reference:
+        return jsonify({'error': 'ref is required'}), 400
     
-    if next_chapter_in_book:
-        # Next chapter in same book
-        navigation['next'] = {
-            'book_id': current_book.id,
-            'book_name': current_book.name,
-            'chapter_number': chapter_number + 1
-        }
-    else:
-        # First chapter of next book
-        next_book = Book.query.filter(Book.order > current_book.order).order_by(Book.order.asc()).first()
-        if next_book:
-            first_chapter = Chapter.query.filter_by(book_id=next_book.id, chapter_number=1).first()
-            if first_chapter:
-                navigation['next'] = {
-                    'book_id': next_book.id,
-                    'book_name': next_book.name,
-                    'chapter_number': 1
-                }
-    
-    return jsonify(navigation)
+    try:
+        ranges = parse_reference(reference)
+        fields, compact = verse_projection()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    books = get_reference_data().book_stubs_by_order
+    dumps = app.json.dumps
+    # Compact rows refer to books by id; the stubs are sent once in "books"
+    columns = list(fields or Verse.FIELDS) + ['book_id', 'chapter_number']
+    passage_books = list({passage['book']: books[split_ordinal(passage['start'])[0]] for passage in ranges}.values())
+    
+    def generate():
+        # Each range is one BETWEEN scan on the ordinal index; verses are written as they load
+        yield f'{{"reference": {dumps(reference)}, "ranges": {dumps(ranges)}, '
+        if compact:
+            yield f'"books": {dumps(passage_books)}, "verses": {{"columns": {dumps(columns)}, "rows": ['
+        else:
+            yield '"verses": ['
+        count = 0
+        for passage in ranges:
+            for verse in passage_verses(passage['start'], passage['end'], fields):
+                book_order, chapter_number, _ = split_ordinal(verse.ordinal)
+                verse_data = verse.to_dict(fields)
+                verse_data['chapter_number'] = chapter_number
+                if compact:
+                    verse_data['book_id'] = books[book_order]['id']
+                    row = [verse_data[column] for column in columns]
+                else:
+                    verse_data['book'] = books[book_order]
+                    row = verse_data
+                yield (', ' if count else '') + dumps(row)
+                count += 1
+        closing = ']}' if compact else ']'
+        yield f'{closing}, "count": {count}}}'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
 @app.route('/api/alphabet')
 def get_alphabet():
-    """Get the complete Paleo Hebrew alphabet"""
-    letters = PaleoLetter.query.order_by(PaleoLetter.order).all()
-    return jsonify([letter.to_dict() for letter in letters])
+    """Get the complete Paleo Hebrew alphabet (pre-serialized in the reference data registry)"""
+    return Response(get_reference_data().alphabet_json, mimetype='application/json')
 
 @app.route('/api/alphabet/<string:letter>')
 def get_letter(letter):
     """Get information about a specific letter"""
-    paleo_letter = PaleoLetter.query.filter_by(letter=letter).first_or_404()
-    return jsonify(paleo_letter.to_dict())
+    body = get_reference_data().letter_json.get(letter)
+    if body is None:
+        abort(404)
+    return Response(body, mimetype='application/json')
 
 @app.route('/api/search')
 def search_verses():
-    """Search for verses containing specific text"""
+    """Search for verses containing specific text, ranked by relevance"""
     query = request.args.get('q', '').strip()
-    search_type = request.args.get('type', 'all')  # 'hebrew', 'paleo', 'english', 'all'
+    # 'hebrew', 'paleo', 'english', 'transliteration', 'all', 'phrase'/'near' for positional search,
+    # or 'root' for every inflected form of a 2-3 letter root
+    search_type = request.args.get('type', 'all')
     
     if not query:
         return jsonify({'error': 'Search query is required'}), 400
     
-    verses = []
+    if (search_type not in ('all', 'root') and search_type not in SEARCH_COLUMNS
+            and search_type not in PHRASE_SEARCH_TYPES):
+        return jsonify({'error': f'Unknown search type: {search_type}'}), 400
     
-    if search_type in ['hebrew', 'all']:
-        hebrew_results = Verse.query.filter(Verse.hebrew_text.contains(query)).all()
-        verses.extend(hebrew_results)
+    try:
+        limit = max(1, min(int(request.args.get('limit', 50)), 200))
+        cursor = max(0, int(request.args.get('cursor', 0)))
+        distance = int(request.args.get('distance', 5))
+    except ValueError:
+        return jsonify({'error': 'limit, cursor and distance must be integers'}), 400
     
-    if search_type in ['paleo', 'all']:
-        paleo_results = Verse.query.filter(Verse.paleo_text.contains(query)).all()
-        verses.extend([v for v in paleo_results if v not in verses])
+    try:
+        fields, compact = verse_projection()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    if search_type in ['english', 'all']:
-        english_results = Verse.query.filter(Verse.english_translation.contains(query)).all()
-        verses.extend([v for v in english_results if v not in verses])
+    try:
+        if search_type in PHRASE_SEARCH_TYPES:
+            verse_ids, next_cursor = search_positional(query, search_type, limit=limit, cursor=cursor,
+                                                       distance=distance)
+        elif search_type == 'root':
+            verse_ids, next_cursor = search_root(query, limit=limit, cursor=cursor)
+        else:
+            verse_ids, next_cursor = search_verse_ids(query, search_type, limit=limit, cursor=cursor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Add book and chapter info to each verse
-    results = []
-    for verse in verses:
-        verse_data = verse.to_dict()
-        chapter = Chapter.query.get(verse.chapter_id)
-        book = Book.query.get(chapter.book_id)
-        verse_data['book'] = book.to_dict()
-        verse_data['chapter'] = chapter.to_dict()
-        results.append(verse_data)
+    # Load the page of verses with their book/chapter context in one query, keeping rank order
+    results = hydrate_verses(verse_ids, fields)
     
     return jsonify({
         'query': query,
         'search_type': search_type,
+        'results': encode_compact(results) if compact else results,
+        'count': len(results),
+        'limit': limit,
+        'cursor': cursor,
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None
+    })
+
+@app.route('/api/gematria/<string:word>')
+def get_gematria(word):
+    """Gematria value of a Hebrew word with its letter breakdown"""
+    letters = letter_values(word)
+    if not letters:
+        return jsonify({'error': 'No Hebrew letters in word'}), 400
+    
+    value = gematria_value(word)
+    return jsonify({
+        'word': word,
+        'value': value,
+        'letters': letters
+    })
+
+@app.route('/api/gematria/value/<int:value>')
+def get_gematria_matches(value):
+    """Words (scope=words) or verses (scope=verses) with a given gematria value"""
+    scope = request.args.get('scope', 'words')
+    if scope not in ('words', 'verses'):
+        return jsonify({'error': 'scope must be words or verses'}), 400
+    
+    try:
+        limit = max(1, min(int(request.args.get('limit', 50)), 200))
+        cursor = max(0, int(request.args.get('cursor', 0)))
+    except ValueError:
+        return jsonify({'error': 'limit and cursor must be integers'}), 400
+    
+    if scope == 'words':
+        results, next_cursor = words_with_value(value, limit=limit, cursor=cursor)
+    else:
+        verse_ids, next_cursor = verses_with_value(value, limit=limit, cursor=cursor)
+        results = hydrate_verses(verse_ids)
+    
+    return jsonify({
+        'value': value,
+        'scope': scope,
         'results': results,
-        'count': len(results)
+        'count': len(results),
+        'limit': limit,
+        'cursor': cursor,
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None
     })
 
+# Equidistant letter sequence searches run on a small background pool; results are kept in els_job
+els_runner = ElsJobRunner()
+
+@app.route('/api/els/jobs', methods=['POST'])
+def create_els_job():
+    """Start an ELS search: {term, books (default Torah), min_skip, max_skip}"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    
+    term = data.get('term', '')
+    if not isinstance(term, str) or not term.strip():
+        return jsonify({'error': 'term is required and must be a string'}), 400
+    
+    books = data.get('books')
+    if books is not None and not (isinstance(books, list) and all(isinstance(book, str) for book in books)):
+        return jsonify({'error': 'books must be a list of book names'}), 400
+    
+    try:
+        min_skip = int(data.get('min_skip', 1))
+        max_skip = int(data.get('max_skip', 1000))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'min_skip and max_skip must be integers'}), 400
+    
+    try:
+        job = els_runner.create_job(term.strip(), books=books, min_skip=min_skip, max_skip=max_skip)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except JobQueueFull as e:
+        return jsonify({'error': str(e)}), 429
+    
+    return jsonify(job.to_dict(include_results=False)), 202
+
+@app.route('/api/els/jobs/<string:job_id>')
+def get_els_job(job_id):
+    """Status of an ELS search, with its hits once completed"""
+    job = db.session.get(ElsJob, job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
 @app.route('/api/convert', methods=['POST'])
 def convert_text():
     """Convert Hebrew text to Paleo Hebrew"""
@@ -403,13 +514,12 @@ def get_import_status():
     """Get current import status and progress"""
     status = background_runner.get_status()
     
-    # Add database statistics
-    book_count = Book.query.count()
-    verse_count = Verse.query.count()
+    # Add database statistics (materialized per imported book)
+    totals = get_corpus_totals()
     
     status['database'] = {
-        'books': book_count,
-        'verses': verse_count,
+        'books': totals.books if totals else 0,
+        'verses': totals.verses if totals else 0,
         'estimated_total_verses': 23000  # Approximate total verses in Hebrew Bible
     }
     
@@ -432,111 +542,39 @@ def reset_import_progress():
 
 @app.route('/api/stats')
 def get_bible_stats():
-    """Get comprehensive Bible statistics"""
-    books = Book.query.all()
-    stats = {
-        'total_books': len(books),
-        'books_with_verses': 0,
-        'total_verses': 0,
-        'testament_stats': {},
-        'books': []
-    }
-    
-    testament_counts = {}
-    
-    for book in books:
-        verse_count = db.session.query(Verse).join(Chapter).filter(Chapter.book_id == book.id).count()
-        
-        book_info = {
-            'name': book.name,
-            'hebrew_name': book.hebrew_name,
-            'testament': book.testament,
-            'order': book.order,
-            'chapters': len(book.chapters),
-            'verses': verse_count
-        }
-        
-        stats['books'].append(book_info)
-        stats['total_verses'] += verse_count
-        
-        if verse_count > 0:
-            stats['books_with_verses'] += 1
-        
-        # Testament statistics
-        if book.testament not in testament_counts:
-            testament_counts[book.testament] = {'books': 0, 'verses': 0}
-        
-        testament_counts[book.testament]['books'] += 1
-        testament_counts[book.testament]['verses'] += verse_count
-    
-    stats['testament_stats'] = testament_counts
-    
-    return jsonify(stats)
+    """Get comprehensive Bible statistics (one read of the materialized corpus_stat table)"""
+    return jsonify(get_corpus_stats())
 
 @app.route('/api/strongs')
 def get_strongs_concordance():
-    """Get Strong's Concordance data with Hebrew/Greek words and their meanings"""
-    from models import StrongsHebrew, StrongsGreek, PaleoDictionary
-    
-    # Get search parameter if provided
-    search_term = request.args.get('search', '').lower()
-    
-    # Query Hebrew entries
-    hebrew_query = StrongsHebrew.query
-    if search_term:
-        hebrew_query = hebrew_query.filter(
-            db.or_(
-                StrongsHebrew.short_definition.ilike(f'%{search_term}%'),
-                StrongsHebrew.long_definition.ilike(f'%{search_term}%'),
-                StrongsHebrew.transliteration.ilike(f'%{search_term}%'),
-                StrongsHebrew.hebrew_word.ilike(f'%{search_term}%'),
-                StrongsHebrew.strong_number.ilike(f'%{search_term}%')
-            )
-        )
-    
-    # Query Greek entries
-    greek_query = StrongsGreek.query
-    if search_term:
-        greek_query = greek_query.filter(
-            db.or_(
-                StrongsGreek.short_definition.ilike(f'%{search_term}%'),
-                StrongsGreek.long_definition.ilike(f'%{search_term}%'),
-                StrongsGreek.transliteration.ilike(f'%{search_term}%'),
-                StrongsGreek.greek_word.ilike(f'%{search_term}%'),
-                StrongsGreek.strong_number.ilike(f'%{search_term}%')
-            )
-        )
+    """Get Strong's Concordance data with Hebrew/Greek words and their meanings, one numeric-order page per language"""
+    search_term = request.args.get('search', '').strip()
+    language = request.args.get('language', 'all')
+    try:
+        limit = max(1, min(int(request.args.get('limit', 100)), 1000))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
     
-    # Get the results and limit if needed
-    hebrew_entries = hebrew_query.order_by(StrongsHebrew.strong_number).limit(100).all()
-    greek_entries = greek_query.order_by(StrongsGreek.strong_number).limit(100).all()
+    if language not in ('all', *STRONGS_LANGUAGES):
+        return jsonify({'error': f"language must be one of: all, {', '.join(STRONGS_LANGUAGES)}"}), 400
     
-    # Format Hebrew entries with root meanings
-    hebrew_data = {}
-    for entry in hebrew_entries:
-        entry_dict = entry.to_dict()
-        
-        # Look up corresponding Paleo Dictionary entry for root meaning
-        paleo_entry = PaleoDictionary.query.filter_by(strong_number=entry.strong_number).first()
-        if paleo_entry:
-            entry_dict['root_meaning'] = {
-                'paleo_word': paleo_entry.paleo_word,
-                'pictographic_analysis': paleo_entry.pictographic_analysis,
-                'original_concept': paleo_entry.original_concept,
-                'formation_explanation': paleo_entry.formation_explanation
-            }
-        else:
-            entry_dict['root_meaning'] = None
-            
-        hebrew_data[entry.strong_number] = entry_dict
-    
-    # Format the response
-    strongs_data = {
-        'hebrew': hebrew_data,
-        'greek': {entry.strong_number: entry.to_dict() for entry in greek_entries}
-    }
+    strongs_data = {}
+    next_cursor = {}
+    try:
+        for name in STRONGS_LANGUAGES:
+            if language in ('all', name):
+                strongs_data[name], next_cursor[name] = strongs_page(
+                    name, search_term, limit, request.args.get(f'{name}_cursor')
+                )
+            else:
+                strongs_data[name], next_cursor[name] = {}, None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    return jsonify(strongs_data)
+    strongs_data['next_cursor'] = next_cursor
+    strongs_data['has_more'] = any(next_cursor.values())
+    # Keep entries in numeric order (jsonify would sort the keys as strings: H1, H10, H100, H2...)
+    return app.response_class(app.json.dumps(strongs_data, sort_keys=False), mimetype='application/json')
 
 @app.route('/api/strongs/<string:strong_number>')
 def get_strong_number(strong_number):
@@ -630,120 +668,46 @@ def get_paleo_word_analysis(word):
 @app.route('/api/paleo-dictionary/analyze/<string:hebrew_word>')  
 def analyze_hebrew_word(hebrew_word):
     """Analyze any Hebrew word by breaking it down into pictographic components"""
-    from models import PaleoLetter, StrongsHebrew
-    from utils.hebrew_converter import hebrew_to_paleo, remove_nikud
-    
-    # Clean the Hebrew word
-    clean_hebrew = remove_nikud(hebrew_word)
-    paleo_word = hebrew_to_paleo(clean_hebrew)
-    
-    # Try to find English definition from Strong's Hebrew
-    english_definition = None
-    long_definition = None
-    transliteration = None
-    
-    # Look for exact match first
-    strongs_entry = StrongsHebrew.query.filter_by(hebrew_word=clean_hebrew).first()
-    if not strongs_entry:
-        # Try matching with original word (with nikud)
-        strongs_entry = StrongsHebrew.query.filter_by(hebrew_word=hebrew_word).first()
-    if not strongs_entry:
-        # Search through all Strong's entries for exact match after removing nikud
-        all_strongs = StrongsHebrew.query.all()
-        for entry in all_strongs:
-            if remove_nikud(entry.hebrew_word) == clean_hebrew:
-                strongs_entry = entry
-                break
-    if not strongs_entry:
-        # Try removing definite article 'ה' prefix if present
-        if clean_hebrew.startswith('ה') and len(clean_hebrew) > 1:
-            root_word = clean_hebrew[1:]  # Remove the ה prefix
-            # Try direct match first
-            strongs_entry = StrongsHebrew.query.filter_by(hebrew_word=root_word).first()
-            if not strongs_entry:
-                # Search through all Strong's entries, applying remove_nikud to find match
-                all_strongs = StrongsHebrew.query.all()
-                for entry in all_strongs:
-                    if remove_nikud(entry.hebrew_word) == root_word:
-                        strongs_entry = entry
-                        break
-    if not strongs_entry:
-        # Try removing common prefixes and suffixes
-        prefixes = ['ו', 'כ', 'ל', 'מ', 'ב']  # and, like, to, from, in
-        suffixes = ['ים', 'ות', 'יה', 'נה', 'יו']  # plural and other endings
-        
-        test_word = clean_hebrew
-        for prefix in prefixes:
-            if test_word.startswith(prefix) and len(test_word) > 1:
-                test_word = test_word[1:]
-                strongs_entry = StrongsHebrew.query.filter_by(hebrew_word=test_word).first()
-                if strongs_entry:
-                    break
-        
-        if not strongs_entry:
-            for suffix in suffixes:
-                if test_word.endswith(suffix) and len(test_word) > len(suffix):
-                    test_word = test_word[:-len(suffix)]
-                    strongs_entry = StrongsHebrew.query.filter_by(hebrew_word=test_word).first()
-                    if strongs_entry:
-                        break
-    if not strongs_entry:
-        # Try partial matches for compound words
-        strongs_entries = StrongsHebrew.query.filter(
-            db.or_(
-                StrongsHebrew.hebrew_word.like(f'%{clean_hebrew}%'),
-                StrongsHebrew.hebrew_word.like(f'{clean_hebrew}%'),
-                StrongsHebrew.hebrew_word.like(f'%{clean_hebrew}')
-            )
-        ).limit(5).all()
-        if strongs_entries:
-            strongs_entry = strongs_entries[0]  # Take first match
-    
-    if strongs_entry:
-        english_definition = strongs_entry.short_definition
-        long_definition = strongs_entry.long_definition
-        transliteration = strongs_entry.transliteration
-    
-    # If still no definition found, create a basic one
-    if not english_definition:
-        english_definition = f"Hebrew word formed from {len(clean_hebrew)} letters"
-    if not long_definition:
-        long_definition = f"Ancient Hebrew word written as {clean_hebrew} in Hebrew script"
-    
-    # Analyze each letter
-    analysis = {
-        'hebrew_word': hebrew_word,
-        'clean_hebrew': clean_hebrew,
-        'paleo_word': paleo_word,
-        'letter_analysis': [],
-        'suggested_meaning': '',
-        'english_definition': english_definition,
-        'long_definition': long_definition,
-        'transliteration': transliteration
-    }
+    return jsonify(word_report(hebrew_word))
+
+@app.route('/api/paleo-dictionary/analyze/batch', methods=['POST'])
+def analyze_hebrew_words():
+    """Analyze a list of words, or every word of a verse/chapter reference, in one response"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
     
-    meaning_parts = []
-    
-    for i, char in enumerate(clean_hebrew):
-        if char != ' ':  # Skip spaces
-            letter = PaleoLetter.query.filter_by(letter=char).first()
-            if letter:
-                letter_data = {
-                    'position': i + 1,
-                    'hebrew_letter': char,
-                    'paleo_symbol': letter.paleo_symbol,
-                    'name': letter.name,
-                    'meaning': letter.meaning,
-                    'pictograph': letter.pictograph_description
-                }
-                analysis['letter_analysis'].append(letter_data)
-                meaning_parts.append(letter.meaning.split(',')[0])  # Take first meaning
+    words = data.get('words')
+    reference = data.get('reference') or ''
+    if not isinstance(reference, str):
+        return jsonify({'error': 'reference must be a string'}), 400
+    reference = reference.strip()
     
-    # Create suggested meaning
-    if meaning_parts:
-        analysis['suggested_meaning'] = ' + '.join(meaning_parts)
+    if words is None and not reference:
+        return jsonify({'error': 'words or reference is required'}), 400
     
-    return jsonify(analysis)
+    try:
+        if reference:
+            ranges = parse_reference(reference)
+            words = [word for (word,) in db.session.query(VerseWord.consonantal)
+                     .join(Verse, Verse.id == VerseWord.verse_id)
+                     .filter(db.or_(*(Verse.ordinal.between(passage['start'], passage['end']) for passage in ranges)))
+                     .order_by(Verse.ordinal, VerseWord.position)]
+        elif not isinstance(words, list) or not all(isinstance(word, str) for word in words):
+            raise ValueError('words must be a list of strings')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    unique_words = list(dict.fromkeys(word.strip() for word in words if word.strip()))
+    if len(unique_words) > MAX_BATCH_WORDS:
+        return jsonify({'error': f'At most {MAX_BATCH_WORDS} distinct words per request ({len(unique_words)} given)'}), 400
+    
+    return jsonify({
+        'reference': reference or None,
+        'word_count': len(words),
+        'unique_count': len(unique_words),
+        'analyses': word_reports(unique_words)
+    })
 
 # Helper functions for file uploads
 def allowed_file(filename):
@@ -8,8 +8,10 @@ import threading
 import json
 from datetime import datetime
 from app import app, db
-from models import Book, Chapter, Verse
 from utils.bible_importer import BibleImporter
+from utils.data_generation import bump_generation
+from utils.import_session import ImportSession, verse_row
+from utils.book_indexes import index_books
 from data.bible_books import HEBREW_BIBLE_BOOKS
 
 class BackgroundBibleImporter:
@@ -21,6 +23,8 @@ class BackgroundBibleImporter:
         self.current_chapter = None
         self.total_imported = 0
         self.start_time = None
+        self.import_session = None
+        self.imported_book_ids = set()
         
     def start_import(self):
         """Start the background import process"""
@@ -42,12 +46,18 @@ class BackgroundBibleImporter:
         """Main import worker function"""
         with app.app_context():
             try:
+                # Chapter ids and existing verses, loaded once for the whole run
+                self.import_session = ImportSession()
+                
                 # Start with more sample Genesis verses
                 self._import_sample_genesis()
                 
                 # Then import other sample books
                 self._import_sample_books()
                 
+                # Word, root and gematria rows for the books that got new verses
+                index_books(self.imported_book_ids)
+                
                 print("✅ Sample import completed!")
                 
             except Exception as e:
@@ -89,8 +99,8 @@ class BackgroundBibleImporter:
             }
         ]
         
-        genesis = Book.query.filter_by(name='Genesis').first()
-        if not genesis:
+        genesis_id = self.import_session.book_id('Genesis')
+        if not genesis_id:
             print("❌ Genesis book not found!")
             return
         
@@ -101,48 +111,12 @@ class BackgroundBibleImporter:
             self.current_book = 'Genesis'
             self.current_chapter = f'Chapter {verse_info["chapter"]}'
             
-            # Check if verse already exists
-            chapter = Chapter.query.filter_by(
-                book_id=genesis.id,
-                chapter_number=verse_info['chapter']
-            ).first()
-            
-            if chapter:
-                existing_verse = Verse.query.filter_by(
-                    chapter_id=chapter.id,
-                    verse_number=verse_info['verse']
-                ).first()
+            verse_data = self._import_verse(genesis_id, verse_info)
+            if verse_data:
+                print(f"📝 Imported Genesis {verse_info['chapter']}:{verse_info['verse']} - {verse_data['paleo_transliteration'][:50]}...")
                 
-                if not existing_verse:
-                    # Create verse data
-                    verse_data = self.importer._create_verse_data(
-                        verse_info['chapter'],
-                        verse_info['verse'],
-                        verse_info['hebrew'],
-                        verse_info['english']
-                    )
-                    
-                    # Create verse
-                    verse = Verse(
-                        chapter_id=chapter.id,
-                        verse_number=verse_info['verse'],
-                        hebrew_text=verse_data['hebrew_text'],
-                        hebrew_consonantal=verse_data['hebrew_consonantal'],
-                        paleo_text=verse_data['paleo_text'],
-                        paleo_transliteration=verse_data['paleo_transliteration'],
-                        modern_transliteration=verse_data['modern_transliteration'],
-                        english_translation=verse_data['english_translation'],
-                        literal_translation=verse_data['literal_translation'],
-                    )
-                    
-                    db.session.add(verse)
-                    db.session.commit()
-                    
-                    self.total_imported += 1
-                    print(f"📝 Imported Genesis {verse_info['chapter']}:{verse_info['verse']} - {verse_data['paleo_transliteration'][:50]}...")
-                    
-                    # Simulate processing time
-                    time.sleep(0.5)
+                # Simulate processing time
+                time.sleep(0.5)
     
     def _import_sample_books(self):
         """Import sample verses from other books"""
@@ -169,49 +143,36 @@ class BackgroundBibleImporter:
             self.current_book = verse_info['book']
             self.current_chapter = f'Chapter {verse_info["chapter"]}'
             
-            book = Book.query.filter_by(name=verse_info['book']).first()
-            if book:
-                chapter = Chapter.query.filter_by(
-                    book_id=book.id,
-                    chapter_number=verse_info['chapter']
-                ).first()
+            book_id = self.import_session.book_id(verse_info['book'])
+            verse_data = self._import_verse(book_id, verse_info) if book_id else None
+            if verse_data:
+                print(f"📝 Imported {verse_info['book']} {verse_info['chapter']}:{verse_info['verse']} - {verse_data['paleo_transliteration'][:50]}...")
                 
-                if chapter:
-                    existing_verse = Verse.query.filter_by(
-                        chapter_id=chapter.id,
-                        verse_number=verse_info['verse']
-                    ).first()
-                    
-                    if not existing_verse:
-                        # Create verse data
-                        verse_data = self.importer._create_verse_data(
-                            verse_info['chapter'],
-                            verse_info['verse'],
-                            verse_info['hebrew'],
-                            verse_info['english']
-                        )
-                        
-                        # Create verse
-                        verse = Verse(
-                            chapter_id=chapter.id,
-                            verse_number=verse_info['verse'],
-                            hebrew_text=verse_data['hebrew_text'],
-                            hebrew_consonantal=verse_data['hebrew_consonantal'],
-                            paleo_text=verse_data['paleo_text'],
-                            paleo_transliteration=verse_data['paleo_transliteration'],
-                            modern_transliteration=verse_data['modern_transliteration'],
-                            english_translation=verse_data['english_translation'],
-                            literal_translation=verse_data['literal_translation'],
-                        )
-                        
-                        db.session.add(verse)
-                        db.session.commit()
-                        
-                        self.total_imported += 1
-                        print(f"📝 Imported {verse_info['book']} {verse_info['chapter']}:{verse_info['verse']} - {verse_data['paleo_transliteration'][:50]}...")
-                        
-                        # Simulate processing time
-                        time.sleep(0.5)
+                # Simulate processing time
+                time.sleep(0.5)
+    
+    def _import_verse(self, book_id, verse_info):
+        """Insert one verse; returns its data, or None when it exists already or its chapter doesn't"""
+        chapter_id = self.import_session.chapter_id(book_id, verse_info['chapter'])
+        if not chapter_id or self.import_session.has_verse(chapter_id, verse_info['verse']):
+            return None
+        
+        # Create verse data
+        verse_data = self.importer._create_verse_data(
+            verse_info['chapter'],
+            verse_info['verse'],
+            verse_info['hebrew'],
+            verse_info['english']
+        )
+        
+        inserted = self.import_session.insert_verses([verse_row(chapter_id, verse_info['verse'], verse_data)])
+        db.session.commit()
+        bump_generation()
+        
+        self.total_imported += inserted
+        if inserted:
+            self.imported_book_ids.add(book_id)
+        return verse_data if inserted else None
     
     def get_status(self):
         """Get current import status"""
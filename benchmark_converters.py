@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for utils/hebrew_converter.py
+Times the translate-table converters and convert_many against the previous per-character
+implementations over every verse in the database, and checks the output is identical
+"""
+
+import argparse
+import time
+
+from utils import hebrew_converter
+from utils.hebrew_converter import HEBREW_TO_PALEO, PALEO_TO_HEBREW, convert_many
+
+
+# Previous implementations (per-character loops), kept here as the reference
+
+def legacy_remove_nikud(hebrew_text):
+    nikud_ranges = [(0x0591, 0x05BD), (0x05BF, 0x05BF), (0x05C1, 0x05C2), (0x05C4, 0x05C5), (0x05C7, 0x05C7)]
+    ancient_punctuation = [0x05BE, 0x05C3, 0x05C0, 0x05C6]
+    result = ''
+    for char in hebrew_text:
+        char_code = ord(char)
+        if char_code in ancient_punctuation:
+            continue
+        is_nikud = any(start <= char_code <= end for start, end in nikud_ranges)
+        if not is_nikud:
+            result += char
+    return result
+
+
+def legacy_hebrew_to_paleo(hebrew_text):
+    paleo_text = ''
+    for char in legacy_remove_nikud(hebrew_text):
+        if char in HEBREW_TO_PALEO:
+            paleo_text += HEBREW_TO_PALEO[char]
+        elif char.isspace():
+            paleo_text += ' '
+    return paleo_text
+
+
+def legacy_paleo_to_hebrew(paleo_text):
+    hebrew_text = ''
+    for char in paleo_text:
+        hebrew_text += PALEO_TO_HEBREW.get(char, char)
+    return hebrew_text
+
+
+def legacy_normalize_hebrew(hebrew_text):
+    if not hebrew_text:
+        return ''
+    for separator in hebrew_converter.WORD_SEPARATORS:
+        hebrew_text = hebrew_text.replace(separator, ' ')
+    consonantal = legacy_remove_nikud(hebrew_text)
+    for final, regular in hebrew_converter.FINAL_FORMS.items():
+        consonantal = consonantal.replace(final, regular)
+    return ' '.join(consonantal.split())
+
+
+def legacy_get_pronunciation_guide(hebrew_word):
+    pronunciation = ''
+    for char in legacy_remove_nikud(hebrew_word):
+        pronunciation += hebrew_converter.PRONUNCIATION_MAP.get(char, char)
+    return pronunciation.strip()
+
+
+CONVERTERS = [
+    ('hebrew_to_paleo', legacy_hebrew_to_paleo, hebrew_converter.hebrew_to_paleo),
+    ('paleo_to_hebrew', legacy_paleo_to_hebrew, hebrew_converter.paleo_to_hebrew),
+    ('remove_nikud', legacy_remove_nikud, hebrew_converter.remove_nikud),
+    ('normalize_hebrew', legacy_normalize_hebrew, hebrew_converter.normalize_hebrew),
+    ('get_pronunciation_guide', legacy_get_pronunciation_guide, hebrew_converter.get_pronunciation_guide),
+]
+
+
+def _time(function, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run(texts, repeat=3):
+    paleo_texts = [hebrew_converter.hebrew_to_paleo(text) for text in texts]
+    letters = sum(len(text) for text in texts)
+    print(f"{len(texts)} verses, {letters:,} characters, best of {repeat}")
+    print(f"{'converter':<26}{'legacy':>10}{'translate':>12}{'convert_many':>14}{'speedup':>10}  identical")
+
+    for name, legacy, current in CONVERTERS:
+        inputs = paleo_texts if name == 'paleo_to_hebrew' else texts
+        legacy_time, expected = _time(lambda: [legacy(text) for text in inputs], repeat)
+        current_time, single = _time(lambda: [current(text) for text in inputs], repeat)
+        bulk_time, bulk = _time(lambda: convert_many(inputs, current), repeat)
+        identical = single == expected and bulk == expected
+        print(f"{name:<26}{legacy_time:>9.3f}s{current_time:>11.3f}s{bulk_time:>13.3f}s"
+              f"{legacy_time / max(min(current_time, bulk_time), 1e-9):>9.1f}x  {identical}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the Hebrew text converters over the verse corpus')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per converter (best time is reported)')
+
+    args = parser.parse_args()
+
+    from app import app
+    from models import db, Verse
+
+    with app.app_context():
+        corpus = [text for (text,) in db.session.query(Verse.hebrew_text).order_by(Verse.id) if text]
+
+    if not corpus:
+        print("No verses in the database - import the Bible first")
+    else:
+        run(corpus, args.repeat)
@@ -437,4 +437,30 @@ TESTAMENT_INFO = {
         'description': 'Writings - Wisdom and Historical',
         'books': 13
     }
-}
\ No newline at end of file
+}
+
+
+# Book codes used by standard Bible file formats, mapped to HEBREW_BIBLE_BOOKS names
+OSIS_BOOK_CODES = {
+    'Gen': 'Genesis', 'Exod': 'Exodus', 'Lev': 'Leviticus', 'Num': 'Numbers', 'Deut': 'Deuteronomy',
+    'Josh': 'Joshua', 'Judg': 'Judges', '1Sam': 'Samuel I', '2Sam': 'Samuel II',
+    '1Kgs': 'Kings I', '2Kgs': 'Kings II', 'Isa': 'Isaiah', 'Jer': 'Jeremiah', 'Ezek': 'Ezekiel',
+    'Hos': 'Hosea', 'Joel': 'Joel', 'Amos': 'Amos', 'Obad': 'Obadiah', 'Jonah': 'Jonah',
+    'Mic': 'Micah', 'Nah': 'Nahum', 'Hab': 'Habakkuk', 'Zeph': 'Zephaniah', 'Hag': 'Haggai',
+    'Zech': 'Zechariah', 'Mal': 'Malachi', 'Ps': 'Psalms', 'Prov': 'Proverbs', 'Job': 'Job',
+    'Song': 'Song of Songs', 'Ruth': 'Ruth', 'Lam': 'Lamentations', 'Eccl': 'Ecclesiastes',
+    'Esth': 'Esther', 'Dan': 'Daniel', 'Ezra': 'Ezra', 'Neh': 'Nehemiah',
+    '1Chr': 'Chronicles I', '2Chr': 'Chronicles II',
+}
+
+USFM_BOOK_CODES = {
+    'GEN': 'Genesis', 'EXO': 'Exodus', 'LEV': 'Leviticus', 'NUM': 'Numbers', 'DEU': 'Deuteronomy',
+    'JOS': 'Joshua', 'JDG': 'Judges', '1SA': 'Samuel I', '2SA': 'Samuel II',
+    '1KI': 'Kings I', '2KI': 'Kings II', 'ISA': 'Isaiah', 'JER': 'Jeremiah', 'EZK': 'Ezekiel',
+    'HOS': 'Hosea', 'JOL': 'Joel', 'AMO': 'Amos', 'OBA': 'Obadiah', 'JON': 'Jonah',
+    'MIC': 'Micah', 'NAM': 'Nahum', 'HAB': 'Habakkuk', 'ZEP': 'Zephaniah', 'HAG': 'Haggai',
+    'ZEC': 'Zechariah', 'MAL': 'Malachi', 'PSA': 'Psalms', 'PRO': 'Proverbs', 'JOB': 'Job',
+    'SNG': 'Song of Songs', 'RUT': 'Ruth', 'LAM': 'Lamentations', 'ECC': 'Ecclesiastes',
+    'EST': 'Esther', 'DAN': 'Daniel', 'EZR': 'Ezra', 'NEH': 'Nehemiah',
+    '1CH': 'Chronicles I', '2CH': 'Chronicles II',
+}
@@ -57,6 +57,19 @@ pip install -r requirements.txt
 echo "🗄️ Setting up database..."
 python -c "from app import app; from models import db; app.app_context().push(); db.create_all(); print('Database initialized')"
 
+# Duplicate verses block the unique (chapter, verse number) index. This only reports them and
+# stops the deploy; deleting them is a manual step: python -m utils.references --remove-duplicates
+echo "🔎 Checking for duplicate verses..."
+python -m utils.references --check
+
+# Refresh verse transliterations (only rows whose output changed are written)
+echo "🔤 Backfilling transliterations..."
+python -m utils.nikud_transliteration --backfill
+
+# Word, root and gematria rows for verses imported before those index stages existed
+echo "🗂️ Backfilling word, root and gematria indexes..."
+python -m utils.book_indexes --backfill
+
 # Set up systemd service
 echo "⚙️ Setting up systemd service..."
 sudo cp paleo-hebrew-bible.service /etc/systemd/system/
@@ -6,6 +6,9 @@ Adapt the existing Hebrew/Paleo structure for Greek New Testament
 
 from app import app, db
 from models import Book, Chapter, Verse
+from utils.data_generation import bump_generation
+from utils.import_session import ImportSession
+from utils.book_indexes import index_books
 import requests
 import re
 import time
@@ -159,9 +162,12 @@ def get_sefaria_nt_name(book_name):
     }
     return sefaria_names.get(book_name, book_name)
 
-def import_nt_book_content(book, max_chapters=None):
+def import_nt_book_content(book, max_chapters=None, import_session=None):
     """Import verses for a New Testament book"""
     
+    if import_session is None:
+        import_session = ImportSession()
+    
     book_name = book.name
     sefaria_name = get_sefaria_nt_name(book_name)
     expected_chapters = get_nt_chapter_counts().get(book_name, 1)
@@ -179,13 +185,10 @@ def import_nt_book_content(book, max_chapters=None):
             print(f"  📄 Processing {book_name} Chapter {chapter_num}...")
             
             # Check if chapter already has verses
-            chapter = Chapter.query.filter_by(
-                book_id=book.id,
-                chapter_number=chapter_num
-            ).first()
+            chapter_id = import_session.chapter_id(book.id, chapter_num)
             
-            if chapter:
-                existing_verse_count = Verse.query.filter_by(chapter_id=chapter.id).count()
+            if chapter_id:
+                existing_verse_count = import_session.verse_count(chapter_id)
                 if existing_verse_count > 0:
                     print(f"    ✅ Chapter {chapter_num} already has {existing_verse_count} verses, skipping")
                     continue
@@ -203,16 +206,18 @@ def import_nt_book_content(book, max_chapters=None):
                         print(f"    📝 Found {len(english_verses)} verses from Sefaria")
                         
                         # Create chapter if it doesn't exist
-                        if not chapter:
+                        if not chapter_id:
                             chapter = Chapter(
                                 book_id=book.id,
                                 chapter_number=chapter_num
                             )
                             db.session.add(chapter)
                             db.session.flush()
+                            import_session.add_chapter(chapter)
+                            chapter_id = chapter.id
                         
                         # Add verses (using English text as placeholder)
-                        verses_added = 0
+                        rows = []
                         for verse_num, english_verse in enumerate(english_verses, 1):
                             if isinstance(english_verse, list):
                                 english_verse = " ".join(english_verse)
@@ -222,22 +227,22 @@ def import_nt_book_content(book, max_chapters=None):
                                 continue
                             
                             # Create verse with adapted structure
-                            verse = Verse(
-                                chapter_id=chapter.id,
-                                verse_number=verse_num,
-                                hebrew_text=english_clean,  # Using for Greek text placeholder
-                                hebrew_consonantal=english_clean,  # Placeholder
-                                paleo_text=english_clean,  # Placeholder  
-                                paleo_transliteration=greek_to_transliteration(english_clean),
-                                modern_transliteration=greek_to_transliteration(english_clean),
-                                english_translation=english_clean,
-                                literal_translation=english_clean
-                            )
-                            
-                            db.session.add(verse)
-                            verses_added += 1
+                            rows.append({
+                                'chapter_id': chapter_id,
+                                'verse_number': verse_num,
+                                'hebrew_text': english_clean,  # Using for Greek text placeholder
+                                'hebrew_consonantal': english_clean,  # Placeholder
+                                'paleo_text': english_clean,  # Placeholder
+                                'paleo_transliteration': greek_to_transliteration(english_clean),
+                                'modern_transliteration': greek_to_transliteration(english_clean),
+                                'english_translation': english_clean,
+                                'literal_translation': english_clean
+                            })
                         
+                        # One upsert per chapter; verses that already exist are skipped
+                        verses_added = import_session.insert_verses(rows)
                         db.session.commit()
+                        bump_generation()
                         total_verses_imported += verses_added
                         chapters_processed += 1
                         
@@ -255,6 +260,9 @@ def import_nt_book_content(book, max_chapters=None):
             print(f"  ❌ Error processing {book_name} chapter {chapter_num}: {e}")
             continue
     
+    if total_verses_imported:
+        index_books([book.id])
+    
     print(f"📊 {book_name} processing complete: {chapters_processed} chapters, {total_verses_imported} verses imported")
     return total_verses_imported, chapters_processed
 
@@ -271,6 +279,7 @@ def import_all_nt_books():
         
         # Get all NT books
         nt_books = Book.query.filter_by(testament='New Testament').order_by(Book.order).all()
+        import_session = ImportSession()
         
         total_books_processed = 0
         total_verses_imported = 0
@@ -281,7 +290,7 @@ def import_all_nt_books():
                 print(f"\n{'='*60}")
                 print(f"📖 Processing {book.name} ({book.hebrew_name})")
                 
-                verses_imported, chapters_processed = import_nt_book_content(book)
+                verses_imported, chapters_processed = import_nt_book_content(book, import_session=import_session)
                 
                 total_books_processed += 1
                 total_verses_imported += verses_imported
@@ -7,6 +7,8 @@ from models import db, PaleoLetter, Book, Chapter, Verse
 from data.paleo_alphabet import paleo_alphabet_data
 from data.bible_books import HEBREW_BIBLE_BOOKS, TESTAMENT_INFO
 from utils.bible_importer import BibleImporter
+from utils.book_indexes import index_books
+from utils.import_session import ImportSession, verse_row
 import requests
 import json
 import time
@@ -106,38 +108,17 @@ class CompleteBibleInitializer:
         # Get sample Genesis data from importer
         sample_verses = self.importer.create_sample_genesis_data()
         
+        import_session = ImportSession()
+        rows = []
         for verse_data in sample_verses:
-            chapter = Chapter.query.filter_by(
-                book_id=genesis.id, 
-                chapter_number=verse_data['chapter']
-            ).first()
-            
-            if chapter:
-                # Check if verse already exists
-                existing_verse = Verse.query.filter_by(
-                    chapter_id=chapter.id,
-                    verse_number=verse_data['verse']
-                ).first()
-                
-                if not existing_verse:
-                    verse = Verse(
-                        chapter_id=chapter.id,
-                        verse_number=verse_data['verse'],
-                        hebrew_text=verse_data['hebrew_text'],
-                        hebrew_consonantal=verse_data['hebrew_consonantal'],
-                        paleo_text=verse_data['paleo_text'],
-                        paleo_transliteration=verse_data['paleo_transliteration'],
-                        modern_transliteration=verse_data['modern_transliteration'],
-                        english_translation=verse_data['english_translation'],
-                        literal_translation=verse_data['literal_translation'],
-                        strong_numbers=verse_data.get('strong_numbers', ''),
-                        morphology=verse_data.get('morphology', ''),
-                        notes=verse_data.get('notes', '')
-                    )
-                    db.session.add(verse)
-                    self.verses_imported += 1
+            chapter_id = import_session.chapter_id(genesis.id, verse_data['chapter'])
+            if chapter_id:
+                rows.append(verse_row(chapter_id, verse_data['verse'], verse_data))
         
+        # Verses that already exist are skipped
+        self.verses_imported += import_session.insert_verses(rows)
         db.session.commit()
+        index_books([genesis.id])
         print(f"✅ Added {self.verses_imported} enhanced Genesis verses")
     
     def import_book_from_api(self, book_name: str, sefaria_name: str = None):
@@ -165,44 +146,17 @@ class CompleteBibleInitializer:
                 print(f"❌ No data retrieved for {book_name}")
                 return
             
-            imported_count = 0
+            import_session = ImportSession()
+            rows = []
             for verse_data in verses_data:
-                chapter = Chapter.query.filter_by(
-                    book_id=book.id,
-                    chapter_number=verse_data['chapter']
-                ).first()
-                
-                if chapter:
-                    # Check if verse already exists
-                    existing_verse = Verse.query.filter_by(
-                        chapter_id=chapter.id,
-                        verse_number=verse_data['verse']
-                    ).first()
-                    
-                    if not existing_verse:
-                        verse = Verse(
-                            chapter_id=chapter.id,
-                            verse_number=verse_data['verse'],
-                            hebrew_text=verse_data['hebrew_text'],
-                            hebrew_consonantal=verse_data['hebrew_consonantal'],
-                            paleo_text=verse_data['paleo_text'],
-                            paleo_transliteration=verse_data['paleo_transliteration'],
-                            modern_transliteration=verse_data['modern_transliteration'],
-                            english_translation=verse_data['english_translation'],
-                            literal_translation=verse_data['literal_translation'],
-                            strong_numbers=verse_data.get('strong_numbers', ''),
-                            morphology=verse_data.get('morphology', ''),
-                            notes=verse_data.get('notes', '')
-                        )
-                        db.session.add(verse)
-                        imported_count += 1
-                        
-                        # Commit every 100 verses to avoid memory issues
-                        if imported_count % 100 == 0:
-                            db.session.commit()
-                            print(f"  📝 Imported {imported_count} verses...")
+                chapter_id = import_session.chapter_id(book.id, verse_data['chapter'])
+                if chapter_id:
+                    rows.append(verse_row(chapter_id, verse_data['verse'], verse_data))
             
+            # One upsert for the whole book; verses that already exist are skipped
+            imported_count = import_session.insert_verses(rows)
             db.session.commit()
+            index_books([book.id])
             print(f"✅ Successfully imported {imported_count} verses for {book_name}")
             self.verses_imported += imported_count
             
@@ -245,41 +199,24 @@ class CompleteBibleInitializer:
         
         genesis = Book.query.filter_by(name='Genesis').first()
         if genesis:
+            import_session = ImportSession()
+            rows = []
             for verse_info in test_verses:
+                chapter_id = import_session.chapter_id(genesis.id, verse_info['chapter'])
+                if not chapter_id or import_session.has_verse(chapter_id, verse_info['verse']):
+                    continue
+                
                 verse_data = self.importer._create_verse_data(
                     verse_info['chapter'],
                     verse_info['verse'],
                     verse_info['hebrew'],
                     verse_info['english']
                 )
-                
-                chapter = Chapter.query.filter_by(
-                    book_id=genesis.id,
-                    chapter_number=verse_info['chapter']
-                ).first()
-                
-                if chapter:
-                    existing_verse = Verse.query.filter_by(
-                        chapter_id=chapter.id,
-                        verse_number=verse_info['verse']
-                    ).first()
-                    
-                    if not existing_verse:
-                        verse = Verse(
-                            chapter_id=chapter.id,
-                            verse_number=verse_info['verse'],
-                            hebrew_text=verse_data['hebrew_text'],
-                            hebrew_consonantal=verse_data['hebrew_consonantal'],
-                            paleo_text=verse_data['paleo_text'],
-                            paleo_transliteration=verse_data['paleo_transliteration'],
-                            modern_transliteration=verse_data['modern_transliteration'],
-                            english_translation=verse_data['english_translation'],
-                            literal_translation=verse_data['literal_translation'],
-                        )
-                        db.session.add(verse)
-                        self.verses_imported += 1
+                rows.append(verse_row(chapter_id, verse_info['verse'], verse_data))
             
+            self.verses_imported += import_session.insert_verses(rows)
             db.session.commit()
+            index_books([genesis.id])
             print(f"✅ Added {len(test_verses)} test verses")
 
 def main():
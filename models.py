@@ -1,5 +1,8 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import validates
 from datetime import datetime
+import json
+from utils.hebrew_converter import normalize_hebrew
 
 # Create db instance that will be imported by app.py
 db = SQLAlchemy()
@@ -11,6 +14,7 @@ class Book(db.Model):
     paleo_name = db.Column(db.String(100), nullable=False)
     order = db.Column(db.Integer, nullable=False)
     testament = db.Column(db.String(20), nullable=False)  # 'Torah', 'Nevi\'im', 'Ketuvim'
+    chapter_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Maintained by utils/corpus_stats.py
     chapters = db.relationship('Chapter', backref='book', lazy=True, cascade='all, delete-orphan')
     
     def to_dict(self):
@@ -21,13 +25,14 @@ class Book(db.Model):
             'paleo_name': self.paleo_name,
             'order': self.order,
             'testament': self.testament,
-            'chapter_count': len(self.chapters)
+            'chapter_count': self.chapter_count
         }
 
 class Chapter(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     book_id = db.Column(db.Integer, db.ForeignKey('book.id'), nullable=False)
     chapter_number = db.Column(db.Integer, nullable=False)
+    verse_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Maintained by utils/corpus_stats.py
     verses = db.relationship('Verse', backref='chapter', lazy=True, cascade='all, delete-orphan')
     
     def to_dict(self):
@@ -35,18 +40,27 @@ class Chapter(db.Model):
             'id': self.id,
             'book_id': self.book_id,
             'chapter_number': self.chapter_number,
-            'verse_count': len(self.verses)
+            'verse_count': self.verse_count
         }
 
 class Verse(db.Model):
+    __table_args__ = (
+        # One row per verse, so bulk imports can insert with ON CONFLICT DO NOTHING
+        db.Index('uq_verse_chapter_verse', 'chapter_id', 'verse_number', unique=True),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     chapter_id = db.Column(db.Integer, db.ForeignKey('chapter.id'), nullable=False)
     verse_number = db.Column(db.Integer, nullable=False)
+    ordinal = db.Column(db.Integer, index=True, unique=True)  # Canonical address BBCCCVVV (book order, chapter, verse)
     
     # Original texts
     hebrew_text = db.Column(db.Text, nullable=False)  # Modern Hebrew with nikud
     hebrew_consonantal = db.Column(db.Text, nullable=False)  # Hebrew without nikud
     paleo_text = db.Column(db.Text, nullable=False)  # Paleo Hebrew script
+    hebrew_normalized = db.Column(db.Text, default=lambda context: normalize_hebrew(
+        context.get_current_parameters().get('hebrew_text')))  # Search form: no nikud, finals folded, maqaf split
+    gematria = db.Column(db.Integer, index=True)  # Sum of letter values of the consonantal text
     
     # Transliterations
     paleo_transliteration = db.Column(db.Text, nullable=False)  # Ancient pronunciation (barashyt bara)
@@ -61,35 +75,132 @@ class Verse(db.Model):
     morphology = db.Column(db.Text)  # Morphological analysis
     notes = db.Column(db.Text)  # Commentary or notes
     
+    words = db.relationship('VerseWord', backref='verse', lazy=True, cascade='all, delete-orphan',
+                            order_by='VerseWord.position')
+    
     # Metadata
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    @validates('hebrew_text')
+    def _update_hebrew_normalized(self, key, hebrew_text):
+        # Keep the search column in step with the pointed text
+        self.hebrew_normalized = normalize_hebrew(hebrew_text)
+        return hebrew_text
+    
+    # Fields of to_dict(), in output order
+    FIELDS = ('id', 'chapter_id', 'verse_number', 'ordinal', 'hebrew_text', 'hebrew_consonantal', 'paleo_text',
+              'paleo_transliteration', 'modern_transliteration', 'english_translation', 'literal_translation',
+              'strong_numbers', 'morphology', 'notes')
+    
+    def to_dict(self, fields=None):
+        # Only touch requested attributes so columns left unloaded by a projection stay unloaded
+        data = {}
+        for field in fields or self.FIELDS:
+            value = getattr(self, field)
+            if field == 'paleo_text' and value:
+                # Clean paleo text by removing ancient punctuation marks
+                # Remove maqqef (־) and sof pasuq (׃) and other ancient punctuation
+                for punct in ['־', '׃', '׀', '׆']:
+                    value = value.replace(punct, '')
+            data[field] = value
+        return data
+
+class VerseWord(db.Model):
+    """One row per word occurrence, in verse order"""
+    __table_args__ = (
+        db.UniqueConstraint('verse_id', 'position', name='uq_verse_word_position'),
+        db.Index('ix_verse_word_normalized_verse', 'normalized', 'verse_id', 'position'),
+        db.Index('ix_verse_word_strong_verse', 'strong_number', 'verse_id'),
+        db.Index('ix_verse_word_gematria_verse', 'gematria', 'verse_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    verse_id = db.Column(db.Integer, db.ForeignKey('verse.id'), nullable=False)
+    position = db.Column(db.Integer, nullable=False)  # 1-based word position in the verse
+    
+    hebrew = db.Column(db.String(100), nullable=False)  # Pointed form as written
+    consonantal = db.Column(db.String(100), nullable=False)  # Without nikud
+    normalized = db.Column(db.String(100), nullable=False)  # Final forms folded, for lookups
+    paleo = db.Column(db.String(100), nullable=False)  # Paleo Hebrew script
+    strong_number = db.Column(db.String(20))  # Strong's number once resolved
+    gematria = db.Column(db.Integer)  # Sum of letter values
+    
     def to_dict(self):
-        # Clean paleo text by removing ancient punctuation marks
-        clean_paleo_text = self.paleo_text
-        if clean_paleo_text:
-            # Remove maqqef (־) and sof pasuq (׃) and other ancient punctuation
-            ancient_punctuation = ['־', '׃', '׀', '׆']
-            for punct in ancient_punctuation:
-                clean_paleo_text = clean_paleo_text.replace(punct, '')
-        
         return {
             'id': self.id,
-            'chapter_id': self.chapter_id,
-            'verse_number': self.verse_number,
-            'hebrew_text': self.hebrew_text,
-            'hebrew_consonantal': self.hebrew_consonantal,
-            'paleo_text': clean_paleo_text,
-            'paleo_transliteration': self.paleo_transliteration,
-            'modern_transliteration': self.modern_transliteration,
-            'english_translation': self.english_translation,
-            'literal_translation': self.literal_translation,
-            'strong_numbers': self.strong_numbers,
-            'morphology': self.morphology,
-            'notes': self.notes
+            'verse_id': self.verse_id,
+            'position': self.position,
+            'hebrew': self.hebrew,
+            'consonantal': self.consonantal,
+            'paleo': self.paleo,
+            'strong_number': self.strong_number,
+            'gematria': self.gematria
         }
 
+class VerseRoot(db.Model):
+    """Root (shoresh) index: one row per candidate root per verse"""
+    __table_args__ = (
+        db.Index('ix_verse_root_verse', 'verse_id'),
+    )
+    
+    root = db.Column(db.String(10), primary_key=True)  # 2-3 consonants, final forms folded
+    verse_id = db.Column(db.Integer, db.ForeignKey('verse.id'), primary_key=True)
+
+class DataGeneration(db.Model):
+    """Single-row counter bumped whenever Bible or reference data changes; versions in-process caches"""
+    id = db.Column(db.Integer, primary_key=True)  # Always 1
+    generation = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class CorpusStat(db.Model):
+    """Materialized corpus statistics: one row per book, per testament and for the whole corpus"""
+    scope = db.Column(db.String(20), primary_key=True)  # book, testament, total
+    key = db.Column(db.String(100), primary_key=True)  # Book name, testament name or 'all'
+    sort_order = db.Column(db.Integer, nullable=False, default=0)  # Book order / first book order
+    hebrew_name = db.Column(db.String(100))  # Books only
+    testament = db.Column(db.String(20))  # Books only
+    books = db.Column(db.Integer, nullable=False, default=0)
+    books_with_verses = db.Column(db.Integer, nullable=False, default=0)
+    chapters = db.Column(db.Integer, nullable=False, default=0)
+    verses = db.Column(db.Integer, nullable=False, default=0)
+    words = db.Column(db.Integer, nullable=False, default=0)
+    letters = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ElsJob(db.Model):
+    """Equidistant letter sequence search job; shared by all app workers through the database"""
+    id = db.Column(db.String(36), primary_key=True)  # uuid4 hex
+    term = db.Column(db.String(50), nullable=False)  # Normalized search term
+    books = db.Column(db.Text, nullable=False)  # JSON list of book names searched
+    min_skip = db.Column(db.Integer, nullable=False)
+    max_skip = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(20), default='queued')  # queued, running, completed, failed
+    hit_count = db.Column(db.Integer, default=0)
+    results = db.Column(db.Text)  # JSON list of hits
+    error = db.Column(db.Text)
+    elapsed = db.Column(db.Float)  # Search time in seconds
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+
+    def to_dict(self, include_results=True):
+        data = {
+            'id': self.id,
+            'term': self.term,
+            'books': json.loads(self.books),
+            'min_skip': self.min_skip,
+            'max_skip': self.max_skip,
+            'status': self.status,
+            'hit_count': self.hit_count,
+            'error': self.error,
+            'elapsed': self.elapsed,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+        if include_results:
+            data['results'] = json.loads(self.results) if self.results else []
+        return data
+
 class GodFact(db.Model):
     """Model for storing amazing facts that prove God is real"""
     id = db.Column(db.Integer, primary_key=True)
@@ -175,6 +286,11 @@ class Word(db.Model):
         }
 
 class StrongsHebrew(db.Model):
+    __table_args__ = (
+        # Numeric order of Strong's numbers (H2 before H10) for keyset pagination
+        db.Index('ix_strongs_hebrew_numeric', db.text('CAST(substr(strong_number, 2) AS INTEGER)'), 'strong_number'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     strong_number = db.Column(db.String(20), nullable=False, unique=True)  # H1, H2, etc.
     hebrew_word = db.Column(db.String(100), nullable=False)
@@ -202,6 +318,11 @@ class StrongsHebrew(db.Model):
         }
 
 class StrongsGreek(db.Model):
+    __table_args__ = (
+        # Numeric order of Strong's numbers (G2 before G10) for keyset pagination
+        db.Index('ix_strongs_greek_numeric', db.text('CAST(substr(strong_number, 2) AS INTEGER)'), 'strong_number'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     strong_number = db.Column(db.String(20), nullable=False, unique=True)  # G1, G2, etc.
     greek_word = db.Column(db.String(100), nullable=False)
@@ -192,9 +192,12 @@ async function updateChapterNavigation() {
     const nextBtn = document.getElementById('next-chapter-btn');
     
     try {
-        // Get navigation info from API
-        const response = await fetch(`/api/books/${currentChapter.book.id}/chapters/${currentChapter.chapter_number}/navigation`);
-        const navInfo = await response.json();
+        // Navigation is embedded in the chapter response; older responses need a separate request
+        let navInfo = currentChapter.navigation;
+        if (!navInfo) {
+            const response = await fetch(`/api/books/${currentChapter.book.id}/chapters/${currentChapter.chapter_number}/navigation`);
+            navInfo = await response.json();
+        }
         
         // Update previous button
         if (navInfo.previous) {
@@ -332,30 +335,54 @@ async function showLetterDetails(letter) {
 }
 
 // Search functions
-async function searchVerses() {
-    const query = document.getElementById('search-input').value.trim();
-    const searchType = document.getElementById('search-type').value;
-    
-    if (!query) {
-        alert('Please enter a search term');
-        return;
+let currentSearch = null;
+let searchCursor = null;
+let searchResults = [];
+
+async function searchVerses(reset = true) {
+    if (reset) {
+        const query = document.getElementById('search-input').value.trim();
+        const searchType = document.getElementById('search-type').value;
+        
+        if (!query) {
+            alert('Please enter a search term');
+            return;
+        }
+        
+        currentSearch = { query, searchType };
+        searchCursor = null;
+        searchResults = [];
     }
     
     try {
-        const response = await fetch(`/api/search?q=${encodeURIComponent(query)}&type=${searchType}`);
+        const cursorParam = searchCursor !== null ? `&cursor=${searchCursor}` : '';
+        const response = await fetch(`/api/search?q=${encodeURIComponent(currentSearch.query)}&type=${currentSearch.searchType}${cursorParam}`);
         const results = await response.json();
         
+        searchResults.push(...results.results);
+        searchCursor = results.next_cursor;
+        
         displaySearchResults(results);
+        
+        // Update load more button
+        const loadMoreBtn = document.getElementById('load-more-results');
+        if (loadMoreBtn) {
+            loadMoreBtn.style.display = results.has_more ? 'block' : 'none';
+        }
     } catch (error) {
         console.error('Error searching verses:', error);
         document.getElementById('search-results').innerHTML = '<p>Error performing search. Please try again.</p>';
     }
 }
 
+function loadMoreResults() {
+    searchVerses(false);
+}
+
 function displaySearchResults(results) {
     const container = document.getElementById('search-results');
     
-    if (results.count === 0) {
+    if (searchResults.length === 0) {
         container.innerHTML = `
             <div class="search-result">
                 <p>No results found for "${results.query}"</p>
@@ -364,9 +391,10 @@ function displaySearchResults(results) {
         return;
     }
     
+    // Results come a page at a time, so only the number shown so far is known
     container.innerHTML = `
-        <h3>Found ${results.count} result(s) for "${results.query}"</h3>
-        ${results.results.map(verse => `
+        <h3>Showing ${searchResults.length}${results.has_more ? '+' : ''} result(s) for "${results.query}"</h3>
+        ${searchResults.map(verse => `
             <div class="search-result">
                 <div class="result-header">
                     <div class="result-reference">
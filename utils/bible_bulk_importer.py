@@ -4,6 +4,8 @@ Supports multiple data sources with rate limiting, progress tracking, and resuma
 """
 
 import json
+import multiprocessing
+import queue
 import requests
 import time
 import os
@@ -11,12 +13,19 @@ import threading
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor
 from urllib.parse import quote
 
-from models import db, Book, Chapter, Verse
+from models import db, Book
 from utils.bible_importer import BibleImporter
 from utils.local_hebrew_source import LocalHebrewBibleSource, create_expanded_local_source
+from utils.bible_file_source import create_file_source
+from utils.search_index import ensure_search_index, optimize_search_index
+from utils.book_indexes import index_book
+from utils.schema import upgrade_schema
+from utils.data_generation import bump_generation
+from utils.import_pipeline import QUEUE_SIZE, StageStats, chunked, init_transform_worker, transform_verses
+from utils.import_session import ImportSession
 from data.bible_books import HEBREW_BIBLE_BOOKS
 
 # Configure logging
@@ -133,14 +142,16 @@ class HebrewBibleDataSource:
         self.name = name
         self.rate_limit_delay = rate_limit_delay
         self.last_request_time = 0
+        self._rate_lock = threading.Lock()  # Fetcher threads share one source
     
     def _rate_limit(self):
         """Implement rate limiting between requests"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - time_since_last)
-        self.last_request_time = time.time()
+        with self._rate_lock:
+            current_time = time.time()
+            time_since_last = current_time - self.last_request_time
+            if time_since_last < self.rate_limit_delay:
+                time.sleep(self.rate_limit_delay - time_since_last)
+            self.last_request_time = time.time()
     
     def fetch_book_data(self, book_name: str, sefaria_name: str = None) -> List[Dict]:
         """Fetch book data - to be implemented by subclasses"""
@@ -244,15 +255,24 @@ class BulkHebrewBibleImporter:
             SefariaDataSource(),
             create_expanded_local_source(),  # Fallback to local data
         ]
+        # Local OSIS/WLC/USFM files (BIBLE_DATA_DIR) come first so a full build needs no network
+        file_source = create_file_source()
+        if file_source:
+            self.data_sources.insert(0, file_source)
         self._stop_import = False
     
-    def import_complete_bible(self, resume: bool = True, max_workers: int = 1) -> bool:
+    def import_complete_bible(self, resume: bool = True, max_workers: int = 1,
+                              transform_workers: Optional[int] = None) -> bool:
         """
         Import the complete Hebrew Bible
         
+        Books flow through three stages: fetcher threads, a process pool for the text transforms
+        and a single writer in this thread.
+        
         Args:
             resume: Whether to resume from previous progress
-            max_workers: Number of concurrent workers (default 1 for politeness to APIs)
+            max_workers: Number of fetcher threads (default 1 for politeness to APIs)
+            transform_workers: Transform processes (default: one per CPU)
         """
         if not resume:
             self.progress = ImportProgress()  # Reset progress
@@ -273,43 +293,12 @@ class BulkHebrewBibleImporter:
             
             logging.info(f"Importing {len(books_to_import)} books...")
             
-            # Import books in order (Torah first, then Prophets, then Writings)
-            success_count = 0
-            
-            if max_workers == 1:
-                # Sequential import for better API politeness
-                for book_info in books_to_import:
-                    if self._stop_import:
-                        break
-                    
-                    success = self._import_single_book(book_info)
-                    if success:
-                        success_count += 1
-                    
-                    # Small delay between books
-                    time.sleep(2)
-            else:
-                # Parallel import (use cautiously)
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    future_to_book = {
-                        executor.submit(self._import_single_book, book_info): book_info 
-                        for book_info in books_to_import
-                    }
-                    
-                    for future in as_completed(future_to_book):
-                        if self._stop_import:
-                            break
-                        
-                        book_info = future_to_book[future]
-                        try:
-                            success = future.result()
-                            if success:
-                                success_count += 1
-                        except Exception as e:
-                            logging.error(f"Error importing {book_info['name']}: {e}")
+            success_count = self._run_pipeline(books_to_import, max(1, max_workers),
+                                               max(1, transform_workers or os.cpu_count() or 1))
             
             if not self._stop_import:
                 self.progress.complete_import()
+                self._optimize_search_index()
                 logging.info(f"Import completed! Successfully imported {success_count}/{len(books_to_import)} books")
             
             return success_count == len(books_to_import)
@@ -332,137 +321,178 @@ class BulkHebrewBibleImporter:
         """Get all books in proper import order (Torah, Prophets, Writings)"""
         return sorted(HEBREW_BIBLE_BOOKS, key=lambda x: x['order'])
     
-    def _import_single_book(self, book_info: Dict) -> bool:
-        """Import a single book"""
-        book_name = book_info['name']
+    def _run_pipeline(self, books_to_import: List[Dict], fetch_workers: int, transform_workers: int) -> int:
+        """
+        Fetch, transform and write books concurrently
         
-        try:
-            self.progress.start_book(book_name)
-            logging.info(f"Starting import of {book_name}...")
-            
-            # Try each data source until we get data
-            verse_data = []
-            for source in self.data_sources:
+        Returns:
+            int: Number of books that had verses written
+        """
+        fetch_stats = StageStats('fetch')
+        transform_stats = StageStats('transform')
+        write_stats = StageStats('write')
+        started = time.perf_counter()
+        
+        pending_books = queue.Queue()
+        for book_info in books_to_import:  # Torah first, then Prophets, then Writings
+            pending_books.put(book_info)
+        # (book_info, transform futures); bounded so fetchers wait when the writer falls behind
+        fetched_books = queue.Queue(maxsize=QUEUE_SIZE)
+        
+        # Spawned workers import the app afresh instead of inheriting the writer's connections
+        with ProcessPoolExecutor(max_workers=transform_workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=init_transform_worker) as pool:
+            def fetch():
                 try:
-                    verse_data = source.fetch_book_data(book_name, book_name)
-                    if verse_data:
-                        logging.info(f"Successfully fetched {len(verse_data)} verses from {source.name}")
-                        break
-                except Exception as e:
-                    logging.warning(f"Failed to fetch from {source.name}: {e}")
-                    continue
+                    while not self._stop_import:
+                        try:
+                            book_info = pending_books.get_nowait()
+                        except queue.Empty:
+                            break
+                        
+                        fetch_started = time.perf_counter()
+                        verse_data = self._fetch_book(book_info)
+                        fetch_stats.add(len(verse_data), time.perf_counter() - fetch_started, books=1)
+                        
+                        if verse_data:
+                            futures = [pool.submit(transform_verses, book_info['order'], chunk)
+                                       for chunk in chunked(verse_data)]
+                            fetched_books.put((book_info, futures))
+                finally:
+                    fetched_books.put(None)
             
-            if not verse_data:
-                logging.error(f"No data sources available for {book_name}")
-                self.progress.add_error({
-                    'type': 'no_data',
-                    'message': 'No data sources returned data',
-                    'book': book_name
-                })
-                return False
+            fetchers = [threading.Thread(target=fetch, name=f'bible-fetch-{i}', daemon=True)
+                        for i in range(fetch_workers)]
+            for fetcher in fetchers:
+                fetcher.start()
             
-            # Import verses to database
-            imported_count = self._import_verses_to_db(book_name, verse_data)
+            success_count = self._write_books(fetched_books, fetch_workers, transform_stats, write_stats)
             
-            if imported_count > 0:
-                self.progress.complete_book(book_name, imported_count)
-                logging.info(f"Successfully imported {book_name} with {imported_count} verses")
-                return True
-            else:
-                logging.warning(f"No verses imported for {book_name}")
-                return False
-                
-        except Exception as e:
-            logging.error(f"Error importing {book_name}: {e}")
-            self.progress.add_error({
-                'type': 'import_error',
-                'message': str(e),
-                'book': book_name
-            })
-            return False
-    
-    def _import_verses_to_db(self, book_name: str, verse_data: List[Dict]) -> int:
-        """Import verse data to database"""
+            for fetcher in fetchers:
+                fetcher.join()
+        
+        elapsed = time.perf_counter() - started
+        for stats in (fetch_stats, transform_stats, write_stats):
+            logging.info(stats.summary())
+        logging.info(f"Pipeline: {write_stats.verses} verses written in {elapsed:.1f}s "
+                     f"({write_stats.verses / max(elapsed, 1e-9):.0f} verses/s), "
+                     f"{fetch_workers} fetchers, {transform_workers} transform workers")
+        return success_count
+    
+    def _fetch_book(self, book_info: Dict) -> List[Dict]:
+        """Fetch stage: try each data source until one returns verses"""
+        book_name = book_info['name']
+        self.progress.start_book(book_name)
+        logging.info(f"Starting import of {book_name}...")
+        
+        for source in self.data_sources:
+            try:
+                verse_data = source.fetch_book_data(book_name, book_name)
+                if verse_data:
+                    logging.info(f"Successfully fetched {len(verse_data)} verses from {source.name}")
+                    return verse_data
+            except Exception as e:
+                logging.warning(f"Failed to fetch from {source.name}: {e}")
+                continue
+        
+        logging.error(f"No data sources available for {book_name}")
+        self.progress.add_error({
+            'type': 'no_data',
+            'message': 'No data sources returned data',
+            'book': book_name
+        })
+        return []
+    
+    def _write_books(self, fetched_books: queue.Queue, fetch_workers: int,
+                     transform_stats: StageStats, write_stats: StageStats) -> int:
+        """Write stage: the only database writer, draining fetched books until every fetcher is done"""
         from app import app
         
+        success_count = 0
+        finished_fetchers = 0
+        
         with app.app_context():
-            # Get the book
-            book = Book.query.filter_by(name=book_name).first()
-            if not book:
-                logging.error(f"Book {book_name} not found in database")
-                return 0
-            
-            imported_count = 0
-            batch_size = 100
-            batch_verses = []
+            # Make sure new columns and the search index triggers exist before verses are written
+            upgrade_schema()
+            ensure_search_index()
+            import_session = ImportSession()
             
-            for verse_info in verse_data:
-                try:
-                    # Process verse data through BibleImporter
-                    processed_verse = self.bible_importer._create_verse_data(
-                        verse_info['chapter'],
-                        verse_info['verse'],
-                        verse_info['hebrew'],
-                        verse_info.get('english', '')
-                    )
-                    
-                    # Get chapter
-                    chapter = Chapter.query.filter_by(
-                        book_id=book.id,
-                        chapter_number=processed_verse['chapter']
-                    ).first()
-                    
-                    if not chapter:
-                        logging.warning(f"Chapter {processed_verse['chapter']} not found for {book_name}")
-                        continue
-                    
-                    # Check if verse already exists
-                    existing_verse = Verse.query.filter_by(
-                        chapter_id=chapter.id,
-                        verse_number=processed_verse['verse']
-                    ).first()
-                    
-                    if existing_verse:
-                        logging.debug(f"Verse {book_name} {processed_verse['chapter']}:{processed_verse['verse']} already exists")
-                        continue
-                    
-                    # Create new verse
-                    verse = Verse(
-                        chapter_id=chapter.id,
-                        verse_number=processed_verse['verse'],
-                        hebrew_text=processed_verse['hebrew_text'],
-                        hebrew_consonantal=processed_verse['hebrew_consonantal'],
-                        paleo_text=processed_verse['paleo_text'],
-                        paleo_transliteration=processed_verse['paleo_transliteration'],
-                        modern_transliteration=processed_verse['modern_transliteration'],
-                        english_translation=processed_verse['english_translation'],
-                        literal_translation=processed_verse['literal_translation'],
-                        strong_numbers=processed_verse.get('strong_numbers', ''),
-                        morphology=processed_verse.get('morphology', ''),
-                        notes=processed_verse.get('notes', '')
-                    )
-                    
-                    batch_verses.append(verse)
-                    
-                    # Commit in batches
-                    if len(batch_verses) >= batch_size:
-                        db.session.add_all(batch_verses)
-                        db.session.commit()
-                        imported_count += len(batch_verses)
-                        batch_verses = []
-                        logging.debug(f"Imported {imported_count} verses so far...")
+            while finished_fetchers < fetch_workers:
+                item = fetched_books.get()
+                if item is None:
+                    finished_fetchers += 1
+                    continue
                 
+                book_info, futures = item
+                book_name = book_info['name']
+                try:
+                    imported_count = self._write_book(import_session, book_name, futures,
+                                                      transform_stats, write_stats)
                 except Exception as e:
-                    logging.error(f"Error processing verse {verse_info}: {e}")
+                    db.session.rollback()
+                    import_session.load()  # Forget the keys claimed by the rolled back transaction
+                    logging.error(f"Error importing {book_name}: {e}")
+                    self.progress.add_error({
+                        'type': 'import_error',
+                        'message': str(e),
+                        'book': book_name
+                    })
                     continue
+                
+                if imported_count > 0:
+                    success_count += 1
+                    self.progress.complete_book(book_name, imported_count)
+                    logging.info(f"Successfully imported {book_name} with {imported_count} verses")
+                else:
+                    logging.warning(f"No verses imported for {book_name}")
+        
+        return success_count
+    
+    def _write_book(self, import_session: ImportSession, book_name: str, futures: List,
+                    transform_stats: StageStats, write_stats: StageStats) -> int:
+        """Insert one book's transformed verses in a single transaction, then build its derived data"""
+        book = Book.query.filter_by(name=book_name).first()
+        if not book:
+            logging.error(f"Book {book_name} not found in database")
+            return 0
+        
+        imported_count = 0
+        write_seconds = 0.0
+        for future in futures:
+            rows, transform_seconds = future.result()
+            transform_stats.add(len(rows), transform_seconds)
             
-            # Commit remaining verses
-            if batch_verses:
-                db.session.add_all(batch_verses)
-                db.session.commit()
-                imported_count += len(batch_verses)
-            
-            return imported_count
+            write_started = time.perf_counter()
+            rows, missing = import_session.chapter_rows(book.id, rows)
+            for chapter in sorted(missing):
+                logging.warning(f"Chapter {chapter} not found for {book_name}")
+            imported_count += import_session.insert_verses(rows)
+            write_seconds += time.perf_counter() - write_started
+        transform_stats.add(0, 0.0, books=1)
+        
+        write_started = time.perf_counter()
+        db.session.commit()
+        if imported_count:
+            self._run_post_import_stages(book)
+        write_stats.add(imported_count, write_seconds + time.perf_counter() - write_started, books=1)
+        
+        return imported_count
+    
+    def _run_post_import_stages(self, book: Book):
+        """Build derived data once a book's verses are committed"""
+        counts = index_book(book.id)
+        logging.info(f"Indexed {counts['words']} words, {counts['roots']} verse roots and "
+                     f"{counts['gematria']} gematria values for {book.name}")
+        
+        # Verses and word rows are written with Core inserts, which don't bump the generation on their own
+        bump_generation()
+    
+    def _optimize_search_index(self):
+        """Merge search index segments once all books are written"""
+        from app import app
+        
+        with app.app_context():
+            optimize_search_index()
     
     def stop_import(self):
         """Stop the import process"""
@@ -530,7 +560,9 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Hebrew Bible Bulk Importer')
     parser.add_argument('--resume', action='store_true', help='Resume previous import')
     parser.add_argument('--reset', action='store_true', help='Reset progress and start fresh')
-    parser.add_argument('--workers', type=int, default=1, help='Number of concurrent workers')
+    parser.add_argument('--workers', type=int, default=1, help='Number of fetcher threads')
+    parser.add_argument('--transform-workers', type=int, default=None,
+                        help='Number of transform processes (default: one per CPU)')
     
     args = parser.parse_args()
     
@@ -539,5 +571,6 @@ if __name__ == "__main__":
     if args.reset:
         importer.reset_progress()
     
-    success = importer.import_complete_bible(resume=args.resume, max_workers=args.workers)
+    success = importer.import_complete_bible(resume=args.resume, max_workers=args.workers,
+                                             transform_workers=args.transform_workers)
     print(f"Import completed with success: {success}")
\ No newline at end of file
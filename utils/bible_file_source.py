@@ -0,0 +1,449 @@
+"""
+Offline Bible data source
+Streams verses from standard files in a local directory, so a full build needs no network:
+OSIS XML (e.g. the OpenScriptures WLC), the tanach.us WLC XML and USFM. XML is read with
+iterparse and emitted elements are detached from the tree, so memory stays flat however large
+the file; verses are yielded lazily in file order, and a whole-Bible file is parsed once for
+all the books fetched from it.
+"""
+
+import itertools
+import logging
+import os
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from data.bible_books import HEBREW_BIBLE_BOOKS, OSIS_BOOK_CODES, USFM_BOOK_CODES
+
+XML_EXTENSIONS = ('.xml', '.osis')
+USFM_EXTENSIONS = ('.usfm', '.sfm', '.ptx')
+
+# Elements whose text is not part of the verse: notes (including variant readings), tanach.us
+# note markers and ketiv forms (the qere is read)
+SKIPPED_ELEMENTS = {'note', 'x', 'k'}
+
+# Word and block elements: their text ends a word even with no whitespace before the next one
+BREAK_ELEMENTS = {'w', 'q', 'p', 'l', 'lg'}
+
+# OSIS verse ids look like "Gen.1.1", optionally prefixed by the work ("WLC:Gen.1.1")
+OSIS_ID = re.compile(r'(?:[^\s:]+:)?([1-4]?[A-Za-z]+)\.(\d+)\.(\d+)')
+
+# Books read ahead of the requested one and kept for the fetchers that ask for them next
+MAX_BUFFERED_BOOKS = 4
+
+# Book codes found by scanning raw file bytes for the file index
+OSIS_ID_BYTES = re.compile(rb'osisID="(?:[^"\s:]+:)?([1-4]?[A-Za-z]+)\.\d')
+WLC_NAME_BYTES = re.compile(rb'<name>([^<]+)</name>')
+USFM_ID_BYTES = re.compile(rb'\\id\s+([1-4A-Za-z]{3})')
+
+SCAN_CHUNK_SIZE = 1 << 20
+
+# USFM: footnotes and cross references are dropped with their content, word attributes
+# (\w word|lemma="..."\w*) keep the word, every other marker is removed
+USFM_NOTES = re.compile(r'\\(f|fe|x)\s.*?\\\1\*', re.DOTALL)
+USFM_ATTRIBUTES = re.compile(r'\|[^\\]*(?=\\\w+\*)')
+USFM_MARKER = re.compile(r'\\\+?\w+\*?')
+USFM_SEGMENT = re.compile(r'(?=\\(?:id|c|v)\s)')
+
+MAQAF = '־'
+SOF_PASUQ = '׃'
+WHITESPACE = re.compile(r'\s+')
+JOINED_SPACES = re.compile(rf'\s*({MAQAF})\s*|\s+({SOF_PASUQ})')
+
+# Other spellings of book names used by the file formats
+BOOK_ALIASES = {
+    'psalm': 'Psalms',
+    'song of solomon': 'Song of Songs',
+    'canticles': 'Song of Songs',
+    'qohelet': 'Ecclesiastes',
+}
+
+_BOOK_NAMES = {book['name'].lower(): book['name'] for book in HEBREW_BIBLE_BOOKS}
+_OSIS_CODES = {code.lower(): name for code, name in OSIS_BOOK_CODES.items()}
+_USFM_CODES = {code.lower(): name for code, name in USFM_BOOK_CODES.items()}
+
+
+def book_name_for(code: str) -> Optional[str]:
+    """
+    Book name (as in HEBREW_BIBLE_BOOKS) for an OSIS or USFM code or a spelled-out book name;
+    numbered books are recognized as "1 Samuel", "I Samuel" or "Samuel_1"
+    """
+    key = code.strip().replace('_', ' ').lower()
+    name = _OSIS_CODES.get(key) or _USFM_CODES.get(key) or _BOOK_NAMES.get(key) or BOOK_ALIASES.get(key)
+    if name:
+        return name
+
+    numbered = re.fullmatch(r'(i{1,3}|[1-3])\s*(.+)|(.+?)\s*(i{1,3}|[1-3])', key)
+    if numbered:
+        number = numbered.group(1) or numbered.group(4)
+        base = numbered.group(2) or numbered.group(3)
+        roman = 'I' * int(number) if number.isdigit() else number.upper()
+        return _BOOK_NAMES.get(f'{base} {roman}'.lower())
+    return None
+
+
+def clean_verse_text(parts: List[str]) -> str:
+    """Join text pieces: OSIS morpheme dividers removed, whitespace collapsed, maqaf joins words"""
+    text = WHITESPACE.sub(' ', ''.join(parts).replace('/', '')).strip()
+    return JOINED_SPACES.sub(lambda match: match.group(1) or match.group(2), text)
+
+
+def _local_name(tag: str) -> str:
+    """Tag without its XML namespace"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _element_text(element) -> List[str]:
+    """Text of an element and its children in document order, without skipped elements"""
+    parts = []
+    if element.text:
+        parts.append(element.text)
+    for child in element:
+        tag = _local_name(child.tag)
+        if tag not in SKIPPED_ELEMENTS:
+            parts.extend(_element_text(child))
+            if tag in BREAK_ELEMENTS:
+                parts.append(' ')
+        if child.tail:
+            parts.append(child.tail)
+    return parts
+
+
+def _milestone_tokens(element) -> Iterator[Tuple[str, str]]:
+    """('start'|'end', osisID) at verse milestones and ('text', text) between them, in document order"""
+    tag = _local_name(element.tag)
+    if tag == 'verse' and element.get('sID'):
+        yield 'start', element.get('osisID') or element.get('sID')
+    elif tag == 'verse' and element.get('eID'):
+        yield 'end', element.get('eID')
+    elif tag not in SKIPPED_ELEMENTS:
+        if element.text:
+            yield 'text', element.text
+        for child in element:
+            yield from _milestone_tokens(child)
+            if _local_name(child.tag) in BREAK_ELEMENTS:
+                yield 'text', ' '
+            if child.tail:
+                yield 'text', child.tail
+
+
+def _osis_book(osis_id: str) -> Optional[str]:
+    """Book name of an OSIS id ("Gen", "Gen.1", "WLC:Gen.1.1")"""
+    return book_name_for(osis_id.split()[0].split(':')[-1].split('.')[0])
+
+
+def _osis_verse(osis_id: str, parts: List[str]) -> Optional[Dict]:
+    match = OSIS_ID.match(osis_id.split()[0])
+    book = book_name_for(match.group(1)) if match else None
+    if not book:
+        return None
+    return {
+        'book': book,
+        'chapter': int(match.group(2)),
+        'verse': int(match.group(3)),
+        'hebrew': clean_verse_text(parts),
+        'english': ''
+    }
+
+
+def iter_xml_verses(path: str, books: Optional[Set[str]] = None) -> Iterator[Dict]:
+    """
+    Stream {'book', 'chapter', 'verse', 'hebrew', 'english'} dicts from an OSIS or tanach.us file
+
+    OSIS container verses (<verse osisID="Gen.1.1">...</verse>) are emitted as each one ends.
+    Milestone verses (<verse sID=.../> ... <verse eID=.../>) are emitted when their enclosing
+    chapter or book element ends. Emitted elements are detached from the tree, so at most one
+    chapter (one book for milestone files without chapter containers) is held in memory.
+
+    Args:
+        books: Only these books are emitted; the text of other books' verses is not extracted
+    """
+    context = ET.iterparse(path, events=('start', 'end'))
+    open_elements = []
+    milestones = False
+    wlc_book = None
+    wlc_chapter = None
+
+    def wanted(book):
+        return book is not None and (books is None or book in books)
+
+    for event, element in context:
+        tag = _local_name(element.tag)
+
+        if event == 'start':
+            open_elements.append(element)
+            if tag == 'verse' and element.get('sID'):
+                milestones = True
+            elif tag == 'c':
+                wlc_chapter = int(element.get('n'))
+            continue
+
+        open_elements.pop()
+        done = False
+
+        if tag == 'verse' and element.get('osisID') and not (element.get('sID') or element.get('eID')):
+            if wanted(_osis_book(element.get('osisID'))):
+                verse = _osis_verse(element.get('osisID'), _element_text(element))
+                if verse:
+                    yield verse
+            done = True
+
+        elif milestones and tag in ('chapter', 'div') and element.get('osisID') and len(element):
+            if wanted(_osis_book(element.get('osisID'))):
+                current, parts = None, []
+                for kind, value in _milestone_tokens(element):
+                    if kind == 'start':
+                        current, parts = value, []
+                    elif kind == 'text' and current:
+                        parts.append(value)
+                    elif kind == 'end' and current:
+                        verse = _osis_verse(current, parts)
+                        if verse:
+                            yield verse
+                        current = None
+            done = True
+
+        elif not milestones and tag in ('chapter', 'div'):
+            done = True  # Its container verses have been emitted already
+
+        # tanach.us: <book><names><name>Genesis</name>...</names><c n="1"><v n="1"><w>...</w></v>
+        elif tag == 'name' and wlc_book is None and element.text:
+            wlc_book = book_name_for(element.text)
+        elif tag == 'v' and wlc_book and wlc_chapter is not None:
+            if wanted(wlc_book):
+                yield {
+                    'book': wlc_book,
+                    'chapter': wlc_chapter,
+                    'verse': int(element.get('n')),
+                    'hebrew': clean_verse_text(_element_text(element)),
+                    'english': ''
+                }
+            done = True
+        elif tag == 'c':
+            done = True
+        elif tag == 'book' and wlc_book:
+            wlc_book = None
+            done = True
+
+        if done:
+            element.clear()
+            if open_elements:
+                open_elements[-1].remove(element)
+
+
+def iter_usfm_verses(path: str, books: Optional[Set[str]] = None) -> Iterator[Dict]:
+    """Stream verse dicts from a USFM file, line by line (only `books` when given)"""
+    book = None
+    chapter = None
+    verse = None
+    parts = []
+
+    def wanted():
+        return book is not None and (books is None or book in books)
+
+    def emit():
+        text = USFM_MARKER.sub(' ', USFM_ATTRIBUTES.sub('', USFM_NOTES.sub('', ' '.join(parts))))
+        return {'book': book, 'chapter': chapter, 'verse': verse,
+                'hebrew': clean_verse_text([text]), 'english': ''}
+
+    with open(path, encoding='utf-8-sig') as usfm_file:
+        # A line can hold several verses ("\\v 1 ... \\v 2 ..."), so split it at each marker
+        segments = (segment.strip() for line in usfm_file for segment in USFM_SEGMENT.split(line.strip()))
+        for segment in filter(None, segments):
+            marker, _, rest = segment.partition(' ')
+            if marker in ('\\c', '\\v', '\\id') and verse is not None:
+                if wanted():
+                    yield emit()
+                verse, parts = None, []
+
+            if marker == '\\id':
+                book = book_name_for(rest[:3])
+            elif marker == '\\c':
+                chapter = int(rest.split()[0])
+            elif marker == '\\v' and chapter is not None:
+                number, _, text = rest.partition(' ')
+                verse = int(re.match(r'\d+', number).group())
+                parts = [text]
+            elif verse is not None:
+                parts.append(segment)
+
+    if verse is not None and wanted():
+        yield emit()
+
+
+def iter_file_verses(path: str, books: Optional[Set[str]] = None) -> Iterator[Dict]:
+    if path.lower().endswith(USFM_EXTENSIONS):
+        return iter_usfm_verses(path, books)
+    return iter_xml_verses(path, books)
+
+
+def scan_book_names(path: str) -> Set[str]:
+    """Books a file contains, found by scanning its raw bytes (no XML parsing)"""
+    if path.lower().endswith(USFM_EXTENSIONS):
+        patterns = [USFM_ID_BYTES]
+    else:
+        patterns = [OSIS_ID_BYTES, WLC_NAME_BYTES]
+
+    codes = {pattern: set() for pattern in patterns}
+    tail = b''
+    with open(path, 'rb') as data_file:
+        while True:
+            chunk = data_file.read(SCAN_CHUNK_SIZE)
+            if not chunk:
+                break
+            window = tail + chunk
+            for pattern in patterns:
+                codes[pattern].update(match.group(1) for match in pattern.finditer(window))
+            tail = window[-256:]
+
+    # OSIS also has <name> elements (people, places) in the text, so tanach.us names only count
+    # when the file has no OSIS ids
+    found = next((found for found in codes.values() if found), set())
+    names = {book_name_for(code.decode('utf-8', 'ignore')) for code in found}
+    names.discard(None)
+    return names
+
+
+def _verse_fields(verse: Dict) -> Dict:
+    return {key: verse[key] for key in ('chapter', 'verse', 'hebrew', 'english')}
+
+
+class FilePass:
+    """
+    One streaming pass over a file, shared by the fetches of the books in it
+
+    The importer asks for books in canonical order, which is file order, so each fetch continues
+    the pass where the previous one stopped instead of parsing the file again from the top. Books
+    passed over on the way are kept (the last MAX_BUFFERED_BOOKS) for the other fetcher threads;
+    asking for a book the pass has already left behind restarts it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._books = None  # (book, verses) groups of the current pass
+        self._passed = set()  # Books the current pass has gone past
+        self._buffered = OrderedDict()  # Book -> verses, oldest first
+
+    def read_book(self, book_name: str) -> List[Dict]:
+        with self._lock:
+            if book_name in self._buffered:
+                return self._buffered.pop(book_name)
+
+            if self._books is None or book_name in self._passed:
+                self._books = itertools.groupby(iter_file_verses(self.path), key=lambda verse: verse['book'])
+                self._passed = set()
+                self._buffered.clear()
+
+            for name, verses in self._books:
+                rows = [_verse_fields(verse) for verse in verses]
+                self._passed.add(name)
+                if name == book_name:
+                    return rows
+                self._buffered[name] = rows
+                if len(self._buffered) > MAX_BUFFERED_BOOKS:
+                    self._buffered.popitem(last=False)
+
+            self._books = None
+            return []
+
+
+class BibleFileSource:
+    """Data source for BulkHebrewBibleImporter that reads Bible files from a directory"""
+
+    def __init__(self, directory: str):
+        self.name = f"Local files ({directory})"
+        self.directory = directory
+        self._index = None  # Book name -> files containing it
+        self._passes = {}  # Path -> FilePass
+        self._index_lock = threading.Lock()
+
+    def _files(self) -> List[str]:
+        paths = []
+        for root, _, files in os.walk(self.directory):
+            for file_name in files:
+                if file_name.lower().endswith(XML_EXTENSIONS + USFM_EXTENSIONS):
+                    paths.append(os.path.join(root, file_name))
+        return sorted(paths)
+
+    def _book_index(self) -> Dict[str, List[str]]:
+        """Built once, on first use (fetcher threads share the source)"""
+        with self._index_lock:
+            if self._index is None:
+                started = time.perf_counter()
+                index = {}
+                for path in self._files():
+                    for book in scan_book_names(path):
+                        index.setdefault(book, []).append(path)
+                self._index = index
+                self._passes = {path: FilePass(path) for paths in index.values() for path in paths}
+                logging.info(f"Indexed {len(index)} books in {self.directory} in {time.perf_counter() - started:.2f}s")
+            return self._index
+
+    def get_available_books(self) -> List[str]:
+        """Books found in the files, in canonical order"""
+        index = self._book_index()
+        return [book['name'] for book in HEBREW_BIBLE_BOOKS if book['name'] in index]
+
+    def iter_verses(self, book_name: str) -> Iterator[Dict]:
+        """
+        Lazily yield a book's {'chapter', 'verse', 'hebrew', 'english'} dicts in file order
+        (other books in the file are parsed but their text is not extracted)
+        """
+        for path in self._book_index().get(book_name, []):
+            seen_book = False
+            for verse in iter_file_verses(path, {book_name}):
+                seen_book = True
+                yield _verse_fields(verse)
+            if not seen_book:
+                logging.warning(f"{path} was indexed for {book_name} but has no verses of it")
+
+    def fetch_book_data(self, book_name: str, sefaria_name: str = None) -> List[Dict]:
+        """Fetch a book's verses from the local files ([] when no file has it)"""
+        started = time.perf_counter()
+        paths = self._book_index().get(book_name, [])
+        verses = [verse for path in paths for verse in self._passes[path].read_book(book_name)]
+        if verses:
+            logging.info(f"Read {len(verses)} verses for {book_name} from local files "
+                         f"in {time.perf_counter() - started:.2f}s")
+        return verses
+
+
+def create_file_source(directory: Optional[str] = None) -> Optional[BibleFileSource]:
+    """File source for BIBLE_DATA_DIR (or the given directory), or None when it isn't set or missing"""
+    directory = directory or os.environ.get('BIBLE_DATA_DIR')
+    if not directory:
+        return None
+    if not os.path.isdir(directory):
+        logging.warning(f"BIBLE_DATA_DIR {directory} is not a directory, skipping local files")
+        return None
+    return BibleFileSource(directory)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Read Bible verses from local OSIS, WLC or USFM files')
+    parser.add_argument('directory', nargs='?', help='Data directory (default: BIBLE_DATA_DIR)')
+    parser.add_argument('--book', help='Print the first verses of one book')
+
+    args = parser.parse_args()
+
+    source = create_file_source(args.directory)
+    if source is None:
+        print("Set BIBLE_DATA_DIR or pass a directory")
+    elif args.book:
+        for verse in itertools.islice(source.iter_verses(args.book), 5):
+            print(f"{args.book} {verse['chapter']}:{verse['verse']} {verse['hebrew']}")
+    else:
+        total = 0
+        started = time.perf_counter()
+        for book in source.get_available_books():
+            count = len(source.fetch_book_data(book))
+            total += count
+            print(f"{book}: {count} verses")
+        print(f"{total} verses read in {time.perf_counter() - started:.2f}s")
@@ -6,9 +6,15 @@ Handles import from various sources including WLC, JSON APIs, etc.
 import json
 import requests
 import re
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
+from flask import has_app_context
 from utils.hebrew_converter import hebrew_to_paleo, remove_nikud, get_pronunciation_guide
 from utils.ancient_hebrew_tts import create_tts_text, get_word_pronunciation
+from utils.nikud_transliteration import has_nikud, transliterate
+from utils.word_analysis import literal_gloss
+
+MAQAF = '־'
 
 class BiblicalHebrewTransliterator:
     """Enhanced transliteration for biblical Hebrew with ancient pronunciations"""
@@ -88,32 +94,29 @@ class BiblicalHebrewTransliterator:
         'כן': 'kayn',                    # So/thus
     }
     
+    # Distinct surface forms remembered per transliterator (the Hebrew Bible has about 40k)
+    CACHE_SIZE = 65536
+    
+    def __init__(self):
+        self._transliterate_token = lru_cache(maxsize=self.CACHE_SIZE)(self._resolve_word)
+    
     def create_paleo_transliteration(self, hebrew_text: str) -> str:
         """
         Create Paleo Hebrew transliteration (like 'barashyt bara')
         Uses ancient pronunciation patterns
         """
-        # Remove nikud first
-        consonantal = remove_nikud(hebrew_text)
-        
-        # Check for known patterns first
-        for pattern, pronunciation in self.VOWEL_PATTERNS.items():
-            if pattern in consonantal:
-                consonantal = consonantal.replace(pattern, pronunciation)
-        
-        # Word-by-word processing for remaining text
-        words = consonantal.split()
-        transliterated_words = []
+        # Tokenize once: maqaf joins separate words, nikud and other marks are dropped
+        words = remove_nikud(hebrew_text.replace(MAQAF, ' ')).split()
         
-        for word in words:
-            if word in self.VOWEL_PATTERNS:
-                transliterated_words.append(self.VOWEL_PATTERNS[word])
-            else:
-                # Letter-by-letter transliteration with vowel insertion
-                transliterated = self._transliterate_word(word)
-                transliterated_words.append(transliterated)
-        
-        return ' '.join(transliterated_words)
+        # Each word form is resolved once and then served from the memo
+        return ' '.join(self._transliterate_token(word) for word in words)
+    
+    def _resolve_word(self, word: str) -> str:
+        """Known whole-word pattern, else letter-by-letter transliteration with vowel insertion"""
+        pronunciation = self.VOWEL_PATTERNS.get(word)
+        if pronunciation is not None:
+            return pronunciation
+        return self._transliterate_word(word)
     
     def _transliterate_word(self, word: str) -> str:
         """Transliterate a single Hebrew word to ancient pronunciation"""
@@ -234,9 +237,13 @@ class BibleImporter:
         # Convert to Paleo Hebrew
         paleo_text = hebrew_to_paleo(hebrew_clean)
         
-        # Create transliterations
-        paleo_transliteration = self.transliterator.create_paleo_transliteration(hebrew_clean)
-        modern_transliteration = get_pronunciation_guide(hebrew_clean)
+        # Create transliterations (read from the vowel points when the source is pointed)
+        if has_nikud(hebrew_clean):
+            paleo_transliteration = transliterate(hebrew_clean, 'ancient')
+            modern_transliteration = transliterate(hebrew_clean, 'modern')
+        else:
+            paleo_transliteration = self.transliterator.create_paleo_transliteration(hebrew_clean)
+            modern_transliteration = get_pronunciation_guide(hebrew_clean)
         
         # Create literal translation (simplified)
         literal_translation = self._create_literal_translation(hebrew_consonantal)
@@ -290,11 +297,15 @@ class BibleImporter:
         words = hebrew_text.split()
         literal_words = []
         
+        # Other words are glossed from the lexicon (prefix meanings + stem meaning) when a database is available
+        use_lexicon = has_app_context()
+        
         for word in words:
             if word in common_words:
                 literal_words.append(common_words[word])
             else:
-                literal_words.append(f'[{word}]')  # Untranslated words in brackets
+                gloss = literal_gloss(word) if use_lexicon else None
+                literal_words.append(gloss or f'[{word}]')  # Untranslated words in brackets
         
         return ' '.join(literal_words)
     
@@ -0,0 +1,82 @@
+"""
+Derived data for imported books
+The stages every importer runs once a book's verses are committed: chapter and verse counters,
+the positional word index, the root index and gematria values. Keeping them in one place means
+verses written by any importer are searchable by word and root, not just by the bulk importer.
+"""
+
+import logging
+from typing import Dict, Iterable
+
+from models import Book
+from utils.corpus_stats import refresh_all_stats, refresh_book_counts, refresh_book_stats
+from utils.data_generation import bump_generation
+from utils.gematria import backfill_gematria, index_book_gematria
+from utils.root_index import backfill_verse_roots, index_book_roots
+from utils.word_index import backfill_verse_words, index_book_words
+
+
+def index_book(book_id: int) -> Dict[str, int]:
+    """
+    Build a book's derived rows (only verses not indexed yet are processed) and refresh its
+    statistics
+
+    Returns:
+        dict: Rows written per stage (words, roots, gematria)
+    """
+    refresh_book_counts(book_id)
+    counts = {
+        'words': index_book_words(book_id),
+        'roots': index_book_roots(book_id),
+        'gematria': index_book_gematria(book_id)
+    }
+    refresh_book_stats(book_id)
+    return counts
+
+
+def index_books(book_ids: Iterable[int]):
+    """Importer stage: index each book whose verses were just committed"""
+    for book_id in sorted(set(book_ids)):
+        counts = index_book(book_id)
+        logging.info(f"Indexed {counts['words']} words, {counts['roots']} verse roots and "
+                     f"{counts['gematria']} gematria values for book {book_id}")
+
+    # Word, root and gematria rows are written with Core statements, which don't bump the generation
+    bump_generation()
+
+
+def backfill_all():
+    """Index every verse that is missing derived rows (databases imported before these stages)"""
+    words = backfill_verse_words()
+    roots = backfill_verse_roots()
+    gematria = backfill_gematria()
+    refresh_all_stats()
+    bump_generation()
+    logging.info(f"Backfilled {words} word rows, {roots} root rows and {gematria} gematria values")
+    return words, roots, gematria
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Derived data for imported books')
+    parser.add_argument('--backfill', action='store_true', help='Index verses that have no word, root or gematria rows')
+    parser.add_argument('--book', help='Index one book by name')
+
+    args = parser.parse_args()
+
+    from app import app
+    from utils.schema import upgrade_schema
+
+    with app.app_context():
+        upgrade_schema()
+        if args.book:
+            book = Book.query.filter_by(name=args.book).first()
+            if book is None:
+                print(f"Unknown book: {args.book}")
+            else:
+                print(index_book(book.id))
+                bump_generation()
+        if args.backfill:
+            words, roots, gematria = backfill_all()
+            print(f"Wrote {words} word rows, {roots} root rows and {gematria} gematria values")
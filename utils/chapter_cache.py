@@ -0,0 +1,135 @@
+"""
+Chapter snapshot cache
+Serialized, precompressed chapter payloads versioned by the data generation, so reading a
+chapter that has not changed costs no ORM work
+"""
+
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from flask import current_app, request
+
+from models import Book, Chapter, Verse
+from utils.chapter_sequence import chapter_navigation
+from utils.data_generation import current_generation
+from utils.verse_fields import encode_compact, verse_load_options
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+MAX_SNAPSHOTS = 512
+
+
+class ChapterSnapshot:
+    """One chapter's JSON body in every encoding we serve"""
+
+    __slots__ = ('generation', 'etag', 'bodies')
+
+    def __init__(self, generation: int, etag: str, body: bytes):
+        self.generation = generation
+        self.etag = etag
+        self.bodies = {'identity': body, 'gzip': gzip.compress(body, compresslevel=9)}
+        if brotli is not None:
+            self.bodies['br'] = brotli.compress(body, quality=11)
+
+    def negotiate(self, accept_encodings) -> str:
+        """Best encoding the client accepts: br, then gzip, then identity"""
+        for encoding in ('br', 'gzip'):
+            if encoding in self.bodies and accept_encodings[encoding]:
+                return encoding
+        return 'identity'
+
+
+def build_chapter_payload(book_id: int, chapter_number: int, fields: Optional[Tuple[str, ...]] = None,
+                          compact: bool = False) -> Optional[Dict]:
+    """
+    The chapter response: chapter fields, its book, its verses and navigation (None if missing)
+
+    Args:
+        fields: Verse fields to load and return (None for all)
+        compact: Encode the verses as columns + rows
+    """
+    book = Book.query.get(book_id)
+    if book is None:
+        return None
+    chapter = Chapter.query.filter_by(book_id=book_id, chapter_number=chapter_number).first()
+    if chapter is None:
+        return None
+
+    chapter_data = chapter.to_dict()
+    chapter_data['book'] = book.to_dict()
+    verses = [
+        verse.to_dict(fields) for verse in
+        Verse.query.filter_by(chapter_id=chapter.id)
+        .options(*verse_load_options(fields))
+        .order_by(Verse.verse_number, Verse.id)
+    ]
+    chapter_data['verses'] = encode_compact(verses, list(fields or Verse.FIELDS)) if compact else verses
+    chapter_data['navigation'] = chapter_navigation(book_id, chapter_number)
+    return chapter_data
+
+
+class ChapterCache:
+    """Bounded LRU of ChapterSnapshot keyed by (book_id, chapter_number, fields, compact)"""
+
+    def __init__(self, max_size: int = MAX_SNAPSHOTS):
+        self.max_size = max_size
+        self._snapshots = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, book_id: int, chapter_number: int, fields: Optional[Tuple[str, ...]] = None,
+            compact: bool = False) -> Optional[ChapterSnapshot]:
+        """Snapshot for the current generation, built on a miss (None if the chapter doesn't exist)"""
+        key = (book_id, chapter_number, fields, compact)
+        generation = current_generation()
+
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and snapshot.generation == generation:
+                self._snapshots.move_to_end(key)
+                return snapshot
+
+        payload = build_chapter_payload(book_id, chapter_number, fields, compact)
+        if payload is None:
+            return None
+
+        body = current_app.json.dumps(payload).encode('utf-8')
+        etag = f'chapter-{book_id}-{chapter_number}-g{generation}'
+        if fields is not None or compact:
+            etag += f"-{zlib.crc32(repr((fields, compact)).encode()):08x}"
+        snapshot = ChapterSnapshot(generation, etag, body)
+
+        with self._lock:
+            self._snapshots[key] = snapshot
+            self._snapshots.move_to_end(key)
+            while len(self._snapshots) > self.max_size:
+                self._snapshots.popitem(last=False)
+
+        return snapshot
+
+    def clear(self):
+        with self._lock:
+            self._snapshots.clear()
+
+    def response(self, snapshot: ChapterSnapshot):
+        """304 if the client has this version, otherwise the best precompressed body"""
+        if request.if_none_match.contains_weak(snapshot.etag):
+            response = current_app.response_class(status=304)
+        else:
+            encoding = snapshot.negotiate(request.accept_encodings)
+            response = current_app.response_class(snapshot.bodies[encoding], mimetype='application/json')
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+
+        response.set_etag(snapshot.etag, weak=True)
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+
+chapter_cache = ChapterCache()
@@ -0,0 +1,68 @@
+"""
+Canonical chapter sequence
+Every chapter in canonical order (book order, then chapter number), held in memory so
+previous/next navigation is a dictionary lookup
+"""
+
+import threading
+from typing import Dict, Optional
+
+from models import db, Book, Chapter
+from utils.data_generation import current_generation
+
+
+class ChapterSequence:
+    """All chapters in reading order with an index from (book_id, chapter_number) to position"""
+
+    def __init__(self, entries, generation=None):
+        self.entries = entries  # [(book_id, book_name, chapter_number)]
+        self.positions = {(book_id, number): i for i, (book_id, _, number) in enumerate(entries)}
+        self.generation = generation
+
+    @classmethod
+    def build(cls, generation=None) -> 'ChapterSequence':
+        rows = (db.session.query(Book.id, Book.name, Chapter.chapter_number)
+                .join(Chapter, Chapter.book_id == Book.id)
+                .order_by(Book.order, Chapter.chapter_number)
+                .all())
+        return cls([tuple(row) for row in rows], generation)
+
+    @staticmethod
+    def _link(entry) -> Dict:
+        book_id, book_name, chapter_number = entry
+        return {'book_id': book_id, 'book_name': book_name, 'chapter_number': chapter_number}
+
+    def navigation(self, book_id: int, chapter_number: int) -> Optional[Dict]:
+        """Current/previous/next links for a chapter, or None if it doesn't exist"""
+        position = self.positions.get((book_id, chapter_number))
+        if position is None:
+            return None
+
+        return {
+            'current': self._link(self.entries[position]),
+            'previous': self._link(self.entries[position - 1]) if position > 0 else None,
+            'next': self._link(self.entries[position + 1]) if position + 1 < len(self.entries) else None
+        }
+
+
+_sequence_lock = threading.Lock()
+_sequence = None
+
+
+def get_chapter_sequence() -> ChapterSequence:
+    """Process-wide chapter sequence, rebuilt when the data generation changes"""
+    global _sequence
+
+    generation = current_generation()
+    sequence = _sequence
+    if sequence is not None and sequence.generation == generation:
+        return sequence
+
+    with _sequence_lock:
+        if _sequence is None or _sequence.generation != generation:
+            _sequence = ChapterSequence.build(generation)
+        return _sequence
+
+
+def chapter_navigation(book_id: int, chapter_number: int) -> Optional[Dict]:
+    return get_chapter_sequence().navigation(book_id, chapter_number)
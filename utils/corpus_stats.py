@@ -0,0 +1,206 @@
+"""
+Corpus counters and statistics
+Keeps Book.chapter_count and Chapter.verse_count in step with the chapter and verse tables so
+listings never load child rows just to count them, and materializes /api/stats into corpus_stat
+"""
+
+import logging
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import bindparam, event, text
+from sqlalchemy.orm import Session
+
+from models import db, Book, Chapter, CorpusStat, Verse, VerseWord
+
+_COUNT_VERSES = text(
+    'UPDATE chapter SET verse_count = (SELECT COUNT(*) FROM verse WHERE verse.chapter_id = chapter.id)'
+)
+_COUNT_CHAPTERS = text(
+    'UPDATE book SET chapter_count = (SELECT COUNT(*) FROM chapter WHERE chapter.book_id = book.id)'
+)
+
+
+def _where_ids(statement, column: str):
+    return text(f'{statement.text} WHERE {column} IN :ids').bindparams(bindparam('ids', expanding=True))
+
+
+_COUNT_VERSES_FOR = _where_ids(_COUNT_VERSES, 'chapter.id')
+_COUNT_CHAPTERS_FOR = _where_ids(_COUNT_CHAPTERS, 'book.id')
+_COUNT_VERSES_FOR_BOOK = text(f'{_COUNT_VERSES.text} WHERE chapter.book_id = :book_id')
+
+
+def refresh_counts(connection, chapter_ids: Iterable[int] = (), book_ids: Iterable[int] = ()):
+    """Recount verses for the given chapters and chapters for the given books"""
+    chapter_ids = sorted(set(chapter_ids))
+    book_ids = sorted(set(book_ids))
+    if chapter_ids:
+        connection.execute(_COUNT_VERSES_FOR, {'ids': chapter_ids})
+    if book_ids:
+        connection.execute(_COUNT_CHAPTERS_FOR, {'ids': book_ids})
+
+
+def refresh_book_counts(book_id: int):
+    """Importer stage: recount a book's chapters and the verses of each of its chapters"""
+    connection = db.session.connection()
+    connection.execute(_COUNT_VERSES_FOR_BOOK, {'book_id': book_id})
+    refresh_counts(connection, book_ids=[book_id])
+    db.session.commit()
+
+
+def reconcile_counts(connection=None):
+    """Recount every book and chapter (for databases written outside the ORM or before the counters)"""
+    own_transaction = connection is None
+    if own_transaction:
+        connection = db.session.connection()
+
+    connection.execute(_COUNT_VERSES)
+    connection.execute(_COUNT_CHAPTERS)
+
+    if own_transaction:
+        db.session.commit()
+    logging.info("Reconciled book chapter counts and chapter verse counts")
+
+
+def _book_stat_rows(book_id: Optional[int] = None):
+    """Per-book statistics computed from the counters and the word index"""
+    counts = (db.session.query(Book.id, Book.name, Book.hebrew_name, Book.testament, Book.order,
+                               Book.chapter_count, db.func.coalesce(db.func.sum(Chapter.verse_count), 0))
+              .outerjoin(Chapter, Chapter.book_id == Book.id)
+              .group_by(Book.id))
+    words = (db.session.query(Chapter.book_id, db.func.count(VerseWord.id),
+                              db.func.coalesce(db.func.sum(db.func.length(VerseWord.normalized)), 0))
+             .join(Verse, VerseWord.verse_id == Verse.id)
+             .join(Chapter, Verse.chapter_id == Chapter.id)
+             .group_by(Chapter.book_id))
+    if book_id is not None:
+        counts = counts.filter(Book.id == book_id)
+        words = words.filter(Chapter.book_id == book_id)
+
+    words_by_book = {row[0]: (row[1], row[2]) for row in words}
+
+    for book_id, name, hebrew_name, testament, order, chapter_count, verse_count in counts:
+        word_count, letter_count = words_by_book.get(book_id, (0, 0))
+        yield CorpusStat(
+            scope='book', key=name, sort_order=order, hebrew_name=hebrew_name, testament=testament,
+            books=1, books_with_verses=1 if verse_count else 0, chapters=chapter_count,
+            verses=verse_count, words=word_count, letters=letter_count
+        )
+
+
+def _refresh_aggregates():
+    """Rebuild the testament and total rows from the book rows"""
+    db.session.query(CorpusStat).filter(CorpusStat.scope != 'book').delete()
+
+    totals = {}
+    for book in CorpusStat.query.filter_by(scope='book').order_by(CorpusStat.sort_order):
+        for scope, key in (('testament', book.testament), ('total', 'all')):
+            aggregate = totals.get((scope, key))
+            if aggregate is None:
+                aggregate = totals[(scope, key)] = CorpusStat(
+                    scope=scope, key=key, sort_order=book.sort_order, books=0, books_with_verses=0,
+                    chapters=0, verses=0, words=0, letters=0
+                )
+            for field in ('books', 'books_with_verses', 'chapters', 'verses', 'words', 'letters'):
+                setattr(aggregate, field, getattr(aggregate, field) + getattr(book, field))
+
+    db.session.add_all(totals.values())
+
+
+def refresh_book_stats(book_id: int):
+    """Importer stage: refresh one book's statistics row and the totals built from it"""
+    if CorpusStat.query.filter_by(scope='book').count() < Book.query.count():
+        # Books created since the last full refresh have no row yet
+        refresh_all_stats()
+        return
+
+    for row in _book_stat_rows(book_id):
+        db.session.merge(row)
+    db.session.flush()
+    _refresh_aggregates()
+    db.session.commit()
+
+
+def refresh_all_stats():
+    """Recompute every statistics row"""
+    db.session.query(CorpusStat).delete()
+    db.session.add_all(list(_book_stat_rows()))
+    db.session.flush()
+    _refresh_aggregates()
+    db.session.commit()
+    logging.info("Refreshed corpus statistics")
+
+
+def get_corpus_totals() -> Optional[CorpusStat]:
+    """The whole-corpus statistics row (primary key lookup, computed on first use)"""
+    totals = db.session.get(CorpusStat, ('total', 'all'))
+    if totals is None:
+        refresh_all_stats()
+        totals = db.session.get(CorpusStat, ('total', 'all'))
+    return totals
+
+
+def get_corpus_stats() -> Dict:
+    """The /api/stats payload from one read of corpus_stat (computed on first use)"""
+    rows = CorpusStat.query.order_by(CorpusStat.scope, CorpusStat.sort_order).all()
+    if not rows:
+        refresh_all_stats()
+        rows = CorpusStat.query.order_by(CorpusStat.scope, CorpusStat.sort_order).all()
+
+    total = next((row for row in rows if row.scope == 'total'), None)
+    return {
+        'total_books': total.books if total else 0,
+        'books_with_verses': total.books_with_verses if total else 0,
+        'total_chapters': total.chapters if total else 0,
+        'total_verses': total.verses if total else 0,
+        'total_words': total.words if total else 0,
+        'total_letters': total.letters if total else 0,
+        'testament_stats': {
+            row.key: {'books': row.books, 'chapters': row.chapters, 'verses': row.verses,
+                      'words': row.words, 'letters': row.letters}
+            for row in rows if row.scope == 'testament'
+        },
+        'books': [
+            {'name': row.key, 'hebrew_name': row.hebrew_name, 'testament': row.testament,
+             'order': row.sort_order, 'chapters': row.chapters, 'verses': row.verses,
+             'words': row.words, 'letters': row.letters}
+            for row in rows if row.scope == 'book'
+        ]
+    }
+
+
+@event.listens_for(Session, 'after_flush')
+def _refresh_counts_on_flush(session, flush_context):
+    """Verses or chapters added or removed through the ORM update their parents' counters"""
+    chapter_ids = set()
+    book_ids = set()
+
+    for instance in session.new | session.deleted:
+        if isinstance(instance, Verse) and instance.chapter_id is not None:
+            chapter_ids.add(instance.chapter_id)
+        elif isinstance(instance, Chapter) and instance.book_id is not None:
+            book_ids.add(instance.book_id)
+            if instance in session.new:
+                chapter_ids.add(instance.id)
+
+    if chapter_ids or book_ids:
+        refresh_counts(session.connection(), chapter_ids, book_ids)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Corpus counters')
+    parser.add_argument('--reconcile', action='store_true', help='Recount chapters per book and verses per chapter')
+    parser.add_argument('--refresh-stats', action='store_true', help='Recompute the corpus statistics table')
+
+    args = parser.parse_args()
+
+    from app import app
+    from utils.schema import upgrade_schema
+
+    with app.app_context():
+        upgrade_schema()
+        if args.reconcile:
+            reconcile_counts()
+        if args.reconcile or args.refresh_stats:
+            refresh_all_stats()
@@ -0,0 +1,83 @@
+"""
+Data generation counter
+A single database row bumped whenever Bible or reference data changes, so in-process caches in
+every worker can tell cheaply whether they are stale
+"""
+
+import threading
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from models import (db, Book, Chapter, Verse, VerseWord, VerseRoot, PaleoLetter, Word,
+                    StrongsHebrew, StrongsGreek, PaleoDictionary)
+
+# ORM changes to these models bump the generation automatically
+WATCHED_MODELS = (Book, Chapter, Verse, VerseWord, VerseRoot, PaleoLetter, Word,
+                  StrongsHebrew, StrongsGreek, PaleoDictionary)
+
+# How long a worker trusts its last read of the counter before checking the database again
+CHECK_INTERVAL = 2.0
+
+_BUMP = text('UPDATE data_generation SET generation = generation + 1, updated_at = CURRENT_TIMESTAMP '
+             'WHERE id = 1')
+_CREATE = text('INSERT INTO data_generation (id, generation, updated_at) VALUES (1, 1, CURRENT_TIMESTAMP)')
+
+_lock = threading.Lock()
+_cached_generation = None
+_checked_at = 0.0
+
+
+def current_generation() -> int:
+    """Current data generation (re-read from the database at most every CHECK_INTERVAL seconds)"""
+    global _cached_generation, _checked_at
+
+    now = time.monotonic()
+    if _cached_generation is not None and now - _checked_at < CHECK_INTERVAL:
+        return _cached_generation
+
+    with _lock:
+        generation = db.session.execute(text('SELECT generation FROM data_generation WHERE id = 1')).scalar()
+        _cached_generation = generation or 0
+        _checked_at = now
+        return _cached_generation
+
+
+def _expire_cache():
+    global _cached_generation
+    _cached_generation = None
+
+
+def _bump(connection):
+    if connection.execute(_BUMP).rowcount == 0:
+        connection.execute(_CREATE)
+
+
+def bump_generation():
+    """
+    Mark all cached data as stale. Call after writes that bypass the ORM unit of work
+    (Core inserts, raw SQL); ORM changes to WATCHED_MODELS bump it on their own.
+    """
+    _bump(db.session.connection())
+    db.session.commit()
+    _expire_cache()
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_on_data_change(session, flush_context):
+    changed = session.new | session.dirty | session.deleted
+    if any(isinstance(instance, WATCHED_MODELS) for instance in changed):
+        _bump(session.connection())
+        session.info['generation_bumped'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _expire_after_commit(session):
+    if session.info.pop('generation_bumped', False):
+        _expire_cache()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_bump(session):
+    session.info.pop('generation_bumped', None)
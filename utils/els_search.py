@@ -0,0 +1,374 @@
+"""
+Equidistant letter sequence (ELS) search
+Packs the consonantal text of selected books into one uint8 NumPy array and tests every skip
+in a range with vectorized strided comparisons
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from models import db, Book, Chapter, Verse, ElsJob
+from utils.data_generation import current_generation
+from utils.hebrew_converter import normalize_hebrew
+from utils.word_index import EDITORIAL_MARKUP
+
+# The 22 letters (finals folded by normalize_hebrew) numbered 0-21
+LETTERS = 'אבגדהוזחטיכלמנסעפצקרשת'
+LETTER_INDEX = {letter: i for i, letter in enumerate(LETTERS)}
+
+HEBREW_BASE = 0x05D0
+NOT_A_LETTER = 255
+_CODEPOINT_LOOKUP = np.full(0x05EB - HEBREW_BASE, NOT_A_LETTER, dtype=np.uint8)
+for _letter, _index in LETTER_INDEX.items():
+    _CODEPOINT_LOOKUP[ord(_letter) - HEBREW_BASE] = _index
+
+DEFAULT_BOOKS = ['Genesis', 'Exodus', 'Leviticus', 'Numbers', 'Deuteronomy']
+
+MIN_TERM_LENGTH = 3
+MAX_TERM_LENGTH = 20
+MAX_SKIP = 50000
+MAX_HITS = 5000
+
+# Skip ranges larger than this are split across a process pool
+PARALLEL_SKIP_THRESHOLD = 5000
+SKIPS_PER_CHUNK = 2500
+
+# Background jobs: searches running at once, and jobs accepted (queued or running) at once
+JOB_WORKERS = 2
+MAX_PENDING_JOBS = 8
+
+
+def encode_letters(hebrew_text: str) -> np.ndarray:
+    """Letter indices (0-21) of a Hebrew string; nikud, spaces and punctuation are dropped"""
+    codepoints = np.frombuffer(normalize_hebrew(hebrew_text).encode('utf-32-le'), dtype='<u4')
+    offsets = codepoints.astype(np.int64) - HEBREW_BASE
+    in_block = (offsets >= 0) & (offsets < len(_CODEPOINT_LOOKUP))
+    letters = _CODEPOINT_LOOKUP[offsets[in_block]]
+    return letters[letters != NOT_A_LETTER]
+
+
+class LetterText:
+    """
+    Books concatenated into one array of letter indices.
+
+    verse_starts[i] is the offset of the first letter of verse_ids[i], so any letter offset maps
+    back to its verse with a binary search.
+    """
+
+    def __init__(self, books: List[str], letters: np.ndarray, verse_starts: np.ndarray,
+                 verse_ids: np.ndarray, signature=None):
+        self.books = books
+        self.letters = letters
+        self.verse_starts = verse_starts
+        self.verse_ids = verse_ids
+        self.signature = signature
+
+    @classmethod
+    def build(cls, books: List[str], signature=None) -> 'LetterText':
+        """Load the verses of the books in canonical order and encode them in one pass"""
+        rows = (db.session.query(Verse.id, Verse.hebrew_normalized)
+                .join(Chapter, Verse.chapter_id == Chapter.id)
+                .join(Book, Chapter.book_id == Book.id)
+                .filter(Book.name.in_(books))
+                .order_by(Book.order, Chapter.chapter_number, Verse.verse_number)
+                .all())
+
+        texts = [EDITORIAL_MARKUP.sub('', text or '') for _, text in rows]
+        codepoints = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype='<u4')
+        offsets = codepoints.astype(np.int64) - HEBREW_BASE
+        in_block = (offsets >= 0) & (offsets < len(_CODEPOINT_LOOKUP))
+        encoded = np.where(in_block, _CODEPOINT_LOOKUP[np.where(in_block, offsets, 0)], NOT_A_LETTER)
+        is_letter = encoded != NOT_A_LETTER
+
+        # Letters before each verse = prefix count of letters up to the verse's first character
+        char_starts = np.concatenate(([0], np.cumsum([len(text) for text in texts])[:-1])).astype(np.int64)
+        letters_before = np.concatenate(([0], np.cumsum(is_letter)))
+
+        return cls(
+            books=books,
+            letters=encoded[is_letter].astype(np.uint8),
+            verse_starts=letters_before[char_starts] if texts else np.zeros(0, dtype=np.int64),
+            verse_ids=np.array([verse_id for verse_id, _ in rows], dtype=np.int64),
+            signature=signature
+        )
+
+    def verse_ids_at(self, offsets: np.ndarray) -> np.ndarray:
+        """Verse id owning each letter offset"""
+        return self.verse_ids[np.searchsorted(self.verse_starts, offsets, side='right') - 1]
+
+
+def search_skips(letters: np.ndarray, term: np.ndarray, skips: Sequence[int], max_hits: int = MAX_HITS):
+    """
+    Find the term at every skip in skips
+
+    For each skip the rarest letter of the term picks the candidate start offsets; the remaining
+    letters are checked with one gather-and-compare per letter over the shrinking candidate set.
+
+    Returns:
+        list: (skip, start_offset) tuples in skip order
+    """
+    size = len(letters)
+    length = len(term)
+    counts = np.bincount(letters, minlength=len(LETTERS))
+    anchor = int(np.argmin(counts[term]))
+    anchor_positions = np.flatnonzero(letters == term[anchor]).astype(np.int64)
+
+    # Check the remaining letters rarest first so the candidate set shrinks fastest
+    others = sorted((k for k in range(length) if k != anchor), key=lambda k: counts[term[k]])
+
+    hits = []
+    for skip in skips:
+        span = (length - 1) * skip
+        starts = anchor_positions - anchor * skip
+        starts = starts[(starts >= 0) & (starts + span < size)]
+
+        for k in others:
+            if not len(starts):
+                break
+            starts = starts[letters[starts + k * skip] == term[k]]
+
+        hits.extend((skip, int(start)) for start in starts)
+        if len(hits) >= max_hits:
+            return hits[:max_hits]
+
+    return hits
+
+
+def _search_chunk(args):
+    letters, term, skips, max_hits = args
+    return search_skips(letters, term, skips, max_hits)
+
+
+def find_sequences(text: LetterText, term: str, min_skip: int = 1, max_skip: int = 1000,
+                   max_hits: int = MAX_HITS, workers: Optional[int] = None) -> List[Dict]:
+    """
+    Search a LetterText for a term at every skip in [min_skip, max_skip], forwards and backwards
+
+    Args:
+        workers: Process pool size for large skip ranges (defaults to the CPU count; 1 disables)
+
+    Returns:
+        list: Hits with skip, direction and the letter offsets they start and end at
+    """
+    encoded = encode_letters(term)
+    if not MIN_TERM_LENGTH <= len(encoded) <= MAX_TERM_LENGTH:
+        raise ValueError(f'Term must have {MIN_TERM_LENGTH}-{MAX_TERM_LENGTH} Hebrew letters')
+    if not 1 <= min_skip <= max_skip <= MAX_SKIP:
+        raise ValueError(f'Skips must satisfy 1 <= min_skip <= max_skip <= {MAX_SKIP}')
+
+    skips = range(min_skip, max_skip + 1)
+    # A palindrome would report every hit twice
+    terms = [('forward', encoded)]
+    if not np.array_equal(encoded, encoded[::-1]):
+        terms.append(('reverse', encoded[::-1]))
+
+    workers = workers or os.cpu_count() or 1
+    hits = []
+    for direction, letters_term in terms:
+        if workers > 1 and len(skips) > PARALLEL_SKIP_THRESHOLD:
+            chunks = [skips[i:i + SKIPS_PER_CHUNK] for i in range(0, len(skips), SKIPS_PER_CHUNK)]
+            # Spawned, not forked: the caller may have threads and open database connections
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+                found = [
+                    hit for chunk_hits in pool.map(
+                        _search_chunk, [(text.letters, letters_term, chunk, max_hits) for chunk in chunks])
+                    for hit in chunk_hits
+                ]
+        else:
+            found = search_skips(text.letters, letters_term, skips, max_hits)
+
+        length = len(letters_term)
+        for skip, start in found:
+            end = start + (length - 1) * skip
+            # Report reverse hits from the term's first letter, which is the later offset
+            first, last = (start, end) if direction == 'forward' else (end, start)
+            hits.append({'skip': skip, 'direction': direction, 'start': first, 'end': last})
+
+    hits.sort(key=lambda hit: (hit['skip'], min(hit['start'], hit['end'])))
+    return hits[:max_hits]
+
+
+def attach_references(text: LetterText, hits: List[Dict]) -> List[Dict]:
+    """Add start/end verse references to hits with one query for all involved verses"""
+    if not hits:
+        return hits
+
+    starts = text.verse_ids_at(np.array([hit['start'] for hit in hits]))
+    ends = text.verse_ids_at(np.array([hit['end'] for hit in hits]))
+    verse_ids = set(starts.tolist()) | set(ends.tolist())
+
+    references = {
+        verse_id: {'verse_id': verse_id, 'book': book_name, 'chapter': chapter_number, 'verse': verse_number}
+        for verse_id, verse_number, chapter_number, book_name in
+        db.session.query(Verse.id, Verse.verse_number, Chapter.chapter_number, Book.name)
+        .join(Chapter, Verse.chapter_id == Chapter.id)
+        .join(Book, Chapter.book_id == Book.id)
+        .filter(Verse.id.in_(verse_ids))
+    }
+
+    for hit, start_verse, end_verse in zip(hits, starts.tolist(), ends.tolist()):
+        hit['start_reference'] = references[start_verse]
+        hit['end_reference'] = references[end_verse]
+    return hits
+
+
+_text_lock = threading.Lock()
+_texts = {}  # tuple of book names -> LetterText
+MAX_CACHED_TEXTS = 8
+
+
+def get_letter_text(books: List[str]) -> LetterText:
+    """Cached LetterText for a set of books, rebuilt when the data generation changes"""
+    key = tuple(books)
+    signature = current_generation()
+
+    with _text_lock:
+        text = _texts.get(key)
+        if text is None or text.signature != signature:
+            text = LetterText.build(list(key), signature)
+            if len(_texts) >= MAX_CACHED_TEXTS:
+                _texts.pop(next(iter(_texts)))
+            _texts[key] = text
+        return text
+
+
+def resolve_books(book_names: Optional[List[str]]) -> List[str]:
+    """Validate book names and put them in canonical order (defaults to the Torah)"""
+    names = book_names or DEFAULT_BOOKS
+    books = Book.query.filter(Book.name.in_(names)).order_by(Book.order).all()
+    unknown = set(names) - {book.name for book in books}
+    if unknown:
+        raise ValueError(f"Unknown books: {', '.join(sorted(unknown))}")
+    return [book.name for book in books]
+
+
+class JobQueueFull(Exception):
+    """Raised when MAX_PENDING_JOBS jobs are already queued or running"""
+
+
+class ElsJobRunner:
+    """
+    Run ELS searches on a small thread pool; job state lives in the els_job table
+
+    Jobs search in their worker thread (no process pool), so at most JOB_WORKERS CPUs are busy
+    with searches however many requests arrive.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, max_pending: int = MAX_PENDING_JOBS):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='els-job')
+        self._max_pending = max_pending
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+
+    def _reserve(self):
+        with self._pending_lock:
+            if self._pending >= self._max_pending:
+                raise JobQueueFull(f'{self._pending} ELS jobs are already queued or running')
+            self._pending += 1
+
+    def _release(self, future=None):
+        with self._pending_lock:
+            self._pending -= 1
+
+    def create_job(self, term: str, books: Optional[List[str]] = None, min_skip: int = 1,
+                   max_skip: int = 1000) -> ElsJob:
+        """
+        Validate the request, store a queued job and submit it
+
+        Raises:
+            ValueError: Invalid term, skips or books
+            JobQueueFull: Too many jobs are pending
+        """
+        normalized = ''.join(LETTERS[i] for i in encode_letters(term))
+        if not MIN_TERM_LENGTH <= len(normalized) <= MAX_TERM_LENGTH:
+            raise ValueError(f'Term must have {MIN_TERM_LENGTH}-{MAX_TERM_LENGTH} Hebrew letters')
+        if not 1 <= min_skip <= max_skip <= MAX_SKIP:
+            raise ValueError(f'Skips must satisfy 1 <= min_skip <= max_skip <= {MAX_SKIP}')
+
+        job = ElsJob(
+            id=uuid.uuid4().hex,
+            term=normalized,
+            books=json.dumps(resolve_books(books)),
+            min_skip=min_skip,
+            max_skip=max_skip,
+            status='queued'
+        )
+
+        self._reserve()
+        try:
+            db.session.add(job)
+            db.session.commit()
+            future = self._executor.submit(self._run, job.id)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return job
+
+    def _run(self, job_id: str):
+        from app import app
+
+        with app.app_context():
+            job = db.session.get(ElsJob, job_id)
+            job.status = 'running'
+            db.session.commit()
+
+            try:
+                started = time.time()
+                text = get_letter_text(json.loads(job.books))
+                hits = attach_references(text, find_sequences(text, job.term, job.min_skip, job.max_skip,
+                                                              workers=1))
+
+                job.results = json.dumps(hits, ensure_ascii=False)
+                job.hit_count = len(hits)
+                job.elapsed = round(time.time() - started, 3)
+                job.status = 'completed'
+                logging.info(f"ELS job {job_id}: {len(hits)} hits for {job.term} "
+                             f"(skips {job.min_skip}-{job.max_skip}) in {job.elapsed}s")
+            except Exception as e:
+                logging.error(f"ELS job {job_id} failed: {e}")
+                db.session.rollback()
+                job = db.session.get(ElsJob, job_id)
+                job.status = 'failed'
+                job.error = str(e)
+            finally:
+                job.finished_at = datetime.utcnow()
+                db.session.commit()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Equidistant letter sequence search')
+    parser.add_argument('term', help='Hebrew term to search for')
+    parser.add_argument('--books', nargs='*', help='Books to search (default: the Torah)')
+    parser.add_argument('--min-skip', type=int, default=1)
+    parser.add_argument('--max-skip', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=None, help='Process pool size (1 disables)')
+
+    args = parser.parse_args()
+
+    from app import app
+
+    with app.app_context():
+        started = time.time()
+        text = get_letter_text(resolve_books(args.books))
+        loaded = time.time()
+        hits = attach_references(text, find_sequences(text, args.term, args.min_skip, args.max_skip,
+                                                      workers=args.workers))
+        print(f"{len(text.letters)} letters loaded in {loaded - started:.2f}s, "
+              f"{len(hits)} hits in {time.time() - loaded:.2f}s")
+        for hit in hits[:50]:
+            start = hit['start_reference']
+            print(f"skip {hit['skip']:>6} {hit['direction']:<8} "
+                  f"{start['book']} {start['chapter']}:{start['verse']}")
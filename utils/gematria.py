@@ -0,0 +1,183 @@
+"""
+Gematria (letter numerical values) for words and verses
+Values come from the Paleo Hebrew alphabet data; whole-corpus computation is vectorized with NumPy
+"""
+
+import logging
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import text
+
+from models import db, Chapter, Verse, VerseWord
+from data.paleo_alphabet import paleo_alphabet_data
+from utils.hebrew_converter import FINAL_FORMS, remove_nikud
+from utils.schema import upgrade_schema
+
+# Standard gematria: final forms count the same as their regular letters
+GEMATRIA_VALUES = {letter['letter']: letter['numerical_value'] for letter in paleo_alphabet_data}
+GEMATRIA_VALUES.update({final: GEMATRIA_VALUES[regular] for final, regular in FINAL_FORMS.items()})
+
+# Lookup table indexed by codepoint - HEBREW_BASE, covering the Hebrew letters block
+HEBREW_BASE = 0x05D0
+_LOOKUP = np.zeros(0x05EB - HEBREW_BASE, dtype=np.int64)
+for _letter, _value in GEMATRIA_VALUES.items():
+    _LOOKUP[ord(_letter) - HEBREW_BASE] = _value
+
+
+def gematria_value(hebrew_text: str) -> int:
+    """Gematria value of a word or text (nikud, spaces and punctuation count as 0)"""
+    return sum(GEMATRIA_VALUES.get(char, 0) for char in remove_nikud(hebrew_text or ''))
+
+
+def letter_values(hebrew_text: str) -> List[Dict]:
+    """Per-letter breakdown of a word's gematria value"""
+    return [
+        {'letter': char, 'value': GEMATRIA_VALUES[char]}
+        for char in remove_nikud(hebrew_text or '') if char in GEMATRIA_VALUES
+    ]
+
+
+def compute_gematria(texts: Sequence[str]) -> np.ndarray:
+    """
+    Gematria values of many texts at once
+
+    The texts are concatenated into one codepoint array, mapped through a lookup table
+    and summed per text with a prefix-sum, so the whole corpus is a handful of array operations.
+
+    Args:
+        texts: Consonantal (or pointed) Hebrew strings
+
+    Returns:
+        numpy.ndarray: int64 value for each text
+    """
+    if not texts:
+        return np.zeros(0, dtype=np.int64)
+
+    texts = [t or '' for t in texts]
+    codepoints = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype='<u4')
+
+    offsets = codepoints.astype(np.int64) - HEBREW_BASE
+    in_block = (offsets >= 0) & (offsets < len(_LOOKUP))
+    values = np.where(in_block, _LOOKUP[np.where(in_block, offsets, 0)], 0)
+
+    ends = np.cumsum(np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts)))
+    prefix = np.concatenate(([0], np.cumsum(values)))
+    starts = np.concatenate(([0], ends[:-1]))
+    return prefix[ends] - prefix[starts]
+
+
+def _store_values(table: str, ids: List[int], values: List[int], batch_size: int = 20000) -> int:
+    """Write precomputed gematria values for row ids"""
+    statement = text(f'UPDATE {table} SET gematria = :value WHERE id = :id')
+    for start in range(0, len(ids), batch_size):
+        db.session.execute(statement, [
+            {'id': row_id, 'value': value}
+            for row_id, value in zip(ids[start:start + batch_size], values[start:start + batch_size])
+        ])
+    return len(ids)
+
+
+def _compute_and_store(table: str, rows) -> int:
+    ids = [row[0] for row in rows]
+    values = compute_gematria([row[1] for row in rows]).tolist()
+    return _store_values(table, ids, values)
+
+
+def index_book_gematria(book_id: int) -> int:
+    """Importer stage: fill gematria for a book's verses and words that don't have it yet"""
+    verses = (db.session.query(Verse.id, Verse.hebrew_consonantal)
+              .join(Chapter, Verse.chapter_id == Chapter.id)
+              .filter(Chapter.book_id == book_id, Verse.gematria.is_(None)).all())
+    words = (db.session.query(VerseWord.id, VerseWord.consonantal)
+             .join(Verse, VerseWord.verse_id == Verse.id)
+             .join(Chapter, Verse.chapter_id == Chapter.id)
+             .filter(Chapter.book_id == book_id, VerseWord.gematria.is_(None)).all())
+
+    written = _compute_and_store('verse', verses) + _compute_and_store('verse_word', words)
+    db.session.commit()
+    return written
+
+
+def backfill_gematria(rebuild: bool = False) -> int:
+    """Compute gematria for the whole corpus (every verse and word token)"""
+    verse_query = db.session.query(Verse.id, Verse.hebrew_consonantal)
+    word_query = db.session.query(VerseWord.id, VerseWord.consonantal)
+    if not rebuild:
+        verse_query = verse_query.filter(Verse.gematria.is_(None))
+        word_query = word_query.filter(VerseWord.gematria.is_(None))
+
+    started = time.time()
+    verses = verse_query.all()
+    words = word_query.all()
+    loaded = time.time()
+
+    verse_values = compute_gematria([row[1] for row in verses])
+    word_values = compute_gematria([row[1] for row in words])
+    computed = time.time()
+    logging.info(f"Computed gematria for {len(verse_values)} verses and {len(word_values)} words "
+                 f"in {computed - loaded:.3f}s (loaded in {loaded - started:.2f}s)")
+
+    written = (_store_values('verse', [row[0] for row in verses], verse_values.tolist())
+               + _store_values('verse_word', [row[0] for row in words], word_values.tolist()))
+    db.session.commit()
+    logging.info(f"Stored gematria values in {time.time() - computed:.2f}s")
+    return written
+
+
+def words_with_value(value: int, limit: int = 50, cursor: int = 0) -> Tuple[List[Dict], Optional[int]]:
+    """
+    Distinct words with a gematria value, most frequent first
+
+    Returns:
+        (words, next_cursor) - each word has consonantal, paleo and occurrences
+    """
+    occurrences = db.func.count(VerseWord.id)
+    rows = (db.session.query(VerseWord.consonantal, db.func.min(VerseWord.paleo), occurrences)
+            .filter(VerseWord.gematria == value)
+            .group_by(VerseWord.consonantal)
+            .order_by(occurrences.desc(), VerseWord.consonantal)
+            .offset(cursor).limit(limit + 1).all())
+
+    words = [
+        {'consonantal': consonantal, 'paleo': paleo, 'occurrences': count}
+        for consonantal, paleo, count in rows[:limit]
+    ]
+    next_cursor = cursor + limit if len(rows) > limit else None
+    return words, next_cursor
+
+
+def verses_with_value(value: int, limit: int = 50, cursor: int = 0) -> Tuple[List[int], Optional[int]]:
+    """
+    Verses whose whole text has a gematria value, in verse order
+
+    Returns:
+        (verse_ids, next_cursor) - next_cursor is None on the last page
+    """
+    verse_ids = [
+        row[0] for row in db.session.query(Verse.id)
+        .filter(Verse.gematria == value)
+        .order_by(Verse.id)
+        .offset(cursor).limit(limit + 1)
+    ]
+
+    next_cursor = cursor + limit if len(verse_ids) > limit else None
+    return verse_ids[:limit], next_cursor
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Gematria index')
+    parser.add_argument('--backfill', action='store_true', help='Compute missing gematria values')
+    parser.add_argument('--rebuild', action='store_true', help='Recompute every gematria value')
+
+    args = parser.parse_args()
+
+    from app import app
+
+    with app.app_context():
+        upgrade_schema()
+        if args.backfill or args.rebuild:
+            print(f"Updated {backfill_gematria(rebuild=args.rebuild)} rows")
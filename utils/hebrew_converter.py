@@ -38,6 +38,44 @@ HEBREW_TO_PALEO = {
 # Reverse mapping for Paleo to Hebrew
 PALEO_TO_HEBREW = {v: k for k, v in HEBREW_TO_PALEO.items() if k not in ['ך', 'ם', 'ן', 'ף', 'ץ']}
 
+# Unicode ranges for Hebrew nikud/vowel points and punctuation to remove
+NIKUD_RANGES = [
+    (0x0591, 0x05BD),  # Hebrew accents
+    (0x05BF, 0x05BF),  # Hebrew point rafe
+    (0x05C1, 0x05C2),  # Hebrew points shin/sin
+    (0x05C4, 0x05C5),  # Hebrew punctuation
+    (0x05C7, 0x05C7),  # Hebrew point qamats qatan
+]
+
+# Specific Hebrew punctuation marks that didn't exist in ancient times
+ANCIENT_PUNCTUATION = [
+    0x05BE,  # Hebrew punctuation maqaf (־)
+    0x05C3,  # Hebrew punctuation sof pasuq (׃)
+    0x05C0,  # Hebrew punctuation paseq
+    0x05C6,  # Hebrew punctuation nun hafukha
+]
+
+# str.translate tables, built once: code point -> replacement (None deletes)
+NIKUD_TABLE = dict.fromkeys(
+    [code for start, end in NIKUD_RANGES for code in range(start, end + 1)] + ANCIENT_PUNCTUATION
+)
+
+class _PaleoTable(dict):
+    """
+    Translate table for hebrew_to_paleo: Hebrew letters map to Paleo symbols, any whitespace to
+    a space, and every other character (nikud, punctuation, digits...) is deleted.
+    Characters outside the letter map are resolved on first sight and remembered.
+    """
+    
+    def __missing__(self, code):
+        replacement = ' ' if chr(code).isspace() else None
+        self[code] = replacement
+        return replacement
+
+PALEO_TABLE = _PaleoTable(str.maketrans(HEBREW_TO_PALEO))
+
+PALEO_TO_HEBREW_TABLE = str.maketrans(PALEO_TO_HEBREW)
+
 def hebrew_to_paleo(hebrew_text):
     """
     Convert Hebrew text to Paleo Hebrew script using only the 22 Hebrew letters
@@ -48,19 +86,9 @@ def hebrew_to_paleo(hebrew_text):
     Returns:
         str: Text converted to Paleo Hebrew script (only the 22 letters + spaces)
     """
-    # Remove nikud (vowel points) - they didn't exist in ancient times
-    hebrew_no_nikud = remove_nikud(hebrew_text)
-    
-    # Convert each character, only keeping Hebrew letters and spaces
-    paleo_text = ''
-    for char in hebrew_no_nikud:
-        if char in HEBREW_TO_PALEO:
-            paleo_text += HEBREW_TO_PALEO[char]
-        elif char.isspace():
-            paleo_text += ' '
-        # Skip all other characters (punctuation, numbers, etc.)
-    
-    return paleo_text
+    # Nikud (which didn't exist in ancient times), punctuation and numbers are all dropped,
+    # so one translate pass does what remove_nikud + a letter filter would
+    return hebrew_text.translate(PALEO_TABLE)
 
 def paleo_to_hebrew(paleo_text):
     """
@@ -72,11 +100,7 @@ def paleo_to_hebrew(paleo_text):
     Returns:
         str: Text converted to modern Hebrew script
     """
-    hebrew_text = ''
-    for char in paleo_text:
-        hebrew_text += PALEO_TO_HEBREW.get(char, char)
-    
-    return hebrew_text
+    return paleo_text.translate(PALEO_TO_HEBREW_TABLE)
 
 def remove_nikud(hebrew_text):
     """
@@ -89,37 +113,73 @@ def remove_nikud(hebrew_text):
     Returns:
         str: Hebrew text with only consonantal letters
     """
-    # Unicode ranges for Hebrew nikud/vowel points and punctuation to remove
-    nikud_ranges = [
-        (0x0591, 0x05BD),  # Hebrew accents
-        (0x05BF, 0x05BF),  # Hebrew point rafe
-        (0x05C1, 0x05C2),  # Hebrew points shin/sin
-        (0x05C4, 0x05C5),  # Hebrew punctuation
-        (0x05C7, 0x05C7),  # Hebrew point qamats qatan
-    ]
-    
-    # Specific Hebrew punctuation marks that didn't exist in ancient times
-    ancient_punctuation = [
-        0x05BE,  # Hebrew punctuation maqaf (־)
-        0x05C3,  # Hebrew punctuation sof pasuq (׃)
-        0x05C0,  # Hebrew punctuation paseq
-        0x05C6,  # Hebrew punctuation nun hafukha
-    ]
-    
-    result = ''
-    for char in hebrew_text:
-        char_code = ord(char)
-        
-        # Skip ancient punctuation marks that didn't exist in Paleo Hebrew
-        if char_code in ancient_punctuation:
-            continue
-            
-        # Skip nikud (vowel points and cantillation marks)
-        is_nikud = any(start <= char_code <= end for start, end in nikud_ranges)
-        if not is_nikud:
-            result += char
-    
-    return result
+    return hebrew_text.translate(NIKUD_TABLE)
+
+# Final letter forms folded onto their regular forms for spelling-insensitive matching
+FINAL_FORMS = {
+    'ך': 'כ',  # Final Kaf
+    'ם': 'מ',  # Final Mem
+    'ן': 'נ',  # Final Nun
+    'ף': 'פ',  # Final Pey
+    'ץ': 'צ',  # Final Tsadey
+}
+
+# Punctuation that separates words (maqaf joins words, sof pasuq/paseq end or split them)
+WORD_SEPARATORS = ['־', '׃', '׀']
+
+# Separators become spaces, nikud is deleted and final forms are folded in one pass
+NORMALIZE_TABLE = dict(NIKUD_TABLE)
+NORMALIZE_TABLE.update(str.maketrans(FINAL_FORMS))
+NORMALIZE_TABLE.update(str.maketrans({separator: ' ' for separator in WORD_SEPARATORS}))
+
+def normalize_hebrew(hebrew_text):
+    """
+    Normalize Hebrew text for searching
+    Splits on maqaf/sof pasuq/paseq, removes nikud and cantillation, and folds final letter forms,
+    so pointed, unpointed and final-form spellings of a word all normalize to the same string
+    
+    Args:
+        hebrew_text (str): Hebrew text with or without nikud
+    
+    Returns:
+        str: Space-separated consonantal words without final forms
+    """
+    if not hebrew_text:
+        return ''
+    
+    return ' '.join(hebrew_text.translate(NORMALIZE_TABLE).split())
+
+# This is a simplified transliteration
+# In a full implementation, you'd want a more sophisticated system
+PRONUNCIATION_MAP = {
+    'א': '',      # Silent or glottal stop
+    'ב': 'b',
+    'ג': 'g',
+    'ד': 'd',
+    'ה': 'h',
+    'ו': 'v',
+    'ז': 'z',
+    'ח': 'ch',
+    'ט': 't',
+    'י': 'y',
+    'כ': 'k',
+    'ל': 'l',
+    'מ': 'm',
+    'נ': 'n',
+    'ס': 's',
+    'ע': '',      # Guttural, often silent
+    'פ': 'p',
+    'צ': 'ts',
+    'ק': 'q',
+    'ר': 'r',
+    'ש': 'sh',
+    'ת': 't',
+    ' ': ' '
+}
+
+# Nikud removal and letter transliteration in one table (letters not in the map are kept as is)
+PRONUNCIATION_TABLE = dict(NIKUD_TABLE)
+PRONUNCIATION_TABLE.update(str.maketrans(PRONUNCIATION_MAP))
 
 def get_pronunciation_guide(hebrew_word):
     """
@@ -131,41 +191,47 @@ def get_pronunciation_guide(hebrew_word):
     Returns:
         str: Basic pronunciation guide
     """
-    # This is a simplified transliteration
-    # In a full implementation, you'd want a more sophisticated system
-    transliteration_map = {
-        'א': '',      # Silent or glottal stop
-        'ב': 'b',
-        'ג': 'g',
-        'ד': 'd',
-        'ה': 'h',
-        'ו': 'v',
-        'ז': 'z',
-        'ח': 'ch',
-        'ט': 't',
-        'י': 'y',
-        'כ': 'k',
-        'ל': 'l',
-        'מ': 'm',
-        'נ': 'n',
-        'ס': 's',
-        'ע': '',      # Guttural, often silent
-        'פ': 'p',
-        'צ': 'ts',
-        'ק': 'q',
-        'ר': 'r',
-        'ש': 'sh',
-        'ת': 't',
-        ' ': ' '
-    }
+    return hebrew_word.translate(PRONUNCIATION_TABLE).strip()
+
+# Never produced or changed by the tables above (hebrew_to_paleo's copy keeps it instead of turning
+# it into a space), so it survives a translate pass over joined texts
+RECORD_SEPARATOR = '\x1e'
+
+_PALEO_BULK_TABLE = _PaleoTable(PALEO_TABLE)
+_PALEO_BULK_TABLE[ord(RECORD_SEPARATOR)] = RECORD_SEPARATOR
+
+# Single-text converters that can run over many texts joined into one string:
+# converter -> (translate table, per-text finishing step)
+_BULK_CONVERSIONS = {
+    hebrew_to_paleo: (_PALEO_BULK_TABLE, None),
+    remove_nikud: (NIKUD_TABLE, None),
+    paleo_to_hebrew: (PALEO_TO_HEBREW_TABLE, None),
+    get_pronunciation_guide: (PRONUNCIATION_TABLE, str.strip),
+    normalize_hebrew: (NORMALIZE_TABLE, lambda text: ' '.join(text.split())),
+}
+
+def convert_many(texts, converter=hebrew_to_paleo):
+    """
+    Apply a converter to many texts with one translate call
+    
+    Args:
+        texts (iterable): Strings to convert
+        converter: hebrew_to_paleo, paleo_to_hebrew, remove_nikud, normalize_hebrew or get_pronunciation_guide
     
-    clean_word = remove_nikud(hebrew_word)
-    pronunciation = ''
+    Returns:
+        list: converter(text) for each text, in order
+    """
+    texts = list(texts)
+    if (converter not in _BULK_CONVERSIONS or not texts
+            or any(not isinstance(text, str) or RECORD_SEPARATOR in text for text in texts)):
+        return [converter(text) for text in texts]
     
-    for char in clean_word:
-        pronunciation += transliteration_map.get(char, char)
+    table, finish = _BULK_CONVERSIONS[converter]
     
-    return pronunciation.strip()
+    converted = RECORD_SEPARATOR.join(texts).translate(table).split(RECORD_SEPARATOR)
+    if finish is not None:
+        converted = [finish(text) for text in converted]
+    return converted
 
 def analyze_word_meaning(paleo_word):
     """
@@ -177,26 +243,25 @@ def analyze_word_meaning(paleo_word):
     Returns:
         dict: Analysis of the word including letter meanings
     """
-    from flask import current_app
-    
-    with current_app.app_context():
-        from models import PaleoLetter
-        
-        analysis = {
-            'word': paleo_word,
-            'letters': [],
-            'possible_meaning': ''
-        }
-        
-        for char in paleo_word:
-            if char != ' ':  # Skip spaces
-                letter = PaleoLetter.query.filter_by(paleo_symbol=char).first()
-                if letter:
-                    analysis['letters'].append({
-                        'symbol': char,
-                        'name': letter.name,
-                        'meaning': letter.meaning,
-                        'pictograph': letter.pictograph_description
-                    })
-        
-        return analysis
\ No newline at end of file
+    from utils.reference_data import get_reference_data
+    
+    letters = get_reference_data()
+    
+    analysis = {
+        'word': paleo_word,
+        'letters': [],
+        'possible_meaning': ''
+    }
+    
+    for char in paleo_word:
+        if char != ' ':  # Skip spaces
+            letter = letters.symbol(char)
+            if letter:
+                analysis['letters'].append({
+                    'symbol': char,
+                    'name': letter['name'],
+                    'meaning': letter['meaning'],
+                    'pictograph': letter['pictograph_description']
+                })
+    
+    return analysis
\ No newline at end of file
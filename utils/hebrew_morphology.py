@@ -0,0 +1,152 @@
+"""
+Hebrew morphology helpers
+Affix lists, affix tries and segmentation, and root (shoresh) candidate generation for consonantal words
+"""
+
+from typing import Iterable, List, Set, Tuple
+
+# Proclitic prefixes: and, the, in, like, to, from, that
+PREFIXES = ['ו', 'ה', 'ב', 'כ', 'ל', 'מ', 'ש']
+
+# Plural, feminine and pronominal endings (final letters folded, as in normalize_hebrew)
+SUFFIXES = ['ימ', 'ות', 'יה', 'נה', 'יו', 'כמ', 'המ', 'נו', 'ו', 'ה', 'י', 'ת']
+
+# Imperfect verb preformatives: he/she/I/we (ויאמר -> אמר)
+VERB_PREFIXES = ['י', 'ת', 'א', 'נ']
+
+# Vowel letters (matres lectionis) that can be written inside an inflected stem
+VOWEL_LETTERS = ['ו', 'י']
+
+MAX_PREFIXES = 3
+ROOT_LENGTHS = (2, 3)
+
+
+def _strip_prefixes(word: str):
+    """Yield the word with 0..MAX_PREFIXES leading prefix letters removed"""
+    yield word
+    stem = word
+    for _ in range(MAX_PREFIXES):
+        if len(stem) <= min(ROOT_LENGTHS) or stem[0] not in PREFIXES:
+            break
+        stem = stem[1:]
+        yield stem
+
+
+def _strip_suffixes(stem: str):
+    """Yield the stem as is and with each matching suffix removed"""
+    yield stem
+    for suffix in SUFFIXES:
+        if stem.endswith(suffix) and len(stem) - len(suffix) >= min(ROOT_LENGTHS):
+            yield stem[:-len(suffix)]
+
+
+def candidate_roots(normalized_word: str) -> Set[str]:
+    """
+    Possible 2-3 letter roots of a normalized (final-folded, unpointed) word
+
+    Args:
+        normalized_word (str): Word as produced by normalize_hebrew
+
+    Returns:
+        set: Candidate roots; over-generates rather than missing an inflection
+    """
+    roots = set()
+
+    for prefixed in _strip_prefixes(normalized_word):
+        for stem in _strip_suffixes(prefixed):
+            if len(stem) in ROOT_LENGTHS:
+                roots.add(stem)
+            elif len(stem) == 4:
+                # Drop a verb preformative: יאמר -> אמר
+                if stem[0] in VERB_PREFIXES:
+                    roots.add(stem[1:])
+                # Drop an internal vowel letter: שומר -> שמר, שמיר -> שמר
+                for i in (1, 2):
+                    if stem[i] in VOWEL_LETTERS:
+                        roots.add(stem[:i] + stem[i + 1:])
+
+    return roots
+
+
+# Suffixes for segmentation: plural/feminine endings, pronominal suffixes on singular and plural
+# nouns, and perfect verb endings (final letters folded)
+SEGMENT_SUFFIXES = [
+    'ימ', 'ות', 'ת', 'ה',
+    'י', 'ו', 'כ', 'נו', 'כמ', 'כנ', 'המ', 'הנ',
+    'יו', 'יה', 'יכ', 'ינו', 'יכמ', 'יהמ', 'יהנ',
+    'ותי', 'ותיו', 'ותיה', 'ותינו', 'ותיכמ', 'ותיהמ',
+    'תי', 'תמ', 'נה',
+]
+
+MIN_STEM = 2
+
+_END = None  # Trie key marking the end of an affix
+
+
+class AffixTrie:
+    """Character trie of affixes, matched from the start of a word (or from the end when reverse)"""
+
+    def __init__(self, affixes: Iterable[str], reverse: bool = False):
+        self.reverse = reverse
+        self.root = {}
+        for affix in affixes:
+            node = self.root
+            for char in (affix[::-1] if reverse else affix):
+                node = node.setdefault(char, {})
+            node[_END] = affix
+
+    def matches(self, word: str) -> List[str]:
+        """Every affix the word starts (or ends) with, shortest first, including the empty affix"""
+        found = ['']
+        node = self.root
+        for char in (reversed(word) if self.reverse else word):
+            node = node.get(char)
+            if node is None:
+                break
+            if _END in node:
+                found.append(node[_END])
+        return found
+
+
+def _prefix_clusters() -> List[str]:
+    """
+    Proclitic clusters in written order: and + that + preposition + the (וה, ומה, וכש, בש...).
+    After ב, כ and ל the article is carried by the vowel only, so בה/כה/לה are not clusters.
+    """
+    clusters = set()
+    for conjunction in ('', 'ו'):
+        for relative in ('', 'ש', 'כש', 'מש'):
+            for preposition in ('', 'ב', 'כ', 'ל', 'מ'):
+                for article in ('', 'ה'):
+                    if article and preposition in ('ב', 'כ', 'ל'):
+                        continue
+                    clusters.add(conjunction + relative + preposition + article)
+    clusters.discard('')
+    return sorted(clusters)
+
+
+PREFIX_TRIE = AffixTrie(_prefix_clusters())
+SUFFIX_TRIE = AffixTrie(SEGMENT_SUFFIXES, reverse=True)
+
+
+def segmentations(normalized_word: str) -> List[Tuple[str, str, str]]:
+    """
+    Every (prefix, stem, suffix) split of a normalized word allowed by the affix tries
+
+    Args:
+        normalized_word (str): Word as produced by normalize_hebrew
+
+    Returns:
+        list: Splits with a stem of at least MIN_STEM letters, the unsegmented word first
+    """
+    prefixes = PREFIX_TRIE.matches(normalized_word)
+    suffixes = SUFFIX_TRIE.matches(normalized_word)
+    splits = []
+
+    for prefix in prefixes:
+        for suffix in suffixes:
+            stem_end = len(normalized_word) - len(suffix)
+            if stem_end - len(prefix) >= MIN_STEM:
+                splits.append((prefix, normalized_word[len(prefix):stem_end], suffix))
+
+    return splits
@@ -0,0 +1,107 @@
+"""
+Staged verse import pipeline
+Fetcher threads download books, a process pool runs the CPU-heavy text transforms and a single
+writer upserts the rows through an ImportSession, one transaction per book.
+Each stage keeps its own counters so the throughput of every stage can be reported.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from utils.hebrew_converter import normalize_hebrew
+from utils.references import make_ordinal
+
+# Verses per transform task, so large books are spread over the worker processes
+TRANSFORM_CHUNK_SIZE = 500
+
+# Books waiting between the stages (bounds memory when one stage is slower than the others)
+QUEUE_SIZE = 4
+
+
+class StageStats:
+    """Items, verses and busy time of one pipeline stage (shared by the stage's threads)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.books = 0
+        self.verses = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, verses: int, seconds: float, books: int = 0):
+        with self._lock:
+            self.books += books
+            self.verses += verses
+            self.seconds += seconds
+
+    def summary(self) -> str:
+        rate = self.verses / self.seconds if self.seconds else 0.0
+        return (f"{self.name}: {self.books} books, {self.verses} verses in {self.seconds:.1f}s busy "
+                f"({rate:.0f} verses/s)")
+
+
+# Transform stage (runs in the worker processes)
+
+_transformer = None
+
+
+def init_transform_worker():
+    """
+    Process pool initializer: each worker gets its own app context and BibleImporter, so the
+    literal glosses are resolved against the lexicon exactly as in the importer process
+    """
+    global _transformer
+
+    from app import app
+    from utils.bible_importer import BibleImporter
+
+    app.app_context().push()
+    _transformer = BibleImporter()
+
+
+def transform_verses(book_order: int, verse_data: List[Dict]) -> Tuple[List[Dict], float]:
+    """
+    Build verse rows (without chapter_id) from fetched {'chapter', 'verse', 'hebrew', 'english'} dicts
+
+    Returns:
+        (rows, seconds) - rows keep the chapter number under 'chapter' for the writer to resolve
+    """
+    started = time.perf_counter()
+    rows = []
+
+    for verse_info in verse_data:
+        try:
+            verse = _transformer._create_verse_data(
+                verse_info['chapter'],
+                verse_info['verse'],
+                verse_info['hebrew'],
+                verse_info.get('english', '')
+            )
+        except Exception as e:
+            logging.error(f"Error processing verse {verse_info}: {e}")
+            continue
+
+        rows.append({
+            'chapter': verse['chapter'],
+            'verse_number': verse['verse'],
+            'ordinal': make_ordinal(book_order, verse['chapter'], verse['verse']),
+            'hebrew_text': verse['hebrew_text'],
+            'hebrew_consonantal': verse['hebrew_consonantal'],
+            'hebrew_normalized': normalize_hebrew(verse['hebrew_text']),
+            'paleo_text': verse['paleo_text'],
+            'paleo_transliteration': verse['paleo_transliteration'],
+            'modern_transliteration': verse['modern_transliteration'],
+            'english_translation': verse['english_translation'],
+            'literal_translation': verse['literal_translation'],
+            'strong_numbers': verse.get('strong_numbers', ''),
+            'morphology': verse.get('morphology', ''),
+            'notes': verse.get('notes', ''),
+        })
+
+    return rows, time.perf_counter() - started
+
+
+def chunked(verse_data: List[Dict], size: int = TRANSFORM_CHUNK_SIZE) -> List[List[Dict]]:
+    return [verse_data[start:start + size] for start in range(0, len(verse_data), size)]
@@ -0,0 +1,144 @@
+"""
+Shared state for idempotent verse imports
+Loads the book and (book, chapter) -> chapter id maps and the set of existing (chapter_id,
+verse_number) keys with one query each, so importers skip existing verses with set lookups instead
+of a Chapter and a Verse query per verse. New rows go in with a native upsert backed by the unique
+verse index.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from models import db, Book, Chapter, Verse
+from utils.corpus_stats import refresh_counts
+from utils.references import make_ordinal
+
+_INSERT_VERSES = sqlite_insert(Verse.__table__).on_conflict_do_nothing()
+
+# Verse columns taken from BibleImporter._create_verse_data output
+VERSE_DATA_FIELDS = ('hebrew_text', 'hebrew_consonantal', 'paleo_text', 'paleo_transliteration',
+                     'modern_transliteration', 'english_translation', 'literal_translation',
+                     'strong_numbers', 'morphology', 'notes')
+
+
+def verse_row(chapter_id: int, verse_number: int, verse_data: Dict) -> Dict:
+    """Verse column values for ImportSession.insert_verses from processed verse data"""
+    return {
+        'chapter_id': chapter_id,
+        'verse_number': verse_number,
+        **{field: verse_data.get(field, '') for field in VERSE_DATA_FIELDS}
+    }
+
+
+class ImportSession:
+    """Book, chapter and existing-verse lookups for one import run"""
+
+    def __init__(self, session=None):
+        self.session = session or db.session
+        self.books = {}  # Book name -> (id, order)
+        self.book_orders = {}  # Book id -> order
+        self.chapter_ids = {}  # (book_id, chapter_number) -> chapter id
+        self.chapters = {}  # Chapter id -> (book_id, chapter_number)
+        self.existing = set()  # (chapter_id, verse_number)
+        self.verse_counts = Counter()  # Chapter id -> verses known to exist
+        self.load()
+
+    def load(self):
+        """(Re)load the maps from the database"""
+        self.books = {name: (book_id, order) for book_id, name, order in
+                      self.session.query(Book.id, Book.name, Book.order)}
+        self.book_orders = {book_id: order for book_id, order in self.books.values()}
+
+        self.chapter_ids = {}
+        self.chapters = {}
+        for chapter_id, book_id, chapter_number in self.session.query(Chapter.id, Chapter.book_id,
+                                                                      Chapter.chapter_number):
+            self.chapter_ids.setdefault((book_id, chapter_number), chapter_id)
+            self.chapters[chapter_id] = (book_id, chapter_number)
+
+        self.existing = set(self.session.query(Verse.chapter_id, Verse.verse_number))
+        self.verse_counts = Counter(chapter_id for chapter_id, _ in self.existing)
+
+    def book_id(self, book_name: str) -> Optional[int]:
+        book = self.books.get(book_name)
+        return book[0] if book else None
+
+    def chapter_id(self, book_id: int, chapter_number: int) -> Optional[int]:
+        return self.chapter_ids.get((book_id, chapter_number))
+
+    def add_chapter(self, chapter: Chapter):
+        """Register a chapter created during the import (it must be flushed so it has an id)"""
+        self.chapter_ids[(chapter.book_id, chapter.chapter_number)] = chapter.id
+        self.chapters[chapter.id] = (chapter.book_id, chapter.chapter_number)
+
+    def has_verse(self, chapter_id: int, verse_number: int) -> bool:
+        return (chapter_id, verse_number) in self.existing
+
+    def verse_count(self, chapter_id: int) -> int:
+        return self.verse_counts[chapter_id]
+
+    def claim(self, chapter_id: int, verse_number: int) -> bool:
+        """
+        Mark a verse as being imported
+
+        Returns:
+            bool: False when the verse already exists (or was claimed earlier in this run)
+        """
+        key = (chapter_id, verse_number)
+        if key in self.existing:
+            return False
+        self.existing.add(key)
+        self.verse_counts[chapter_id] += 1
+        return True
+
+    def new_rows(self, rows: Iterable[Dict]) -> List[Dict]:
+        """Rows (with chapter_id and verse_number) whose verse doesn't exist yet, claiming them"""
+        return [row for row in rows if self.claim(row['chapter_id'], row['verse_number'])]
+
+    def insert_verses(self, rows: Iterable[Dict]) -> int:
+        """
+        Upsert verse rows: rows already known are skipped in memory, the rest are inserted with
+        INSERT ... ON CONFLICT DO NOTHING (covering rows written by another process meanwhile).
+        Ordinals are filled in and chapter verse counts refreshed; this is a Core insert, so the
+        caller commits and bumps the data generation.
+
+        Args:
+            rows: Verse column values, including chapter_id and verse_number
+
+        Returns:
+            int: Number of verses inserted
+        """
+        values = []
+        for row in self.new_rows(rows):
+            if row.get('ordinal') is None:
+                book_id, chapter_number = self.chapters[row['chapter_id']]
+                row = {**row, 'ordinal': make_ordinal(self.book_orders[book_id], chapter_number,
+                                                      row['verse_number'])}
+            values.append(row)
+
+        if not values:
+            return 0
+
+        inserted = self.session.execute(_INSERT_VERSES, values).rowcount
+        refresh_counts(self.session.connection(), {row['chapter_id'] for row in values})
+        return inserted
+
+    def chapter_rows(self, book_id: int, rows: Iterable[Dict]) -> Tuple[List[Dict], Set[int]]:
+        """
+        Resolve rows keyed by chapter number ('chapter') to chapter ids
+
+        Returns:
+            (rows with chapter_id, chapter numbers that don't exist for the book)
+        """
+        resolved = []
+        missing = set()
+        for row in rows:
+            chapter_id = self.chapter_id(book_id, row['chapter'])
+            if chapter_id is None:
+                missing.add(row['chapter'])
+                continue
+            resolved.append({**{key: value for key, value in row.items() if key != 'chapter'},
+                             'chapter_id': chapter_id})
+        return resolved, missing
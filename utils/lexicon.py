@@ -0,0 +1,145 @@
+"""
+In-memory Strong's Hebrew lexicon
+Loaded once per worker and indexed by pointed form, consonantal form, normalized form,
+transliteration and Strong's number; rebuilt when the data generation changes
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from models import db, StrongsHebrew
+from utils.data_generation import current_generation
+from utils.hebrew_converter import normalize_hebrew, remove_nikud
+
+
+class LexiconEntry:
+    """One Strong's Hebrew entry (plain slotted object, detached from the session)"""
+
+    __slots__ = ('strong_number', 'hebrew_word', 'consonantal', 'normalized', 'transliteration',
+                 'pronunciation', 'short_definition', 'long_definition', 'usage_count', 'root_word',
+                 'part_of_speech')
+
+    def __init__(self, strong_number, hebrew_word, transliteration, pronunciation, short_definition,
+                 long_definition, usage_count, root_word, part_of_speech):
+        self.strong_number = strong_number
+        self.hebrew_word = hebrew_word
+        self.consonantal = remove_nikud(hebrew_word or '')
+        self.normalized = normalize_hebrew(self.consonantal)
+        self.transliteration = transliteration
+        self.pronunciation = pronunciation
+        self.short_definition = short_definition
+        self.long_definition = long_definition
+        self.usage_count = usage_count
+        self.root_word = root_word
+        self.part_of_speech = part_of_speech
+
+    def to_dict(self) -> Dict:
+        """Same shape as StrongsHebrew.to_dict()"""
+        return {
+            'strong_number': self.strong_number,
+            'word': self.hebrew_word,
+            'transliteration': self.transliteration,
+            'pronunciation': self.pronunciation,
+            'meaning': self.short_definition,
+            'definition': self.long_definition or self.short_definition,
+            'usage_count': self.usage_count,
+            'root_word': self.root_word,
+            'part_of_speech': self.part_of_speech
+        }
+
+
+class Lexicon:
+    """
+    Strong's Hebrew entries with dictionary indexes.
+
+    Each index maps a key to the entries having it, in table order, so index[key][0] is what
+    a .first() query on the same column would have returned.
+    """
+
+    def __init__(self, entries: List[LexiconEntry], generation=None):
+        self.entries = entries
+        self.generation = generation
+        self.by_number = {}
+        self.by_pointed = {}
+        self.by_consonantal = {}
+        self.by_normalized = {}
+        self.by_transliteration = {}
+
+        for entry in entries:
+            self.by_number[entry.strong_number] = entry
+            self.by_pointed.setdefault(entry.hebrew_word, []).append(entry)
+            self.by_consonantal.setdefault(entry.consonantal, []).append(entry)
+            self.by_normalized.setdefault(entry.normalized, []).append(entry)
+            if entry.transliteration:
+                self.by_transliteration.setdefault(entry.transliteration.lower(), []).append(entry)
+
+    @classmethod
+    def load(cls, generation=None) -> 'Lexicon':
+        started = time.time()
+        rows = db.session.query(
+            StrongsHebrew.strong_number, StrongsHebrew.hebrew_word, StrongsHebrew.transliteration,
+            StrongsHebrew.pronunciation, StrongsHebrew.short_definition, StrongsHebrew.long_definition,
+            StrongsHebrew.usage_count, StrongsHebrew.root_word, StrongsHebrew.part_of_speech
+        ).order_by(StrongsHebrew.id).all()
+
+        lexicon = cls([LexiconEntry(*row) for row in rows], generation)
+        logging.info(f"Loaded Strong's lexicon: {len(rows)} entries in {time.time() - started:.2f}s")
+        return lexicon
+
+    @staticmethod
+    def _first(index: Dict, key) -> Optional[LexiconEntry]:
+        entries = index.get(key)
+        return entries[0] if entries else None
+
+    def number(self, strong_number: str) -> Optional[LexiconEntry]:
+        return self.by_number.get(strong_number)
+
+    def pointed(self, hebrew_word: str) -> Optional[LexiconEntry]:
+        """Entry whose stored Hebrew is exactly this string"""
+        return self._first(self.by_pointed, hebrew_word)
+
+    def consonantal(self, consonantal: str) -> Optional[LexiconEntry]:
+        """Entry whose Hebrew without nikud is this string"""
+        return self._first(self.by_consonantal, consonantal)
+
+    def normalized(self, normalized: str) -> List[LexiconEntry]:
+        """Entries whose normalized form (no nikud, finals folded) is this string"""
+        return self.by_normalized.get(normalized, [])
+
+    def transliteration(self, transliteration: str) -> List[LexiconEntry]:
+        return self.by_transliteration.get(transliteration.lower(), [])
+
+    def lookup(self, word: str) -> Optional[LexiconEntry]:
+        """Exact lookup: stored form first, then consonantal form"""
+        return self.pointed(word) or self.consonantal(remove_nikud(word))
+
+    def containing(self, fragment: str, limit: int = 5) -> List[LexiconEntry]:
+        """Entries whose consonantal form contains the fragment (in-memory scan, no LIKE query)"""
+        matches = []
+        for entry in self.entries:
+            if fragment in entry.consonantal:
+                matches.append(entry)
+                if len(matches) >= limit:
+                    break
+        return matches
+
+
+_lexicon_lock = threading.Lock()
+_lexicon = None
+
+
+def get_lexicon() -> Lexicon:
+    """Process-wide lexicon, reloaded when the data generation changes"""
+    global _lexicon
+
+    generation = current_generation()
+    lexicon = _lexicon
+    if lexicon is not None and lexicon.generation == generation:
+        return lexicon
+
+    with _lexicon_lock:
+        if _lexicon is None or _lexicon.generation != generation:
+            _lexicon = Lexicon.load(generation)
+        return _lexicon
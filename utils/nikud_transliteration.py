@@ -0,0 +1,347 @@
+"""
+Nikud-aware transliteration
+Reads pointed Hebrew as consonant + vowel + dagesh/shin-dot clusters with a table-driven state
+machine (one pass, no regular expressions) and renders each word from the real vowel points:
+'ancient' style for paleo_transliteration (be-re-sheet), 'modern' style for modern_transliteration
+(bereshit). Also backfills both columns across the corpus.
+"""
+
+import logging
+import time
+from functools import lru_cache
+from typing import List, Tuple
+
+from sqlalchemy import bindparam
+
+from models import db, Verse
+from utils.data_generation import bump_generation
+
+MODES = ('ancient', 'modern')
+
+# Character classes
+LETTER, VOWEL, SHEVA, DAGESH, SHIN_DOT, SIN_DOT, MARK, BREAK, OTHER = range(9)
+
+CHAR_CLASSES = {}
+CHAR_CLASSES.update(dict.fromkeys(range(0x05D0, 0x05EB), LETTER))
+CHAR_CLASSES.update(dict.fromkeys(list(range(0x05B1, 0x05BC)) + [0x05C7], VOWEL))
+CHAR_CLASSES[0x05B0] = SHEVA
+CHAR_CLASSES[0x05BC] = DAGESH  # Dagesh, mappiq and shuruk dot share one code point
+CHAR_CLASSES[0x05C1] = SHIN_DOT
+CHAR_CLASSES[0x05C2] = SIN_DOT
+# Cantillation, meteg, rafe and upper/lower dots carry no sound
+CHAR_CLASSES.update(dict.fromkeys(list(range(0x0591, 0x05B0)) + [0x05BD, 0x05BF, 0x05C4, 0x05C5], MARK))
+# Maqaf, paseq and sof pasuq end a word like whitespace does
+CHAR_CLASSES.update(dict.fromkeys([0x05BE, 0x05C0, 0x05C3], BREAK))
+
+POINT_CLASSES = {VOWEL, SHEVA, DAGESH, SHIN_DOT, SIN_DOT}
+
+# States
+BETWEEN_WORDS, IN_WORD = range(2)
+
+# Actions
+SKIP, START_CLUSTER, SET_VOWEL, SET_DAGESH, SET_DOT, END_WORD = range(6)
+
+# (state, character class) -> (next state, action)
+TRANSITIONS = {
+    (BETWEEN_WORDS, LETTER): (IN_WORD, START_CLUSTER),
+    (IN_WORD, LETTER): (IN_WORD, START_CLUSTER),
+    (IN_WORD, VOWEL): (IN_WORD, SET_VOWEL),
+    (IN_WORD, SHEVA): (IN_WORD, SET_VOWEL),
+    (IN_WORD, DAGESH): (IN_WORD, SET_DAGESH),
+    (IN_WORD, SHIN_DOT): (IN_WORD, SET_DOT),
+    (IN_WORD, SIN_DOT): (IN_WORD, SET_DOT),
+    (IN_WORD, BREAK): (BETWEEN_WORDS, END_WORD),
+}
+
+HOLAM = 'ֹ'
+HOLAM_HASER = 'ֺ'
+SHEVA_POINT = 'ְ'
+HIRIQ = 'ִ'
+TSERE = 'ֵ'
+SEGOL = 'ֶ'
+PATAH = 'ַ'
+
+# Vowel point -> (ancient, modern)
+VOWELS = {
+    'ֱ': ('e', 'e'),    # Hataf segol
+    'ֲ': ('a', 'a'),    # Hataf patah
+    'ֳ': ('o', 'o'),    # Hataf qamats
+    HIRIQ: ('i', 'i'),
+    TSERE: ('e', 'e'),
+    SEGOL: ('e', 'e'),
+    PATAH: ('a', 'a'),
+    'ָ': ('a', 'a'),    # Qamats
+    HOLAM: ('o', 'o'),
+    HOLAM_HASER: ('o', 'o'),
+    'ֻ': ('u', 'u'),    # Qubuts
+    'ׇ': ('o', 'o'),    # Qamats qatan
+}
+
+# Vocal sheva
+SHEVA_VOWEL = ('a', 'e')
+
+# Vowel followed by a bare yod (mater lectionis) -> (ancient, modern)
+YOD_MATER_VOWELS = {
+    HIRIQ: ('ee', 'i'),
+    TSERE: ('ay', 'e'),
+    SEGOL: ('e', 'e'),
+}
+
+# Letter -> (ancient, modern without dagesh, modern with dagesh). Ancient Hebrew had no
+# spirantization, so the ancient column is always the hard sound.
+CONSONANTS = {
+    'א': ('', '', ''),
+    'ב': ('b', 'v', 'b'),
+    'ג': ('g', 'g', 'g'),
+    'ד': ('d', 'd', 'd'),
+    'ה': ('h', 'h', 'h'),
+    'ו': ('w', 'v', 'v'),
+    'ז': ('z', 'z', 'z'),
+    'ח': ('ch', 'ch', 'ch'),
+    'ט': ('t', 't', 't'),
+    'י': ('y', 'y', 'y'),
+    'כ': ('k', 'kh', 'k'),
+    'ך': ('k', 'kh', 'k'),
+    'ל': ('l', 'l', 'l'),
+    'מ': ('m', 'm', 'm'),
+    'ם': ('m', 'm', 'm'),
+    'נ': ('n', 'n', 'n'),
+    'ן': ('n', 'n', 'n'),
+    'ס': ('s', 's', 's'),
+    'ע': ('', '', ''),
+    'פ': ('p', 'f', 'p'),
+    'ף': ('p', 'f', 'p'),
+    'צ': ('ts', 'ts', 'ts'),
+    'ץ': ('ts', 'ts', 'ts'),
+    'ק': ('q', 'k', 'k'),
+    'ר': ('r', 'r', 'r'),
+    'ש': ('sh', 'sh', 'sh'),
+    'ת': ('t', 't', 't'),
+}
+
+SIN = ('s', 's', 's')
+
+# Word-final gutturals that take a furtive patah, sounded before the consonant (ru-ach)
+FURTIVE_LETTERS = {'ח', 'ע', 'ה'}
+
+CACHE_SIZE = 65536
+
+# Cluster: (letter, vowel point or '', dagesh, sin dot)
+Cluster = Tuple[str, str, bool, bool]
+
+
+def tokenize(hebrew_text: str) -> List[Tuple[Cluster, ...]]:
+    """
+    Split pointed text into words of consonant clusters in one pass over the characters
+
+    Returns:
+        list: One tuple of (letter, vowel, dagesh, sin) clusters per word
+    """
+    words = []
+    clusters = []
+    letter, vowel, dagesh, sin = None, '', False, False
+    state = BETWEEN_WORDS
+
+    for char in hebrew_text:
+        char_class = CHAR_CLASSES.get(ord(char), BREAK if char.isspace() else OTHER)
+        state, action = TRANSITIONS.get((state, char_class), (state, SKIP))
+
+        if action == SKIP:
+            continue
+        if action == START_CLUSTER:
+            if letter is not None:
+                clusters.append((letter, vowel, dagesh, sin))
+            letter, vowel, dagesh, sin = char, '', False, False
+        elif action == SET_VOWEL:
+            vowel = char
+        elif action == SET_DAGESH:
+            dagesh = True
+        elif action == SET_DOT:
+            sin = char_class == SIN_DOT
+        elif action == END_WORD:
+            clusters.append((letter, vowel, dagesh, sin))
+            words.append(tuple(clusters))
+            clusters = []
+            letter = None
+
+    if letter is not None:
+        clusters.append((letter, vowel, dagesh, sin))
+        words.append(tuple(clusters))
+    return words
+
+
+def has_nikud(hebrew_text: str) -> bool:
+    """True when the text carries vowel points (the transducer needs them)"""
+    return any(CHAR_CLASSES.get(ord(char)) in POINT_CLASSES for char in hebrew_text or '')
+
+
+def _consonant(letter: str, dagesh: bool, sin: bool, modern: bool) -> str:
+    sounds = SIN if sin else CONSONANTS[letter]
+    if not modern:
+        return sounds[0]
+    return sounds[2] if dagesh else sounds[1]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def render_word(clusters: Tuple[Cluster, ...], mode: str = 'ancient') -> str:
+    """
+    Transliterate one word's clusters
+
+    Args:
+        clusters: Output of tokenize() for one word
+        mode: 'ancient' (hard consonants, syllables joined with hyphens) or 'modern'
+    """
+    modern = mode == 'modern'
+    column = 1 if modern else 0
+    syllables = []  # [onset, vowel, coda]
+    pending = ''  # Unvowelled consonant, until the next cluster shows whether a vav gives it a vowel
+    last = len(clusters) - 1
+    skip = -1
+
+    def flush():
+        if syllables:
+            syllables[-1][2] += pending
+        elif pending:
+            syllables.append([pending, '', ''])
+        return ''
+
+    for i, (letter, vowel, dagesh, sin) in enumerate(clusters):
+        if i == skip:
+            continue
+        following = clusters[i + 1] if i < last else None
+
+        if letter == 'ו' and not dagesh and vowel in (HOLAM, HOLAM_HASER) and (pending or not syllables):
+            # Holam male: the dot sits on the vav but voices the preceding consonant
+            syllables.append([pending, VOWELS[vowel][column], ''])
+            pending = ''
+            continue
+        if letter == 'ו' and dagesh and not vowel and (pending or not syllables):
+            # Shuruk: u after a consonant, or on its own as the conjunction
+            syllables.append([pending, 'u', ''])
+            pending = ''
+            continue
+
+        pending = flush()
+        consonant = _consonant(letter, dagesh, sin, modern)
+
+        if i == last and vowel == PATAH and letter in FURTIVE_LETTERS and (letter != 'ה' or dagesh):
+            syllables.append(['', 'a', consonant])
+            continue
+        if i == last and letter == 'ה' and not vowel and not dagesh:
+            # Final he without mappiq is a vowel letter, kept in the ancient spelling only
+            if syllables and not modern:
+                syllables[-1][2] += consonant
+            continue
+
+        if vowel == SHEVA_POINT:
+            # Vocal at the start of a word and after a silent sheva; silent elsewhere
+            vocal = i == 0 or (i < last and clusters[i - 1][1] == SHEVA_POINT)
+            sound = SHEVA_VOWEL[column] if vocal else ''
+        elif vowel:
+            sound = VOWELS[vowel][column]
+            if following is not None and not following[1] and not following[2]:
+                if following[0] == 'י' and vowel in YOD_MATER_VOWELS:
+                    sound = YOD_MATER_VOWELS[vowel][column]
+                    skip = i + 1
+                elif following[0] == 'ו' and vowel == HOLAM:
+                    skip = i + 1
+        else:
+            sound = ''
+
+        if sound:
+            syllables.append([consonant, sound, ''])
+        else:
+            pending = consonant
+    flush()
+
+    parts = [''.join(syllable) for syllable in syllables]
+    if modern:
+        return ''.join(parts)
+    return '-'.join(part for part in parts if part)
+
+
+def transliterate(hebrew_text: str, mode: str = 'ancient') -> str:
+    """
+    Transliterate pointed Hebrew word by word
+
+    Args:
+        hebrew_text (str): Hebrew text with nikud (cantillation marks are ignored)
+        mode (str): 'ancient' or 'modern'
+
+    Returns:
+        str: Space-separated transliteration, one token per word (maqaf splits words)
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown transliteration mode '{mode}'")
+    words = (render_word(clusters, mode) for clusters in tokenize(hebrew_text))
+    return ' '.join(word for word in words if word)
+
+
+def backfill_transliterations(batch_size: int = 2000) -> int:
+    """
+    Recompute paleo_transliteration and modern_transliteration for every pointed verse
+
+    Verses are read in id order in batches and only rows whose text changed are written, so
+    running it again after a deploy with no transliteration changes writes nothing.
+
+    Returns:
+        int: Number of verses updated
+    """
+    started = time.perf_counter()
+    update = (
+        Verse.__table__.update()
+        .where(Verse.id == bindparam('verse_id'))
+        .values(paleo_transliteration=bindparam('paleo'), modern_transliteration=bindparam('modern'))
+    )
+    columns = (Verse.id, Verse.hebrew_text, Verse.paleo_transliteration, Verse.modern_transliteration)
+
+    last_id = 0
+    scanned = updated = 0
+    while True:
+        rows = db.session.query(*columns).filter(Verse.id > last_id).order_by(Verse.id).limit(batch_size).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        scanned += len(rows)
+
+        changes = []
+        for verse_id, hebrew_text, paleo, modern in rows:
+            if not has_nikud(hebrew_text):
+                continue
+            new_paleo = transliterate(hebrew_text, 'ancient')
+            new_modern = transliterate(hebrew_text, 'modern')
+            if (new_paleo, new_modern) != (paleo, modern):
+                changes.append({'verse_id': verse_id, 'paleo': new_paleo, 'modern': new_modern})
+
+        if changes:
+            db.session.execute(update, changes)
+            db.session.commit()
+            updated += len(changes)
+
+    if updated:
+        bump_generation()
+    logging.info(f"Transliterated {scanned} verses in {time.perf_counter() - started:.1f}s, {updated} updated")
+    return updated
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Nikud-aware transliteration')
+    parser.add_argument('text', nargs='*', help='Pointed Hebrew to transliterate')
+    parser.add_argument('--backfill', action='store_true', help='Recompute verse transliterations')
+    parser.add_argument('--batch-size', type=int, default=2000, help='Verses per batch')
+
+    args = parser.parse_args()
+
+    if args.text:
+        text = ' '.join(args.text)
+        print(f"ancient: {transliterate(text, 'ancient')}")
+        print(f"modern:  {transliterate(text, 'modern')}")
+
+    if args.backfill:
+        from app import app
+
+        with app.app_context():
+            db.create_all()
+            print(f"Updated transliterations of {backfill_transliterations(args.batch_size)} verses")
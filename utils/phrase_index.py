@@ -0,0 +1,189 @@
+"""
+Positional inverted index for phrase and proximity search
+Maps each normalized word to a sorted array('I') of global token offsets built from VerseWord
+"""
+
+import logging
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import List, Optional, Tuple
+
+from models import db, VerseWord
+from utils.data_generation import current_generation
+from utils.hebrew_converter import normalize_hebrew
+
+PHRASE_SEARCH_TYPES = ('phrase', 'near')
+
+MAX_NEAR_DISTANCE = 50
+
+
+class PositionalIndex:
+    """
+    Inverted index over every word token in the corpus.
+
+    Tokens are numbered consecutively in (verse_id, position) order, with one unused offset
+    between verses so consecutive offsets never span a verse boundary.
+    """
+
+    def __init__(self):
+        self.postings = {}  # normalized word -> array('I') of token offsets, ascending
+        self.verse_starts = array('I')  # offset of each verse's first token, ascending
+        self.verse_ids = array('I')  # verse id for each entry in verse_starts
+        self.signature = None
+
+    @classmethod
+    def build(cls, signature=None) -> 'PositionalIndex':
+        """Build the index with one ordered pass over VerseWord"""
+        started = time.time()
+        index = cls()
+        index.signature = signature
+
+        postings = index.postings
+        offset = 0
+        current_verse = None
+
+        rows = (
+            db.session.query(VerseWord.verse_id, VerseWord.normalized)
+            .order_by(VerseWord.verse_id, VerseWord.position)
+            .yield_per(10000)
+        )
+
+        for verse_id, normalized in rows:
+            if verse_id != current_verse:
+                offset += 1  # gap between verses
+                current_verse = verse_id
+                index.verse_starts.append(offset)
+                index.verse_ids.append(verse_id)
+
+            posting = postings.get(normalized)
+            if posting is None:
+                posting = postings[normalized] = array('I')
+            posting.append(offset)
+            offset += 1
+
+        logging.info(f"Built positional index: {offset - len(index.verse_ids)} tokens, "
+                     f"{len(postings)} terms in {time.time() - started:.2f}s")
+        return index
+
+    def verse_at(self, offset: int) -> int:
+        """Verse id that owns a token offset"""
+        return self.verse_ids[bisect_right(self.verse_starts, offset) - 1]
+
+    def _verse_ids_for(self, offsets: List[int]) -> List[int]:
+        verse_ids = []
+        for offset in offsets:
+            verse_id = self.verse_at(offset)
+            if not verse_ids or verse_ids[-1] != verse_id:
+                verse_ids.append(verse_id)
+        return verse_ids
+
+    def phrase(self, terms: List[str]) -> List[int]:
+        """Verse ids containing the terms as consecutive words, in corpus order"""
+        lists = [self.postings.get(term) for term in terms]
+        if not lists or any(posting is None for posting in lists):
+            return []
+
+        # Start from the rarest term and probe the others with binary search
+        order = sorted(range(len(terms)), key=lambda i: len(lists[i]))
+        first = order[0]
+        starts = [offset - first for offset in lists[first]]
+
+        for i in order[1:]:
+            posting = lists[i]
+            size = len(posting)
+            matched = []
+            for start in starts:
+                target = start + i
+                at = bisect_left(posting, target)
+                if at < size and posting[at] == target:
+                    matched.append(start)
+            starts = matched
+            if not starts:
+                return []
+
+        return self._verse_ids_for(starts)
+
+    def near(self, first_term: str, second_term: str, distance: int) -> List[int]:
+        """Verse ids where the two terms occur within distance words of each other"""
+        first = self.postings.get(first_term)
+        second = self.postings.get(second_term)
+        if first is None or second is None:
+            return []
+
+        if len(first) > len(second):
+            first, second = second, first
+
+        matches = []
+        size = len(second)
+        for offset in first:
+            verse_id = self.verse_at(offset)
+            at = bisect_left(second, offset - distance)
+            while at < size and second[at] <= offset + distance:
+                other = second[at]
+                if other != offset and self.verse_at(other) == verse_id:
+                    matches.append(offset)
+                    break
+                at += 1
+
+        return self._verse_ids_for(matches)
+
+
+_index_lock = threading.Lock()
+_index = None
+
+
+def get_phrase_index() -> PositionalIndex:
+    """Process-wide positional index, rebuilt when the data generation changes"""
+    global _index
+
+    signature = current_generation()
+    index = _index
+    if index is not None and index.signature == signature:
+        return index
+
+    with _index_lock:
+        if _index is None or _index.signature != signature:
+            _index = PositionalIndex.build(signature)
+        return _index
+
+
+def invalidate_phrase_index():
+    global _index
+    _index = None
+
+
+def search_positional(query: str, search_type: str, limit: int = 50, cursor: int = 0,
+                      distance: int = 5) -> Tuple[List[int], Optional[int]]:
+    """
+    Phrase or NEAR search over the positional index
+
+    Args:
+        query: Hebrew words (any pointing/final forms)
+        search_type: 'phrase' for consecutive words, 'near' for two words within distance
+        distance: Maximum word distance for 'near'
+
+    Returns:
+        (verse_ids, next_cursor) - next_cursor is None on the last page
+    """
+    terms = normalize_hebrew(query).split()
+    if not terms:
+        return [], None
+
+    index = get_phrase_index()
+
+    if search_type == 'phrase':
+        verse_ids = index.phrase(terms)
+    elif search_type == 'near':
+        if len(terms) != 2:
+            raise ValueError('NEAR search needs exactly two words')
+        if not 1 <= distance <= MAX_NEAR_DISTANCE:
+            raise ValueError(f'distance must be between 1 and {MAX_NEAR_DISTANCE}')
+        verse_ids = index.near(terms[0], terms[1], distance)
+    else:
+        raise ValueError(f"Unknown positional search type '{search_type}'")
+
+    page = verse_ids[cursor:cursor + limit]
+    next_cursor = cursor + limit if cursor + limit < len(verse_ids) else None
+    return page, next_cursor
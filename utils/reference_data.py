@@ -0,0 +1,70 @@
+"""
+Static reference data registry
+The Paleo alphabet and book metadata only change on re-seed, so each worker keeps them in memory,
+indexed for per-character lookups and pre-serialized for the endpoints that return them whole;
+reloaded when the data generation changes
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+from flask import current_app
+
+from models import Book, PaleoLetter
+from utils.data_generation import current_generation
+from utils.verse_context import book_stub
+
+
+class ReferenceData:
+    """PaleoLetter and Book rows as plain dicts, with their JSON bodies"""
+
+    def __init__(self, letters: List[Dict], books: List[Book], generation=None):
+        self.generation = generation
+        self.letters = sorted(letters, key=lambda letter: letter['order'])
+        self.books = [book.to_dict() for book in sorted(books, key=lambda book: book.order)]
+
+        # First row by id wins, as a .first() lookup would return
+        self.letters_by_hebrew = {}
+        self.letters_by_symbol = {}
+        for letter in sorted(letters, key=lambda letter: letter['id']):
+            self.letters_by_hebrew.setdefault(letter['letter'], letter)
+            self.letters_by_symbol.setdefault(letter['paleo_symbol'], letter)
+
+        self.books_by_id = {book['id']: book for book in self.books}
+        self.book_stubs_by_order = {book.order: book_stub(book) for book in books}
+
+        dumps = current_app.json.dumps
+        self.alphabet_json = dumps(self.letters).encode('utf-8')
+        self.letter_json = {letter: dumps(data).encode('utf-8') for letter, data in self.letters_by_hebrew.items()}
+        self.books_json = dumps(self.books).encode('utf-8')
+
+    @classmethod
+    def load(cls, generation=None) -> 'ReferenceData':
+        letters = [letter.to_dict() for letter in PaleoLetter.query.all()]
+        books = Book.query.all()
+        return cls(letters, books, generation)
+
+    def letter(self, hebrew_letter: str) -> Optional[Dict]:
+        return self.letters_by_hebrew.get(hebrew_letter)
+
+    def symbol(self, paleo_symbol: str) -> Optional[Dict]:
+        return self.letters_by_symbol.get(paleo_symbol)
+
+
+_registry_lock = threading.Lock()
+_registry = None
+
+
+def get_reference_data() -> ReferenceData:
+    """Process-wide registry, reloaded when the data generation changes"""
+    global _registry
+
+    generation = current_generation()
+    registry = _registry
+    if registry is not None and registry.generation == generation:
+        return registry
+
+    with _registry_lock:
+        if _registry is None or _registry.generation != generation:
+            _registry = ReferenceData.load(generation)
+        return _registry
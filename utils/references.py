@@ -0,0 +1,359 @@
+"""
+Canonical verse addressing
+Verse.ordinal is book order * 1,000,000 + chapter * 1,000 + verse (BBCCCVVV), so any passage -
+across chapters or books - is one BETWEEN range scan. Also parses references like
+"Gen 1:1-2:3; Ex 20" into ordinal ranges.
+"""
+
+import logging
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, event, inspect, text
+from sqlalchemy.orm import Session
+
+from models import db, Book, Verse
+from data.bible_books import HEBREW_BIBLE_BOOKS
+from utils.data_generation import current_generation
+from utils.verse_fields import verse_load_options
+
+BOOK_FACTOR = 1000000
+CHAPTER_FACTOR = 1000
+LAST = 999  # Verse/chapter number used for "to the end of"
+
+MAX_RANGES = 50
+
+_ASSIGN = ('UPDATE OR IGNORE verse SET ordinal = ('
+           'SELECT book."order" * 1000000 + chapter.chapter_number * 1000 + verse.verse_number '
+           'FROM chapter JOIN book ON book.id = chapter.book_id WHERE chapter.id = verse.chapter_id '
+           f'AND chapter.chapter_number <= {LAST} AND verse.verse_number <= {LAST})')
+_ASSIGN_ALL = text(_ASSIGN)
+_ASSIGN_FOR = text(f'{_ASSIGN} WHERE verse.id IN :ids').bindparams(bindparam('ids', expanding=True))
+
+
+def make_ordinal(book_order: int, chapter_number: int, verse_number: int) -> int:
+    """Ordinal of a verse; chapter and verse numbers must fit their 3 digits (at most LAST)"""
+    if not (0 <= chapter_number <= LAST and 0 <= verse_number <= LAST):
+        raise ValueError(f'Chapter {chapter_number}, verse {verse_number} is out of range for an ordinal')
+    return book_order * BOOK_FACTOR + chapter_number * CHAPTER_FACTOR + verse_number
+
+
+def split_ordinal(ordinal: int) -> Tuple[int, int, int]:
+    """(book_order, chapter_number, verse_number) of an ordinal"""
+    book_order, rest = divmod(ordinal, BOOK_FACTOR)
+    chapter_number, verse_number = divmod(rest, CHAPTER_FACTOR)
+    return book_order, chapter_number, verse_number
+
+
+def assign_ordinals(connection=None, verse_ids: Optional[List[int]] = None, rebuild: bool = False):
+    """
+    Compute Verse.ordinal from book order, chapter and verse number.
+
+    Duplicate verses (same chapter and verse number) keep a NULL ordinal instead of failing
+    the unique index, and are reported.
+    """
+    own_transaction = connection is None
+    if own_transaction:
+        connection = db.session.connection()
+
+    if verse_ids is None:
+        if rebuild:
+            # Clear first so renumbered books/chapters can't collide with stale ordinals
+            connection.execute(text('UPDATE verse SET ordinal = NULL'))
+        connection.execute(_ASSIGN_ALL)
+        unassigned = connection.execute(text('SELECT COUNT(*) FROM verse WHERE ordinal IS NULL')).scalar()
+        if unassigned:
+            logging.warning(f"{unassigned} duplicate verses have no ordinal")
+    elif verse_ids:
+        connection.execute(_ASSIGN_FOR, {'ids': verse_ids})
+
+    if own_transaction:
+        db.session.commit()
+
+
+_DUPLICATE_VERSES = text(
+    'SELECT id FROM verse WHERE id NOT IN (SELECT MIN(id) FROM verse GROUP BY chapter_id, verse_number)'
+)
+
+
+def duplicate_verses_blocking(connection) -> Optional[str]:
+    """Why the unique verse index can't be created yet, or None when there are no duplicate verses"""
+    count = connection.execute(text(f'SELECT COUNT(*) FROM ({_DUPLICATE_VERSES.text})')).scalar()
+    if not count:
+        return None
+    return (f"{count} duplicate verses (same chapter and verse number); remove them with "
+            f"`python -m utils.references --remove-duplicates`")
+
+
+def remove_duplicate_verses(connection=None) -> int:
+    """
+    Delete all but the first (lowest id) row of each chapter and verse number, with their
+    word and root rows, so the unique verse index can be created. Counters are recounted.
+    """
+    own_transaction = connection is None
+    if own_transaction:
+        connection = db.session.connection()
+
+    duplicates = [row[0] for row in connection.execute(_DUPLICATE_VERSES)]
+    if duplicates:
+        from utils.corpus_stats import reconcile_counts
+
+        for table in ('verse_word', 'verse_root'):
+            connection.execute(text(f'DELETE FROM {table} WHERE verse_id IN :ids')
+                               .bindparams(bindparam('ids', expanding=True)), {'ids': duplicates})
+        connection.execute(text('DELETE FROM verse WHERE id IN :ids')
+                           .bindparams(bindparam('ids', expanding=True)), {'ids': duplicates})
+        reconcile_counts(connection)
+        assign_ordinals(connection)
+        logging.warning(f"Removed {len(duplicates)} duplicate verses (ids {duplicates[:20]}"
+                        f"{'...' if len(duplicates) > 20 else ''})")
+
+    if own_transaction:
+        db.session.commit()
+    return len(duplicates)
+
+
+@event.listens_for(Session, 'after_flush')
+def _assign_ordinals_on_flush(session, flush_context):
+    """New or renumbered verses get their ordinal in the same transaction"""
+    verse_ids = [
+        instance.id for instance in session.new | session.dirty
+        if isinstance(instance, Verse) and (
+            instance in session.new
+            or inspect(instance).attrs.verse_number.history.has_changes()
+            or inspect(instance).attrs.chapter_id.history.has_changes()
+        )
+    ]
+    if verse_ids:
+        assign_ordinals(session.connection(), verse_ids)
+
+
+def _key(name: str) -> str:
+    return re.sub(r'[\s.\-]', '', name).lower()
+
+
+def _book_aliases() -> Tuple[Dict[str, Tuple[int, str]], Dict[str, Tuple[int, str]]]:
+    """
+    (exact aliases, full-name keys) mapping to (book order, book name).
+    Names come from the book table so New Testament books resolve too; abbreviations
+    come from data/bible_books.py.
+    """
+    abbreviations = {book['name']: book for book in HEBREW_BIBLE_BOOKS}
+    exact = {}
+    full_names = {}
+
+    for name, hebrew_name, order in db.session.query(Book.name, Book.hebrew_name, Book.order):
+        target = (order, name)
+        names = [name]
+        # "Samuel I" is also written "1 Samuel"
+        numbered = re.fullmatch(r'(.+) (I{1,3})', name)
+        if numbered:
+            names.append(f'{len(numbered.group(2))}{numbered.group(1)}')
+
+        for alias in names:
+            full_names[_key(alias)] = target
+        exact.update({_key(alias): target for alias in names + [hebrew_name]})
+
+        data = abbreviations.get(name)
+        if data:
+            exact[_key(data['abbreviation'])] = target
+            exact[_key(data['hebrew_abbreviation'])] = target
+
+    return exact, full_names
+
+
+_aliases_lock = threading.Lock()
+_aliases = None
+_aliases_generation = None
+
+
+def resolve_book(name: str) -> Tuple[int, str]:
+    """(book order, book name) for a book name, abbreviation or unambiguous prefix"""
+    global _aliases, _aliases_generation
+
+    generation = current_generation()
+    with _aliases_lock:
+        if _aliases is None or _aliases_generation != generation:
+            _aliases = _book_aliases()
+            _aliases_generation = generation
+        exact, full_names = _aliases
+
+    key = _key(name)
+    if key in exact:
+        return exact[key]
+
+    matches = {target for alias, target in full_names.items() if len(key) >= 2 and alias.startswith(key)}
+    if len(matches) == 1:
+        return matches.pop()
+    if matches:
+        candidates = ', '.join(sorted(book_name for _, book_name in matches))
+        raise ValueError(f"Ambiguous book '{name}': {candidates}")
+    raise ValueError(f"Unknown book '{name}'")
+
+
+SEGMENT = re.compile(r'^(?P<book>\d?\s*[^\d]+?)\s*(?P<spec>\d.*)?$')
+SPEC_PART = re.compile(r'(\d+)(?::(\d+))?(?:-(\d+)(?::(\d+))?)?')
+
+
+def _check_numbers(part: str, chapters=(), verses=()):
+    """
+    Reject numbers that would spill into the next chapter or book in an ordinal
+    (a verse of LAST is reserved for "to the end of the chapter")
+    """
+    if (any(chapter is not None and chapter > LAST for chapter in chapters)
+            or any(verse is not None and verse >= LAST for verse in verses)):
+        raise ValueError(f"Chapter or verse number out of range in '{part}'")
+
+
+def _spec_ranges(spec: str) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """((start chapter, verse), (end chapter, verse)) for a spec like '1:1-2:3, 5'"""
+    ranges = []
+    verse_chapter = None  # Chapter that bare numbers refer to after a chapter:verse part
+
+    for part in spec.split(','):
+        part = re.sub(r'\s+', '', part).replace('–', '-')
+        match = SPEC_PART.fullmatch(part)
+        if not match:
+            raise ValueError(f"Invalid reference '{part}'")
+        a, b, c, d = (int(group) if group else None for group in match.groups())
+
+        if verse_chapter is not None and b is None and d is None:
+            # "Gen 1:1, 3-5" -> verses 3-5 of chapter 1
+            _check_numbers(part, verses=(a, c))
+            ranges.append(((verse_chapter, a), (verse_chapter, c if c is not None else a)))
+            continue
+
+        if b is None:
+            _check_numbers(part, chapters=(a, c), verses=(d,))
+        elif d is None:
+            _check_numbers(part, chapters=(a,), verses=(b, c))
+        else:
+            _check_numbers(part, chapters=(a, c), verses=(b, d))
+
+        if b is None:
+            start = (a, 0)
+            end = (c, d) if d is not None else (c if c is not None else a, LAST)
+        else:
+            start = (a, b)
+            if c is None:
+                end = (a, b)
+            elif d is None:
+                end = (a, c)
+            else:
+                end = (c, d)
+
+        verse_chapter = end[0] if (b is not None or d is not None) else None
+        ranges.append((start, end))
+
+    return ranges
+
+
+def format_range(book_name: str, start: int, end: int) -> str:
+    """Readable label for an ordinal range: 'Genesis 1:1-2:3', 'Exodus 20', 'Psalms'"""
+    _, start_chapter, start_verse = split_ordinal(start)
+    _, end_chapter, end_verse = split_ordinal(end)
+
+    if (start_chapter, start_verse) == (0, 0) and (end_chapter, end_verse) == (LAST, LAST):
+        return book_name
+    if start_verse == 0 and end_verse == LAST:
+        chapters = str(start_chapter) if start_chapter == end_chapter else f'{start_chapter}-{end_chapter}'
+        return f'{book_name} {chapters}'
+
+    start_verse = max(start_verse, 1)
+    if start_chapter == end_chapter:
+        verses = str(start_verse) if start_verse == end_verse else f'{start_verse}-{end_verse}'
+        return f'{book_name} {start_chapter}:{verses}'
+    return f'{book_name} {start_chapter}:{start_verse}-{end_chapter}:{end_verse}'
+
+
+def parse_reference(reference: str) -> List[Dict]:
+    """
+    Parse "Gen 1:1-2:3; Ex 20; Ps 23:1,4" into ordinal ranges
+
+    Returns:
+        list: One dict per range with book, reference label, start and end ordinals, in the order given
+    """
+    ranges = []
+
+    for segment in reference.split(';'):
+        segment = segment.strip()
+        if not segment:
+            continue
+        match = SEGMENT.match(segment)
+        if not match:
+            raise ValueError(f"Invalid reference '{segment}'")
+
+        book_order, book_name = resolve_book(match.group('book'))
+        spec = match.group('spec')
+        spans = _spec_ranges(spec) if spec else [((0, 0), (LAST, LAST))]
+
+        for (start_chapter, start_verse), (end_chapter, end_verse) in spans:
+            start = make_ordinal(book_order, start_chapter, start_verse)
+            end = make_ordinal(book_order, end_chapter, end_verse)
+            if start > end:
+                raise ValueError(f"Reference range ends before it starts: '{segment}'")
+            ranges.append({
+                'book': book_name,
+                'reference': format_range(book_name, start, end),
+                'start': start,
+                'end': end
+            })
+
+    if not ranges:
+        raise ValueError('Reference is required')
+    if len(ranges) > MAX_RANGES:
+        raise ValueError(f'At most {MAX_RANGES} ranges per request')
+    return ranges
+
+
+def passage_verses(start: int, end: int, fields: Optional[Tuple[str, ...]] = None, batch_size: int = 500):
+    """Verses with ordinals in [start, end], in canonical order, loaded in batches"""
+    return (Verse.query.filter(Verse.ordinal.between(start, end))
+            .options(*verse_load_options(fields))
+            .order_by(Verse.ordinal)
+            .yield_per(batch_size))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Canonical verse ordinals')
+    parser.add_argument('--assign', action='store_true', help='Recompute ordinals for every verse')
+    parser.add_argument('--parse', help='Print the ordinal ranges of a reference')
+    parser.add_argument('--check', action='store_true',
+                        help='Report duplicate verses; exits with status 1 when they block the unique verse index')
+    parser.add_argument('--remove-duplicates', action='store_true',
+                        help='Delete duplicate verses and create the unique verse index')
+
+    args = parser.parse_args()
+
+    from app import app
+    from utils.schema import upgrade_schema
+
+    with app.app_context():
+        upgrade_schema()
+        if args.check:
+            import sys
+
+            with db.engine.connect() as connection:
+                blocked = duplicate_verses_blocking(connection)
+            if blocked:
+                print(f"Unique verse index can't be built: {blocked}")
+                sys.exit(1)
+            print("No duplicate verses")
+        if args.remove_duplicates:
+            from utils.corpus_stats import refresh_all_stats
+            from utils.data_generation import bump_generation
+            from utils.schema import ensure_indexes
+
+            print(f"Removed {remove_duplicate_verses()} duplicate verses")
+            with db.engine.begin() as connection:
+                print(f"Created indexes {ensure_indexes(connection, Verse, ['uq_verse_chapter_verse'])}")
+            refresh_all_stats()
+            bump_generation()
+        if args.assign:
+            assign_ordinals(rebuild=True)
+        if args.parse:
+            for passage in parse_reference(args.parse):
+                print(passage)
@@ -0,0 +1,115 @@
+"""
+Root (shoresh) index
+Precomputes root -> verse rows from the word index so a root query is a single index lookup
+"""
+
+import logging
+from typing import List, Optional, Tuple
+
+from models import db, Chapter, Verse, VerseRoot, VerseWord
+from utils.hebrew_converter import normalize_hebrew
+from utils.hebrew_morphology import ROOT_LENGTHS, candidate_roots
+
+
+def _index_roots(word_rows, batch_size: int = 20000) -> int:
+    """Write VerseRoot rows for (verse_id, normalized_word) pairs ordered by verse_id"""
+    roots_by_word = {}
+    batch = []
+    written = 0
+    current_verse = None
+    verse_roots = set()
+
+    def flush_verse():
+        for root in verse_roots:
+            batch.append({'root': root, 'verse_id': current_verse})
+        verse_roots.clear()
+
+    for verse_id, normalized in word_rows:
+        if verse_id != current_verse:
+            flush_verse()
+            current_verse = verse_id
+            if len(batch) >= batch_size:
+                db.session.execute(VerseRoot.__table__.insert().prefix_with('OR IGNORE'), batch)
+                written += len(batch)
+                batch = []
+
+        roots = roots_by_word.get(normalized)
+        if roots is None:
+            roots = roots_by_word[normalized] = candidate_roots(normalized)
+        verse_roots.update(roots)
+
+    flush_verse()
+    if batch:
+        db.session.execute(VerseRoot.__table__.insert().prefix_with('OR IGNORE'), batch)
+        written += len(batch)
+
+    return written
+
+
+def _words_without_roots(book_id: Optional[int] = None):
+    query = db.session.query(VerseWord.verse_id, VerseWord.normalized).filter(
+        ~db.exists().where(VerseRoot.verse_id == VerseWord.verse_id)
+    )
+    if book_id is not None:
+        query = (query.join(Verse, Verse.id == VerseWord.verse_id)
+                 .join(Chapter, Verse.chapter_id == Chapter.id)
+                 .filter(Chapter.book_id == book_id))
+    return query.order_by(VerseWord.verse_id)
+
+
+def index_book_roots(book_id: int) -> int:
+    """Importer stage: index roots for a book's verses (runs after the word index stage)"""
+    written = _index_roots(_words_without_roots(book_id).all())
+    db.session.commit()
+    return written
+
+
+def backfill_verse_roots(rebuild: bool = False) -> int:
+    """Build root rows for an existing database from VerseWord"""
+    if rebuild:
+        db.session.execute(VerseRoot.__table__.delete())
+        db.session.commit()
+
+    written = _index_roots(_words_without_roots().all())
+    db.session.commit()
+    logging.info(f"Indexed {written} verse roots")
+    return written
+
+
+def search_root(query: str, limit: int = 50, cursor: int = 0) -> Tuple[List[int], Optional[int]]:
+    """
+    Verses containing any inflected form of a 2-3 letter root, in verse order
+
+    Returns:
+        (verse_ids, next_cursor) - next_cursor is None on the last page
+    """
+    root = normalize_hebrew(query).replace(' ', '')
+    if len(root) not in ROOT_LENGTHS:
+        raise ValueError('A root must have 2 or 3 Hebrew letters')
+
+    verse_ids = [
+        row[0] for row in db.session.query(VerseRoot.verse_id)
+        .filter(VerseRoot.root == root)
+        .order_by(VerseRoot.verse_id)
+        .offset(cursor).limit(limit + 1)
+    ]
+
+    next_cursor = cursor + limit if len(verse_ids) > limit else None
+    return verse_ids[:limit], next_cursor
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Verse root index')
+    parser.add_argument('--backfill', action='store_true', help='Index verses that have no root rows')
+    parser.add_argument('--rebuild', action='store_true', help='Drop and rebuild all root rows')
+
+    args = parser.parse_args()
+
+    from app import app
+
+    with app.app_context():
+        db.create_all()
+        if args.backfill or args.rebuild:
+            print(f"Wrote {backfill_verse_roots(rebuild=args.rebuild)} root rows")
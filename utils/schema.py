@@ -0,0 +1,186 @@
+"""
+Schema upgrades for existing databases
+db.create_all() only creates missing tables, so columns added to existing models are applied here
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.exc import OperationalError
+
+
+def ensure_columns(connection, model, column_names: List[str]) -> List[str]:
+    """
+    Add model columns that are missing from an existing table, plus any indexes on them.
+
+    Args:
+        connection: SQLAlchemy connection (inside a transaction)
+        model: Model class whose table should be upgraded
+        column_names: Columns to check
+
+    Returns:
+        list: Names of the columns that were added
+    """
+    table = model.__table__
+    inspector = inspect(connection)
+
+    if not inspector.has_table(table.name):
+        table.create(connection)
+        return []
+
+    existing = {column['name'] for column in inspector.get_columns(table.name)}
+    added = []
+
+    for name in column_names:
+        if name in existing:
+            continue
+
+        column = table.columns[name]
+        ddl = f'ALTER TABLE {table.name} ADD COLUMN {name} {column.type.compile(dialect=connection.dialect)}'
+        if column.server_default is not None:
+            ddl += f' DEFAULT {column.server_default.arg}'
+        connection.exec_driver_sql(ddl)
+        added.append(name)
+
+    for index in table.indexes:
+        if any(column.name in added for column in index.columns):
+            index.create(connection, checkfirst=True)
+
+    return added
+
+
+def ensure_indexes(connection, model, index_names: List[str],
+                   checks: Optional[Dict[str, Callable]] = None) -> List[str]:
+    """
+    Create named model indexes that are missing from an existing table.
+    Looked up by name, since expression indexes can't be reflected.
+
+    Args:
+        checks: Index name -> check(connection) returning why the index can't be created yet
+            (e.g. rows a new unique index would reject), or None; blocked indexes are skipped
+
+    Returns:
+        list: Names of the indexes that were created
+    """
+    existing = {row[0] for row in connection.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'index'"
+    )}
+    created = []
+
+    for index in model.__table__.indexes:
+        if index.name in index_names and index.name not in existing:
+            blocked = checks[index.name](connection) if checks and index.name in checks else None
+            if blocked:
+                logging.warning(f"Not creating index {index.name}: {blocked}")
+                continue
+            index.create(connection)
+            created.append(index.name)
+
+    return created
+
+
+# Columns added to existing models since the first release: (model, [column names])
+def _upgrades():
+    from models import Book, Chapter, Verse, VerseWord
+    return [
+        (Book, ['chapter_count']),
+        (Chapter, ['verse_count']),
+        (Verse, ['hebrew_normalized', 'gematria', 'ordinal']),
+        (VerseWord, ['gematria']),
+    ]
+
+
+# Indexes added to existing tables since the first release: (model, [index names])
+def _index_upgrades():
+    from models import StrongsHebrew, StrongsGreek, Verse
+    return [
+        (Verse, ['uq_verse_chapter_verse']),
+        (StrongsHebrew, ['ix_strongs_hebrew_numeric']),
+        (StrongsGreek, ['ix_strongs_greek_numeric']),
+    ]
+
+
+# Unique indexes existing rows may violate: name -> check(connection) (see ensure_indexes)
+def _index_checks():
+    from utils.references import duplicate_verses_blocking
+    return {
+        'uq_verse_chapter_verse': duplicate_verses_blocking,
+    }
+
+
+# Columns whose existing rows must be filled when the column is added: name -> fill(connection)
+def _backfills():
+    from utils.corpus_stats import reconcile_counts
+    from utils.references import assign_ordinals
+    return {
+        'chapter_count': reconcile_counts,
+        'verse_count': reconcile_counts,
+        'ordinal': assign_ordinals,
+    }
+
+
+def _pending_upgrades(connection) -> List[str]:
+    """Columns and indexes from the upgrade lists that the database still lacks"""
+    inspector = inspect(connection)
+    pending = []
+    for model, column_names in _upgrades():
+        table = model.__table__.name
+        existing = ({column['name'] for column in inspector.get_columns(table)}
+                    if inspector.has_table(table) else set())
+        pending.extend(f'{table}.{name}' for name in column_names if name not in existing)
+
+    indexes = {row[0] for row in connection.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'index'"
+    )}
+    for model, index_names in _index_upgrades():
+        pending.extend(name for name in index_names if name not in indexes)
+    return pending
+
+
+_upgrade_lock = threading.Lock()
+_upgraded = False
+
+
+def upgrade_schema():
+    """Create missing tables and add missing columns once per process"""
+    global _upgraded
+
+    with _upgrade_lock:
+        if _upgraded:
+            return
+
+        from models import db
+
+        db.create_all()
+        try:
+            with db.engine.begin() as connection:
+                added = []
+                for model, column_names in _upgrades():
+                    added_to_table = ensure_columns(connection, model, column_names)
+                    if added_to_table:
+                        logging.info(f"Added columns {added_to_table} to {model.__table__.name}")
+                        added.extend(added_to_table)
+
+                checks = _index_checks()
+                for model, index_names in _index_upgrades():
+                    created = ensure_indexes(connection, model, index_names, checks)
+                    if created:
+                        logging.info(f"Created indexes {created} on {model.__table__.name}")
+
+                # Fill the new columns from the existing rows
+                backfills = _backfills()
+                for fill in dict.fromkeys(backfills[name] for name in added if name in backfills):
+                    fill(connection)
+        except OperationalError as e:
+            # Another worker may have applied the same upgrade first; anything else (a locked
+            # database, a failed backfill) leaves the upgrade pending and it is retried next time
+            with db.engine.connect() as connection:
+                pending = _pending_upgrades(connection)
+            if pending:
+                logging.error(f"Schema upgrade failed, {pending} still missing: {e}")
+                return
+            logging.info("Schema upgrade already applied by another process")
+
+        _upgraded = True
@@ -0,0 +1,228 @@
+"""
+Full-text search index for verses
+Keeps an SQLite FTS5 table in sync with the verse table and answers ranked, paginated searches
+"""
+
+import logging
+import re
+import threading
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event, text
+
+from models import db, Verse
+from utils.hebrew_converter import convert_many, normalize_hebrew
+from utils.schema import ensure_columns
+
+FTS_TABLE = 'verse_fts'
+
+# Verse columns mirrored into the index, keyed by the /api/search type that targets them.
+# Hebrew is indexed in its normalized form so pointed, unpointed and final-form spellings match.
+SEARCH_COLUMNS = {
+    'hebrew': 'hebrew_normalized',
+    'paleo': 'paleo_text',
+    'english': 'english_translation',
+    'transliteration': 'paleo_transliteration',
+}
+
+INDEXED_COLUMNS = list(SEARCH_COLUMNS.values())
+
+# Characters that separate search terms (whitespace, maqaf, sof pasuq, paseq and FTS5 syntax)
+TERM_SEPARATORS = re.compile(r'[\s־׃׀"*:^(){}+\-]+')
+
+_index_lock = threading.Lock()
+_index_ready = False
+
+
+def _create_statements() -> List[str]:
+    """DDL for the FTS5 table and the triggers that keep it in sync with verse"""
+    columns = ', '.join(INDEXED_COLUMNS)
+    new_values = ', '.join(f'new.{column}' for column in INDEXED_COLUMNS)
+    old_values = ', '.join(f'old.{column}' for column in INDEXED_COLUMNS)
+
+    return [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+            {columns},
+            content='verse', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )""",
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON verse BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON verse BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {columns} ON verse BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values});
+        END""",
+    ]
+
+
+def _drop_statements() -> List[str]:
+    return [
+        f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+        f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+        f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+        f'DROP TABLE IF EXISTS {FTS_TABLE}',
+    ]
+
+
+@event.listens_for(Verse.__table__, 'after_create')
+def _create_index_with_verse_table(target, connection, **kw):
+    """Create the index alongside the verse table so db.create_all() covers new databases"""
+    if connection.dialect.name != 'sqlite':
+        return
+    for statement in _create_statements():
+        connection.exec_driver_sql(statement)
+
+
+def _index_columns(connection) -> List[str]:
+    rows = connection.exec_driver_sql(f'PRAGMA table_info({FTS_TABLE})').fetchall()
+    return [row[1] for row in rows]
+
+
+def ensure_search_index():
+    """
+    Make sure the FTS5 table and its triggers exist and match INDEXED_COLUMNS.
+    Databases created before the index existed (or with an older column set) are rebuilt once.
+    """
+    global _index_ready
+
+    with _index_lock:
+        if _index_ready:
+            return
+
+        with db.engine.begin() as connection:
+            _ensure_normalized_column(connection)
+            existing = _index_columns(connection)
+            if existing != INDEXED_COLUMNS:
+                if existing:
+                    logging.info(f"Search index columns changed ({existing} -> {INDEXED_COLUMNS}), rebuilding")
+                _rebuild(connection)
+            else:
+                for statement in _create_statements():
+                    connection.exec_driver_sql(statement)
+
+        _index_ready = True
+
+
+def _ensure_normalized_column(connection):
+    """Add and fill verse.hebrew_normalized on databases created before it existed"""
+    ensure_columns(connection, Verse, ['hebrew_normalized'])
+    backfill_normalized_hebrew(connection)
+
+
+def backfill_normalized_hebrew(connection, batch_size: int = 2000) -> int:
+    """Compute hebrew_normalized for verses that don't have it yet"""
+    rows = connection.exec_driver_sql(
+        'SELECT id, hebrew_text FROM verse WHERE hebrew_normalized IS NULL'
+    ).fetchall()
+
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        normalized = convert_many((hebrew_text for _, hebrew_text in batch), normalize_hebrew)
+        connection.execute(
+            text('UPDATE verse SET hebrew_normalized = :normalized WHERE id = :id'),
+            [{'id': verse_id, 'normalized': value} for (verse_id, _), value in zip(batch, normalized)]
+        )
+
+    if rows:
+        logging.info(f"Normalized Hebrew search text for {len(rows)} verses")
+    return len(rows)
+
+
+def _rebuild(connection):
+    for statement in _drop_statements():
+        connection.exec_driver_sql(statement)
+    for statement in _create_statements():
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+
+def rebuild_search_index():
+    """Drop and rebuild the search index from the verse table"""
+    global _index_ready
+
+    with _index_lock:
+        with db.engine.begin() as connection:
+            _ensure_normalized_column(connection)
+            _rebuild(connection)
+            indexed = connection.exec_driver_sql(f'SELECT COUNT(*) FROM {FTS_TABLE}').scalar()
+        _index_ready = True
+
+    logging.info(f"Search index rebuilt with {indexed} verses")
+    return indexed
+
+
+def optimize_search_index():
+    """Merge the index b-trees after a large import"""
+    ensure_search_index()
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+
+def build_match_expression(query: str, search_type: str = 'all') -> Optional[str]:
+    """
+    Turn a user query into an FTS5 MATCH expression.
+    Every term must match (as a prefix) in one of the columns selected by search_type.
+    The query is normalized like hebrew_normalized, so any spelling variant answers in one lookup.
+    """
+    if search_type == 'all':
+        columns = INDEXED_COLUMNS
+    elif search_type in SEARCH_COLUMNS:
+        columns = [SEARCH_COLUMNS[search_type]]
+    else:
+        raise ValueError(f"Unknown search type '{search_type}'")
+
+    terms = [term for term in TERM_SEPARATORS.split(normalize_hebrew(query)) if term]
+    if not terms:
+        return None
+
+    phrase = ' AND '.join(f'"{term}"*' for term in terms)
+    return f"{{{' '.join(columns)}}} : ({phrase})"
+
+
+def search_verse_ids(query: str, search_type: str = 'all', limit: int = 50,
+                     cursor: int = 0) -> Tuple[List[int], Optional[int]]:
+    """
+    Find verse ids matching query, best BM25 rank first.
+
+    Returns:
+        (verse_ids, next_cursor) - next_cursor is None on the last page
+    """
+    match = build_match_expression(query, search_type)
+    if match is None:
+        return [], None
+
+    ensure_search_index()
+
+    rows = db.session.execute(
+        text(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match '
+             f'ORDER BY rank LIMIT :limit OFFSET :offset'),
+        {'match': match, 'limit': limit + 1, 'offset': cursor}
+    ).fetchall()
+
+    verse_ids = [row[0] for row in rows[:limit]]
+    next_cursor = cursor + limit if len(rows) > limit else None
+    return verse_ids, next_cursor
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Verse full-text search index')
+    parser.add_argument('--rebuild', action='store_true', help='Drop and rebuild the index from the verse table')
+    parser.add_argument('--optimize', action='store_true', help='Merge index segments')
+
+    args = parser.parse_args()
+
+    from app import app
+
+    with app.app_context():
+        if args.rebuild:
+            print(f"Indexed {rebuild_search_index()} verses")
+        if args.optimize:
+            optimize_search_index()
+            print("Search index optimized")
@@ -0,0 +1,251 @@
+"""
+Strong's concordance index
+Numeric keyset pagination over Strong's numbers (H2 before H10), FTS5 search over the definitions,
+and PaleoDictionary enrichment in one query per page
+"""
+
+import logging
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, event, literal_column, or_, text
+
+from models import db, StrongsHebrew, StrongsGreek, PaleoDictionary
+from utils.hebrew_converter import normalize_hebrew
+from utils.lexicon import get_lexicon
+
+LANGUAGES = {
+    'hebrew': StrongsHebrew,
+    'greek': StrongsGreek,
+}
+
+NUMBER_PREFIXES = {
+    StrongsHebrew: 'H',
+    StrongsGreek: 'G',
+}
+
+# Columns mirrored into each FTS5 table (English and Latin-script text; Hebrew and Greek
+# words are matched separately because the tokenizer splits on their combining marks)
+INDEXED_COLUMNS = ['short_definition', 'long_definition', 'transliteration']
+
+NUMBER_TERM = re.compile(r'([HG])?0*(\d+)[a-z]?', re.IGNORECASE)
+HEBREW_LETTERS = re.compile(r'[א-ת]')
+GREEK_LETTERS = re.compile(r'[Ͱ-Ͽἀ-῿]')
+TERM_SEPARATORS = re.compile(r'[^\w]+')
+
+_index_lock = threading.Lock()
+_index_ready = False
+
+
+def fts_table(model) -> str:
+    return f'{model.__tablename__}_fts'
+
+
+def numeric_key(model):
+    """CAST(substr(strong_number, 2) AS INTEGER), written exactly as in the expression index on the table"""
+    return literal_column(f'CAST(substr({model.__tablename__}.strong_number, 2) AS INTEGER)')
+
+
+def _create_statements(model) -> List[str]:
+    """DDL for a Strong's FTS5 table and the triggers that keep it in sync"""
+    table = model.__tablename__
+    fts = fts_table(model)
+    columns = ', '.join(INDEXED_COLUMNS)
+    new_values = ', '.join(f'new.{column}' for column in INDEXED_COLUMNS)
+    old_values = ', '.join(f'old.{column}' for column in INDEXED_COLUMNS)
+
+    return [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {columns},
+            content='{table}', content_rowid='id',
+            tokenize='porter unicode61 remove_diacritics 2'
+        )""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {columns} ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values});
+        END""",
+    ]
+
+
+def _create_index_with_table(model):
+    @event.listens_for(model.__table__, 'after_create')
+    def _create(target, connection, **kw):
+        """Create the index alongside the table so db.create_all() covers new databases"""
+        if connection.dialect.name != 'sqlite':
+            return
+        for statement in _create_statements(model):
+            connection.exec_driver_sql(statement)
+
+
+for _model in LANGUAGES.values():
+    _create_index_with_table(_model)
+
+
+def ensure_strongs_index():
+    """Create the FTS5 tables on databases created before they existed and fill them once"""
+    global _index_ready
+
+    with _index_lock:
+        if _index_ready:
+            return
+
+        with db.engine.begin() as connection:
+            for model in LANGUAGES.values():
+                fts = fts_table(model)
+                exists = connection.exec_driver_sql(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+                ).first()
+                for statement in _create_statements(model):
+                    connection.exec_driver_sql(statement)
+                if not exists:
+                    connection.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+                    logging.info(f"Built {fts} search index")
+
+        _index_ready = True
+
+
+def rebuild_strongs_index():
+    """Rebuild both FTS5 tables from the Strong's tables"""
+    ensure_strongs_index()
+    with db.engine.begin() as connection:
+        for model in LANGUAGES.values():
+            fts = fts_table(model)
+            connection.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            connection.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('optimize')")
+
+
+def parse_cursor(cursor: Optional[str]) -> Optional[Tuple[int, str]]:
+    """(numeric key, strong_number) of a page cursor such as 'H100'"""
+    if not cursor:
+        return None
+    match = NUMBER_TERM.fullmatch(cursor)
+    if not match or not match.group(1):
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    return int(match.group(2)), cursor[0].upper() + cursor[1:]
+
+
+def _search_filter(model, search_term: str):
+    """
+    Filter for a search term, or False when the term cannot match this language.
+    Numbers match exactly, Hebrew words through the lexicon's consonantal forms, Greek words
+    by substring, and anything else through the FTS index.
+    """
+    number = NUMBER_TERM.fullmatch(search_term)
+    if number:
+        prefix = NUMBER_PREFIXES[model]
+        if number.group(1) and number.group(1).upper() != prefix:
+            return False
+        # '430', 'H430' and 'h0430' all mean H430; a lettered variant like H430a also matches itself
+        return model.strong_number.in_({f'{prefix}{number.group(2)}', prefix + search_term.lstrip('HGhg')})
+
+    if HEBREW_LETTERS.search(search_term):
+        if model is not StrongsHebrew:
+            return False
+        fragment = normalize_hebrew(search_term)
+        numbers = [entry.strong_number for entry in get_lexicon().entries if fragment in entry.normalized]
+        return model.strong_number.in_(numbers)
+
+    if GREEK_LETTERS.search(search_term):
+        if model is not StrongsGreek:
+            return False
+        return model.greek_word.ilike(f'%{search_term}%')
+
+    terms = [term for term in TERM_SEPARATORS.split(search_term) if term]
+    if not terms:
+        return None
+    ensure_strongs_index()
+    fts = fts_table(model)
+    match = ' AND '.join(f'"{term}"*' for term in terms)
+    return model.id.in_(text(f'SELECT rowid FROM {fts} WHERE {fts} MATCH :match').bindparams(match=match))
+
+
+def _root_meanings(strong_numbers: List[str]) -> Dict[str, Dict]:
+    """PaleoDictionary root meanings for a page of Strong's numbers, in one query"""
+    if not strong_numbers:
+        return {}
+
+    rows = (db.session.query(PaleoDictionary.strong_number, PaleoDictionary.paleo_word,
+                             PaleoDictionary.pictographic_analysis, PaleoDictionary.original_concept,
+                             PaleoDictionary.formation_explanation)
+            .filter(PaleoDictionary.strong_number.in_(strong_numbers))
+            .order_by(PaleoDictionary.id))
+
+    meanings = {}
+    for strong_number, paleo_word, pictographic_analysis, original_concept, formation_explanation in rows:
+        # First entry per number, as a .first() lookup would return
+        meanings.setdefault(strong_number, {
+            'paleo_word': paleo_word,
+            'pictographic_analysis': pictographic_analysis,
+            'original_concept': original_concept,
+            'formation_explanation': formation_explanation
+        })
+    return meanings
+
+
+def strongs_page(language: str, search_term: str = '', limit: int = 100,
+                 cursor: Optional[str] = None) -> Tuple[Dict[str, Dict], Optional[str]]:
+    """
+    One page of Strong's entries in numeric order
+
+    Args:
+        language: 'hebrew' or 'greek'
+        search_term: Optional number, Hebrew/Greek word, or English/transliteration terms
+        limit: Page size
+        cursor: Strong's number of the last entry of the previous page
+
+    Returns:
+        (entries keyed by Strong's number, next_cursor) - next_cursor is None on the last page
+    """
+    model = LANGUAGES[language]
+    key = numeric_key(model)
+    query = model.query
+
+    if search_term:
+        condition = _search_filter(model, search_term)
+        if condition is False:
+            return {}, None
+        if condition is not None:
+            query = query.filter(condition)
+
+    after = parse_cursor(cursor)
+    if after:
+        number, strong_number = after
+        # Written as a range on the leading index column so SQLite seeks instead of scanning
+        query = query.filter(key >= number, or_(key > number, and_(key == number, model.strong_number > strong_number)))
+
+    rows = query.order_by(key, model.strong_number).limit(limit + 1).all()
+    page = rows[:limit]
+
+    entries = {entry.strong_number: entry.to_dict() for entry in page}
+    if model is StrongsHebrew:
+        meanings = _root_meanings(list(entries))
+        for strong_number, entry_dict in entries.items():
+            entry_dict['root_meaning'] = meanings.get(strong_number)
+
+    next_cursor = page[-1].strong_number if len(rows) > limit else None
+    return entries, next_cursor
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Strong's concordance search index")
+    parser.add_argument('--rebuild', action='store_true', help="Rebuild the FTS tables from the Strong's tables")
+
+    args = parser.parse_args()
+
+    from app import app
+    from utils.schema import upgrade_schema
+
+    with app.app_context():
+        upgrade_schema()
+        if args.rebuild:
+            rebuild_strongs_index()
+            print("Strong's search index rebuilt")
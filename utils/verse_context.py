@@ -0,0 +1,69 @@
+"""
+Result hydration for verse lists
+Resolves verses together with their book and chapter context in a single joined query
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from models import db, Book, Chapter, Verse
+from utils.verse_fields import verse_load_options
+
+
+def book_stub(book: Book) -> Dict:
+    """Compact book reference used inside verse results (no chapter collection)"""
+    return {
+        'id': book.id,
+        'name': book.name,
+        'hebrew_name': book.hebrew_name,
+        'paleo_name': book.paleo_name,
+        'order': book.order,
+        'testament': book.testament
+    }
+
+
+def chapter_stub(chapter: Chapter) -> Dict:
+    """Compact chapter reference used inside verse results (no verse collection)"""
+    return {
+        'id': chapter.id,
+        'book_id': chapter.book_id,
+        'chapter_number': chapter.chapter_number
+    }
+
+
+def hydrate_verses(verse_ids: List[int], fields: Optional[Tuple[str, ...]] = None) -> List[Dict]:
+    """
+    Load verses by id with book and chapter stubs attached.
+
+    Issues exactly one query regardless of how many verses or chapters are involved,
+    and returns the verses in the order of verse_ids. With fields, only those verse
+    columns are loaded and returned.
+    """
+    if not verse_ids:
+        return []
+
+    rows = (
+        db.session.query(Verse, Chapter, Book)
+        .join(Chapter, Verse.chapter_id == Chapter.id)
+        .join(Book, Chapter.book_id == Book.id)
+        .filter(Verse.id.in_(verse_ids))
+        .options(*verse_load_options(fields))
+        .all()
+    )
+
+    # Chapters and books repeat across hits, so build each stub once
+    chapter_stubs = {}
+    book_stubs = {}
+    hydrated = {}
+
+    for verse, chapter, book in rows:
+        if chapter.id not in chapter_stubs:
+            chapter_stubs[chapter.id] = chapter_stub(chapter)
+        if book.id not in book_stubs:
+            book_stubs[book.id] = book_stub(book)
+
+        verse_data = verse.to_dict(fields)
+        verse_data['book'] = book_stubs[book.id]
+        verse_data['chapter'] = chapter_stubs[chapter.id]
+        hydrated[verse.id] = verse_data
+
+    return [hydrated[verse_id] for verse_id in verse_ids if verse_id in hydrated]
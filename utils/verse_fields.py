@@ -0,0 +1,78 @@
+"""
+Verse field projection and compact encoding
+Parses fields= / format= request parameters into SQLAlchemy load options and encodes verse lists
+as a columns + rows table
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import load_only
+
+from models import Verse
+
+# Always returned so clients can key and order verses
+KEY_FIELDS = ('id', 'verse_number')
+
+# Always loaded (small integers used for joins and references) even when not returned
+LOADED_FIELDS = ('chapter_id', 'ordinal')
+
+# Named groups of related fields
+FIELD_GROUPS = {
+    'hebrew': ('hebrew_text', 'hebrew_consonantal'),
+    'paleo': ('paleo_text', 'paleo_transliteration'),
+    'transliterations': ('paleo_transliteration', 'modern_transliteration'),
+    'translations': ('english_translation', 'literal_translation'),
+    'english': ('english_translation',),
+    'study': ('strong_numbers', 'morphology', 'notes'),
+}
+
+FORMATS = ('objects', 'compact')
+
+
+def parse_fields(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Fields requested by a comma-separated fields= parameter (field names or group names)
+
+    Returns:
+        tuple: Requested fields plus KEY_FIELDS in Verse.FIELDS order, or None for every field
+    """
+    if not value:
+        return None
+
+    requested = set(KEY_FIELDS)
+    for name in (part.strip() for part in value.split(',')):
+        if not name:
+            continue
+        if name in FIELD_GROUPS:
+            requested.update(FIELD_GROUPS[name])
+        elif name in Verse.FIELDS:
+            requested.add(name)
+        else:
+            raise ValueError(f"Unknown field '{name}'")
+
+    return tuple(field for field in Verse.FIELDS if field in requested)
+
+
+def parse_format(value: Optional[str]) -> str:
+    value = value or 'objects'
+    if value not in FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(FORMATS)}")
+    return value
+
+
+def verse_load_options(fields: Optional[Tuple[str, ...]]) -> List:
+    """Query options that load only the projected Verse columns"""
+    if fields is None:
+        return []
+    columns = dict.fromkeys(fields + LOADED_FIELDS)
+    return [load_only(*(getattr(Verse, field) for field in columns))]
+
+
+def encode_compact(records: List[Dict], columns: Optional[List[str]] = None) -> Dict:
+    """[{a: 1, b: 2}, ...] -> {'columns': ['a', 'b'], 'rows': [[1, 2], ...]}"""
+    if columns is None:
+        columns = list(records[0]) if records else []
+    return {
+        'columns': columns,
+        'rows': [[record.get(column) for column in columns] for record in records]
+    }
@@ -0,0 +1,213 @@
+"""
+Morphological word analyzer
+Splits a Hebrew word into proclitic prefixes, stem and suffix with the affix tries and ranks the
+splits against the in-memory Strong's lexicon, and builds the pictographic word report served by
+the analyze endpoints; results are memoized per surface form
+"""
+
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from utils.hebrew_converter import hebrew_to_paleo, normalize_hebrew, remove_nikud
+from utils.hebrew_morphology import segmentations
+from utils.lexicon import Lexicon, LexiconEntry, get_lexicon
+from utils.reference_data import get_reference_data
+
+CACHE_SIZE = 65536
+REPORT_CACHE_SIZE = 8192
+
+# Distinct words analyzed per batch request
+MAX_BATCH_WORDS = 2000
+
+# Meaning of each proclitic letter, for literal glosses
+PREFIX_GLOSSES = {
+    'ו': 'and',
+    'ה': 'the',
+    'ב': 'in',
+    'כ': 'like',
+    'ל': 'to',
+    'מ': 'from',
+    'ש': 'that',
+}
+
+
+class Segmentation(NamedTuple):
+    prefix: str
+    stem: str
+    suffix: str
+    entries: Tuple[LexiconEntry, ...]  # Lexicon entries for the stem, most used first
+
+    @property
+    def entry(self) -> Optional[LexiconEntry]:
+        return self.entries[0] if self.entries else None
+
+    def to_dict(self) -> Dict:
+        return {
+            'prefix': self.prefix,
+            'stem': self.stem,
+            'suffix': self.suffix,
+            'strong_numbers': [entry.strong_number for entry in self.entries]
+        }
+
+
+def _rank(prefix: str, stem: str, suffix: str) -> Tuple[int, int]:
+    """Longest stem first, then fewest affix letters"""
+    return -len(stem), len(prefix) + len(suffix)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _analyze(normalized_word: str, lexicon: Lexicon) -> Tuple[Segmentation, ...]:
+    analyses = []
+    for prefix, stem, suffix in sorted(segmentations(normalized_word), key=lambda split: _rank(*split)):
+        entries = lexicon.normalized(stem)
+        if entries:
+            entries = sorted(entries, key=lambda entry: -(entry.usage_count or 0))
+            analyses.append(Segmentation(prefix, stem, suffix, tuple(entries)))
+    return tuple(analyses)
+
+
+_cache_lock = threading.Lock()
+_cache_lexicon = None
+
+
+def _current_lexicon() -> Lexicon:
+    """The lexicon, clearing memoized results whenever it has been reloaded"""
+    global _cache_lexicon
+
+    lexicon = get_lexicon()
+    if lexicon is not _cache_lexicon:
+        # Memoized results hold entries of the previous data generation
+        with _cache_lock:
+            if lexicon is not _cache_lexicon:
+                _analyze.cache_clear()
+                _report.cache_clear()
+                _cache_lexicon = lexicon
+    return lexicon
+
+
+def analyze_word(word: str) -> Tuple[Segmentation, ...]:
+    """
+    Lexicon-backed segmentations of a word, best first
+
+    Args:
+        word (str): Hebrew word with or without nikud and final forms
+
+    Returns:
+        tuple: Segmentations whose stem is in the lexicon; empty when none is
+    """
+    return _analyze(normalize_hebrew(word), _current_lexicon())
+
+
+def best_segmentation(word: str) -> Optional[Segmentation]:
+    analyses = analyze_word(word)
+    return analyses[0] if analyses else None
+
+
+def strong_number_for(word: str) -> Optional[str]:
+    """Strong's number of the best segmentation of a word, if any"""
+    segmentation = best_segmentation(word)
+    return segmentation.entry.strong_number if segmentation else None
+
+
+def literal_gloss(word: str) -> Optional[str]:
+    """Hyphenated word-for-word gloss such as 'and-the-earth', or None when the stem is unknown"""
+    segmentation = best_segmentation(word)
+    if not segmentation or not segmentation.entry.short_definition:
+        return None
+
+    meaning = segmentation.entry.short_definition.replace(';', ',').split(',')[0].strip()
+    parts = [PREFIX_GLOSSES[letter] for letter in segmentation.prefix if letter in PREFIX_GLOSSES]
+    parts.append(meaning)
+    return '-'.join('-'.join(part.split()) for part in parts)
+
+
+@lru_cache(maxsize=REPORT_CACHE_SIZE)
+def _report(hebrew_word: str, lexicon: Lexicon) -> Dict:
+    clean_hebrew = remove_nikud(hebrew_word)
+    paleo_word = hebrew_to_paleo(clean_hebrew)
+
+    # Look for exact match first, then with the original word (with nikud),
+    # then the best prefix + stem + suffix segmentation (covers the unsegmented word too)
+    strongs_entry = lexicon.pointed(clean_hebrew) or lexicon.pointed(hebrew_word)
+    segmentation = None
+    if not strongs_entry:
+        segmentation = best_segmentation(clean_hebrew)
+        if segmentation:
+            strongs_entry = segmentation.entry
+    if not strongs_entry:
+        # Try partial matches for compound words
+        strongs_entries = lexicon.containing(clean_hebrew, limit=1)
+        if strongs_entries:
+            strongs_entry = strongs_entries[0]  # Take first match
+
+    english_definition = strongs_entry.short_definition if strongs_entry else None
+    long_definition = strongs_entry.long_definition if strongs_entry else None
+    transliteration = strongs_entry.transliteration if strongs_entry else None
+
+    # If still no definition found, create a basic one
+    if not english_definition:
+        english_definition = f"Hebrew word formed from {len(clean_hebrew)} letters"
+    if not long_definition:
+        long_definition = f"Ancient Hebrew word written as {clean_hebrew} in Hebrew script"
+
+    letters = get_reference_data()
+    letter_analysis = []
+    meaning_parts = []
+
+    for i, char in enumerate(clean_hebrew):
+        letter = letters.letter(char)
+        if letter:
+            letter_analysis.append({
+                'position': i + 1,
+                'hebrew_letter': char,
+                'paleo_symbol': letter['paleo_symbol'],
+                'name': letter['name'],
+                'meaning': letter['meaning'],
+                'pictograph': letter['pictograph_description']
+            })
+            meaning_parts.append(letter['meaning'].split(',')[0])  # Take first meaning
+
+    return {
+        'hebrew_word': hebrew_word,
+        'clean_hebrew': clean_hebrew,
+        'paleo_word': paleo_word,
+        'letter_analysis': letter_analysis,
+        'suggested_meaning': ' + '.join(meaning_parts),
+        'english_definition': english_definition,
+        'long_definition': long_definition,
+        'transliteration': transliteration,
+        'morphology': segmentation.to_dict() if segmentation else None
+    }
+
+
+def word_report(hebrew_word: str) -> Dict:
+    """
+    Pictographic analysis of a word: Paleo form, letter meanings, Strong's definition and segmentation
+
+    Memoized per surface form; the returned dict is shared and must not be modified.
+    """
+    return _report(hebrew_word, _current_lexicon())
+
+
+def word_reports(words: Iterable[str]) -> List[Dict]:
+    """Reports for each distinct word, in first-occurrence order"""
+    return [word_report(word) for word in dict.fromkeys(words)]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Hebrew word segmentation')
+    parser.add_argument('words', nargs='+', help='Hebrew words to analyze')
+
+    args = parser.parse_args()
+
+    from app import app
+
+    with app.app_context():
+        for word in args.words:
+            print(word)
+            for segmentation in analyze_word(word):
+                print(f"  {segmentation.prefix or '-'} + {segmentation.stem} + {segmentation.suffix or '-'}: "
+                      f"{', '.join(entry.strong_number for entry in segmentation.entries)}")
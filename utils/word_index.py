@@ -0,0 +1,186 @@
+"""
+Positional word index
+Splits verses into one VerseWord row per word occurrence so word, phrase and concordance
+lookups become index seeks instead of string scans
+"""
+
+import logging
+import re
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam
+
+from models import db, Chapter, Verse, VerseWord
+from utils.corpus_stats import refresh_all_stats
+from utils.data_generation import bump_generation
+from utils.hebrew_converter import hebrew_to_paleo, normalize_hebrew, remove_nikud
+from utils.word_analysis import strong_number_for
+
+# Editorial markup that is not part of the text: {פ}/{ס} paragraph markers, HTML tags
+EDITORIAL_MARKUP = re.compile(r'\{[^}]*\}|<[^>]+>')
+
+# Word boundaries: whitespace, maqaf, paseq and sof pasuq
+WORD_BOUNDARY = re.compile(r'[\s־׀׃]+')
+
+# Anything outside the Hebrew letters and points block is dropped from a word
+NON_HEBREW = re.compile(r'[^֑-ׇא-ת]')
+
+
+def tokenize_verse(hebrew_text: str) -> List[Dict]:
+    """
+    Split a verse into words with their positional forms
+
+    Args:
+        hebrew_text (str): Verse text with or without nikud
+
+    Returns:
+        list: One dict per word with position, hebrew, consonantal, normalized and paleo forms
+    """
+    words = []
+    text = EDITORIAL_MARKUP.sub(' ', hebrew_text or '')
+
+    for token in WORD_BOUNDARY.split(text):
+        pointed = NON_HEBREW.sub('', token)
+        consonantal = remove_nikud(pointed)
+        if not consonantal:
+            continue
+
+        words.append({
+            'position': len(words) + 1,
+            'hebrew': pointed,
+            'consonantal': consonantal,
+            'normalized': normalize_hebrew(consonantal),
+            'paleo': hebrew_to_paleo(consonantal)
+        })
+
+    return words
+
+
+def index_verse_words(verses: Iterable, replace: bool = False) -> int:
+    """
+    Write VerseWord rows for (verse_id, hebrew_text) pairs
+
+    Args:
+        verses: Iterable of (verse_id, hebrew_text)
+        replace: Delete existing rows for these verses first
+
+    Returns:
+        int: Number of word rows written, tagged with the Strong's number of their best segmentation
+    """
+    rows = []
+    verse_ids = []
+
+    for verse_id, hebrew_text in verses:
+        verse_ids.append(verse_id)
+        for word in tokenize_verse(hebrew_text):
+            word['verse_id'] = verse_id
+            word['strong_number'] = strong_number_for(word['normalized'])
+            rows.append(word)
+
+    if replace and verse_ids:
+        db.session.execute(VerseWord.__table__.delete().where(VerseWord.verse_id.in_(verse_ids)))
+
+    if rows:
+        db.session.execute(VerseWord.__table__.insert(), rows)
+
+    return len(rows)
+
+
+def _unindexed_verses(book_id: Optional[int] = None):
+    """Verses that have no word rows yet, optionally limited to one book"""
+    query = db.session.query(Verse.id, Verse.hebrew_text).filter(
+        ~db.exists().where(VerseWord.verse_id == Verse.id)
+    )
+    if book_id is not None:
+        query = query.join(Chapter, Verse.chapter_id == Chapter.id).filter(Chapter.book_id == book_id)
+    return query.order_by(Verse.id)
+
+
+def index_book_words(book_id: int) -> int:
+    """Importer stage: index every verse of a book that has no word rows yet"""
+    written = index_verse_words(_unindexed_verses(book_id).all())
+    db.session.commit()
+    return written
+
+
+def backfill_verse_words(batch_size: int = 2000, rebuild: bool = False) -> int:
+    """
+    Build word rows for an existing database
+
+    Args:
+        batch_size: Verses written per transaction
+        rebuild: Drop all word rows and re-index every verse
+    """
+    if rebuild:
+        db.session.execute(VerseWord.__table__.delete())
+        db.session.commit()
+
+    verses = _unindexed_verses().all()
+    written = 0
+
+    for start in range(0, len(verses), batch_size):
+        written += index_verse_words(verses[start:start + batch_size])
+        db.session.commit()
+        logging.info(f"Indexed words for {min(start + batch_size, len(verses))}/{len(verses)} verses")
+
+    # Word and letter totals in /api/stats come from the word rows
+    refresh_all_stats()
+    bump_generation()
+    return written
+
+
+def tag_verse_words(retag: bool = False) -> int:
+    """
+    Resolve VerseWord.strong_number for words indexed without one (e.g. before the lexicon was loaded)
+
+    Each distinct normalized form is analyzed once and written with one UPDATE per form.
+
+    Args:
+        retag: Clear and re-resolve every word
+
+    Returns:
+        int: Number of distinct forms tagged
+    """
+    if retag:
+        db.session.execute(VerseWord.__table__.update().values(strong_number=None))
+
+    forms = db.session.query(VerseWord.normalized).filter(VerseWord.strong_number.is_(None)).distinct()
+    updates = []
+    for (form,) in forms.all():
+        strong_number = strong_number_for(form)
+        if strong_number:
+            updates.append({'form': form, 'strong_number': strong_number})
+
+    if updates:
+        db.session.execute(
+            VerseWord.__table__.update()
+            .where(VerseWord.normalized == bindparam('form'))
+            .where(VerseWord.strong_number.is_(None))
+            .values(strong_number=bindparam('strong_number')),
+            updates
+        )
+    db.session.commit()
+
+    bump_generation()
+    return len(updates)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Verse word index')
+    parser.add_argument('--backfill', action='store_true', help='Index verses that have no word rows')
+    parser.add_argument('--rebuild', action='store_true', help='Drop and rebuild all word rows')
+    parser.add_argument('--tag', action='store_true', help="Resolve Strong's numbers of untagged words")
+    parser.add_argument('--retag', action='store_true', help="Re-resolve Strong's numbers of every word")
+
+    args = parser.parse_args()
+
+    from app import app
+
+    with app.app_context():
+        db.create_all()
+        if args.backfill or args.rebuild:
+            print(f"Wrote {backfill_verse_words(rebuild=args.rebuild)} word rows")
+        if args.tag or args.retag:
+            print(f"Tagged {tag_verse_words(retag=args.retag)} word forms")